@@ -1,7 +1,31 @@
+import os
 import sys
+from multiprocessing import freeze_support
 
-from ui import MediaQueue
+from profiling import profiler
 
 
 if __name__ == "__main__":
+    freeze_support()  # The importer parses files in other processes
+
+    # Run a command of the command line interface without starting Qt
+    #   when the first argument is a subcommand, like "MediaQueue.py list"
+    from cli import COMMANDS, main
+    if len(sys.argv) > 1 and (sys.argv[1] in COMMANDS or
+                              sys.argv[1] in ["daemon", "--base-dir", "--no-daemon"]):
+        sys.exit(main(sys.argv[1:]))
+
+    # Enable profiling before the app is created so the startup is recorded too
+    if "--profile" in sys.argv or "--cprofile" in sys.argv:
+        profiler.enable(cprofile="--cprofile" in sys.argv)
+        sys.argv = [arg for arg in sys.argv if arg not in ["--profile", "--cprofile"]]
+
+    from ui import MediaQueue
+    from ui.util.watchdog import WATCHDOG_ENV
+
+    # Watch the event loop for slots that block it
+    if "--watchdog" in sys.argv:
+        os.environ[WATCHDOG_ENV] = "1"
+        sys.argv = [arg for arg in sys.argv if arg != "--watchdog"]
+
     app = MediaQueue(sys.argv)
@@ -0,0 +1,4 @@
+from benchmarks.generator import generate_library
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.scenarios import run_benchmarks
+from benchmarks.scenarios import compare_results
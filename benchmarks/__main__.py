@@ -0,0 +1,89 @@
+"""Runs the benchmarks of the Media Queue on generated libraries
+
+Examples:
+    python -m benchmarks --titles 1000 20000 --output results.json
+    python -m benchmarks --titles 1000 --baseline results.json --tolerance 0.25
+    python -m benchmarks --widgets --titles 2000 --baseline widgets.json
+"""
+import os
+import sys
+from argparse import ArgumentParser
+from json import dump, load
+
+from benchmarks import SCENARIOS, run_benchmarks, compare_results
+
+
+def check_scenarios(parser: ArgumentParser, scenarios: list, choices: dict):
+    """Exits with a usage error when a scenario is not one of the scenarios that will run.
+    The widget scenarios are only known once PyQt5 is imported, so they are checked after parsing
+
+    :param parser: The parser of the command line arguments
+    :param scenarios: The scenarios given in the command line arguments, if any
+    :param choices: The scenarios that can run, by name
+    """
+    for scenario in scenarios or []:
+        if scenario not in choices:
+            parser.error(f"argument --scenario: invalid choice: '{scenario}' (choose from {', '.join(choices)})")
+
+
+def main(args=None) -> int:
+    """Runs the benchmarks with the specified command line arguments
+    and returns the exit code, which is 1 when any scenario regressed past the baseline
+
+    :param args: The command line arguments. (Defaults to sys.argv)
+    """
+    parser = ArgumentParser(prog="python -m benchmarks", description="Benchmarks the Media Queue")
+    parser.add_argument("--titles", type=int, nargs="+", default=[1000],
+                        help="The sizes of the generated libraries (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="The seed of the generated libraries (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="The amount of times each scenario runs (default: 3)")
+    parser.add_argument("--widgets", action="store_true",
+                        help="Run the scenarios of the real widgets under the offscreen Qt platform")
+    parser.add_argument("--scenario", action="append",
+                        help="A scenario to run, which can be given more than once (default: all)")
+    parser.add_argument("--output", help="The JSON file to write the results into")
+    parser.add_argument("--baseline", help="The JSON file of the baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="The fraction a scenario can be slower than the baseline (default: 0.25)")
+    args = parser.parse_args(args)
+
+    if args.widgets:
+        # Create the application before any widget is created
+        #   using the offscreen platform unless another platform was chosen
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5 import QtWidgets
+        from benchmarks.widgets import WIDGET_SCENARIOS, run_widget_benchmarks
+        check_scenarios(parser, args.scenario, WIDGET_SCENARIOS)
+        app = QtWidgets.QApplication(sys.argv[:1])
+        results = [
+            run_widget_benchmarks(titles, seed=args.seed, repeat=args.repeat,
+                                  scenarios=args.scenario, log=print)
+            for titles in args.titles
+        ]
+        app.quit()
+    else:
+        check_scenarios(parser, args.scenario, SCENARIOS)
+        results = [
+            run_benchmarks(titles, seed=args.seed, repeat=args.repeat,
+                           scenarios=args.scenario, log=print)
+            for titles in args.titles
+        ]
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            dump(results, output_file, indent=4)
+
+    if args.baseline is not None:
+        with open(args.baseline, "r") as baseline_file:
+            regressions = compare_results(results, load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION {titles} titles: {scenario} {metric} {baseline:.4f} -> {current:.4f} ({ratio:.2f}x)".format(
+                **regression))
+        if len(regressions) > 0:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+from random import Random
+from typing import List
+from uuid import UUID
+
+from media import Media, Episode, Season, Movie, TVShow, Podcast, LimitedSeries
+
+PROVIDERS = [
+    "Netflix", "Hulu", "Disney+", "HBO Max", "Prime Video",
+    "Apple TV+", "Peacock", "Paramount+", "Spotify", "YouTube"]
+PERSONS = ["Alice", "Bob", "Carol", "Dave", "Erin", "Frank"]
+WORDS = [
+    "The", "Last", "Night", "City", "Secret", "House", "Dark", "Blue",
+    "River", "Game", "Crown", "Office", "Space", "Lost", "Wild", "Green",
+    "Story", "Kingdom", "Stranger", "Good", "Place", "Bad", "Island", "Crime"]
+
+# The weights of each type of Media in a generated library
+MEDIA_TYPES = [(Movie, 40), (TVShow, 35), (Podcast, 15), (LimitedSeries, 10)]
+
+
+def skewed_weights(count: int) -> List[float]:
+    """Returns Zipf-like weights for the specified amount of choices
+    so the first choices are picked far more often than the last,
+    like a household that mostly watches a few providers
+
+    :param count: The amount of choices
+    """
+    return [1 / (i + 1) for i in range(count)]
+
+
+def generate_library(titles: int, *, seed: int = 0,
+                     providers: List[str] = None, persons: List[str] = None) -> List[Media]:
+    """Generates a library of the specified amount of Media.
+
+    The same size and seed always generate the same library, including the IDs.
+    Providers and persons are skewed toward the first in each list, TV Shows have
+    up to 12 Seasons, and Podcasts can have hundreds of Episodes
+
+    :param titles: The amount of Media to generate
+    :keyword seed: The seed of the random generator. (Defaults to 0)
+    :keyword providers: The providers to use. (Defaults to PROVIDERS)
+    :keyword persons: The persons to use. (Defaults to PERSONS)
+    """
+    if providers is None:
+        providers = PROVIDERS
+    if persons is None:
+        persons = PERSONS
+
+    rng = Random(seed)
+    provider_weights = skewed_weights(len(providers))
+    person_weights = skewed_weights(len(persons))
+    types = [media_type for media_type, _ in MEDIA_TYPES]
+    type_weights = [weight for _, weight in MEDIA_TYPES]
+
+    library = []
+    for i in range(titles):
+        media_type = rng.choices(types, type_weights)[0]
+        name = "{} {}".format(" ".join(rng.sample(WORDS, rng.randint(1, 4))), i)
+        provider = rng.choices(providers, provider_weights)[0]
+        person = rng.choices(persons, person_weights)[0]
+        progress = rng.random()
+
+        if media_type is Movie:
+            media = Movie(name, rng.randint(75, 180), provider, person,
+                          started=0.3 < progress < 0.4, finished=progress >= 0.4)
+        elif media_type is LimitedSeries:
+            media = LimitedSeries(
+                name, provider, person,
+                generate_episodes(rng, 1, rng.randint(4, 10), progress),
+                started=0.3 < progress < 0.9, finished=progress >= 0.9)
+        else:
+            seasons = rng.randint(1, 12) if media_type is TVShow else rng.randint(1, 4)
+            episodes = (6, 24) if media_type is TVShow else (20, 120)
+            media = media_type(
+                name, provider, person,
+                [Season(season, generate_episodes(rng, season, rng.randint(*episodes), progress))
+                 for season in range(1, seasons + 1)],
+                started=0.3 < progress < 0.9, finished=progress >= 0.9)
+        media.set_id(str(UUID(int=rng.getrandbits(128), version=4)))
+        library.append(media)
+    return library
+
+
+def generate_episodes(rng: Random, season: int, count: int, progress: float) -> List[Episode]:
+    """Generates the Episodes of a Season where roughly the first
+    progress fraction of the Episodes are watched
+
+    :param rng: The random generator to use
+    :param season: The Season of the Episodes
+    :param count: The amount of Episodes to generate
+    :param progress: The fraction of Episodes that are watched
+    """
+    return [Episode(season, episode, f"Episode {episode}", rng.randint(20, 60),
+                    watched=episode <= count * progress)
+            for episode in range(1, count + 1)]
+
+
+def generate_show(seasons: int, episodes: int, *, seed: int = 0,
+                  provider: str = PROVIDERS[0], person: str = PERSONS[0]) -> TVShow:
+    """Generates a single TV Show with the specified amount of Seasons
+    and Episodes in each Season, where about half of the Episodes are watched
+
+    :param seasons: The amount of Seasons in the TV Show
+    :param episodes: The amount of Episodes in each Season
+    :keyword seed: The seed of the random generator. (Defaults to 0)
+    :keyword provider: The provider of the TV Show. (Defaults to the first of PROVIDERS)
+    :keyword person: The person watching the TV Show. (Defaults to the first of PERSONS)
+    """
+    rng = Random(seed)
+    tv_show = TVShow(
+        f"Large Show {seasons}x{episodes}", provider, person,
+        [Season(season, generate_episodes(rng, season, episodes, 0.5))
+         for season in range(1, seasons + 1)],
+        started=True)
+    tv_show.set_id(str(UUID(int=rng.getrandbits(128), version=4)))
+    return tv_show
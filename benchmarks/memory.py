@@ -0,0 +1,276 @@
+"""Reports the memory used by the Media Queue by category on a generated library
+
+Examples:
+    python -m benchmarks.memory --titles 20000
+    python -m benchmarks.memory --titles 20000 --widgets --output memory.json
+    python -m benchmarks.memory --titles 20000 --baseline memory.json --tolerance 0.1
+"""
+import gc
+import os
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from json import dump, load
+from tempfile import TemporaryDirectory
+from typing import Dict, Iterable, List
+
+from benchmarks.generator import generate_library
+from media import Media, Season, Episode, Catalog, WatchRanges
+from media.storage import save_media
+from util import get_data_files, data_file_to_media
+
+# The folders of the source files whose allocations make up each category
+FILE_CATEGORIES = {
+    "media": ["media"],
+    "widgets": ["ui", "PyQt5"],
+    "json": ["json"]
+}
+
+
+def shallow_size(objects: Iterable[object]) -> int:
+    """Returns the size of the objects and their attribute dictionaries,
+    without the size of the values in the attributes
+
+    :param objects: The objects to get the size of
+    """
+    total = 0
+    for obj in objects:
+        total += sys.getsizeof(obj)
+        if hasattr(obj, "__dict__"):
+            total += sys.getsizeof(obj.__dict__)
+    return total
+
+
+def attribute_strings(objects: Iterable[object]) -> Dict[int, str]:
+    """Returns every unique string held in the attributes of the objects, by ID
+
+    :param objects: The objects to get the strings of
+    """
+    strings = {}
+    for obj in objects:
+        for value in vars(obj).values():
+            if isinstance(value, str):
+                strings[id(value)] = value
+    return strings
+
+
+def container_size(objects: Iterable[object]) -> int:
+    """Returns the size of the lists and tuples held in the attributes of the objects,
+    without the size of the values in them
+
+    :param objects: The objects to get the size of the lists and tuples of
+    """
+    return sum(
+        sys.getsizeof(value)
+        for obj in objects for value in vars(obj).values()
+        if isinstance(value, (list, tuple)))
+
+
+def count_objects(library: List[Media]) -> Dict[str, Dict[str, int]]:
+    """Counts the Media, Catalogs, Watch Ranges, Seasons, Episodes, and strings in the library,
+    and the size they take up in memory.
+
+    The Seasons and Episodes of a Show are only created when they are used,
+    so a library that was just loaded keeps its Episodes in the Catalogs instead
+
+    :param library: The library to count the objects of
+    """
+    seasons = []
+    episodes = []
+    catalogs = []
+    watch_ranges = []
+    for obj in gc.get_objects():
+        if isinstance(obj, Season):
+            seasons.append(obj)
+        elif isinstance(obj, Episode):
+            episodes.append(obj)
+        elif isinstance(obj, Catalog):
+            catalogs.append(obj)
+        elif isinstance(obj, WatchRanges):
+            watch_ranges.append(obj)
+
+    # Count the lists of Seasons and Episodes with the object that holds them
+    media_size = shallow_size(library) + sum(
+        sys.getsizeof(value)
+        for media in library for value in vars(media).values()
+        if isinstance(value, list))
+    season_size = shallow_size(seasons) + sum(
+        sys.getsizeof(value)
+        for season in seasons for value in vars(season).values()
+        if isinstance(value, list))
+
+    # Count the Episodes of a Catalog with the Catalog, which holds them as tuples
+    entries = {id(entry): entry for catalog in catalogs for entry in catalog.get_entries()}
+    catalog_size = shallow_size(catalogs) + container_size(catalogs) + sum(
+        sys.getsizeof(entry) for entry in entries.values())
+
+    strings = attribute_strings(library)
+    strings.update(attribute_strings(seasons))
+    strings.update(attribute_strings(episodes))
+    strings.update({id(entry[2]): entry[2] for entry in entries.values()})
+    return {
+        "media": {"count": len(library), "bytes": media_size},
+        "catalogs": {"count": len(catalogs), "entry_count": len(entries), "bytes": catalog_size},
+        "watch_ranges": {"count": len(watch_ranges),
+                         "bytes": shallow_size(watch_ranges) + container_size(watch_ranges)},
+        "seasons": {"count": len(seasons), "bytes": season_size},
+        "episodes": {"count": len(episodes), "bytes": shallow_size(episodes)},
+        "strings": {"count": len(strings), "bytes": sum(sys.getsizeof(s) for s in strings.values())}
+    }
+
+
+def group_by_category(snapshot: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot) -> Dict[str, int]:
+    """Returns the memory allocated between the two snapshots
+    grouped by the category of the source file that allocated it
+
+    :param snapshot: The snapshot after the allocations
+    :param baseline: The snapshot before the allocations
+    """
+    categories = {category: 0 for category in FILE_CATEGORIES}
+    categories["other"] = 0
+    for stat in snapshot.compare_to(baseline, "filename"):
+        parts = stat.traceback[0].filename.replace("\\", "/").split("/")
+        for category in FILE_CATEGORIES:
+            if any(folder in parts[:-1] for folder in FILE_CATEGORIES[category]):
+                categories[category] += stat.size_diff
+                break
+        else:
+            categories["other"] += stat.size_diff
+    return categories
+
+
+def run_memory_report(titles: int, *, seed: int = 0, widgets: bool = False) -> dict:
+    """Saves a generated library of the specified size, loads it back like the app does,
+    and returns a report of the memory used by each category as a JSON object.
+
+    The Media, Catalogs, Watch Ranges, Seasons, Episodes, and strings are counted from the objects themselves.
+    The memory allocated while loading, and while building the Home screen when widgets
+    is True, is grouped by the source files that allocated it with tracemalloc.
+    The memory Qt allocates for the widgets is not included, only their count
+
+    :param titles: The amount of Media in the generated library
+    :keyword seed: The seed of the generated library. (Defaults to 0)
+    :keyword widgets: Whether or not to build the Home screen with the library. (Defaults to False)
+    """
+    with TemporaryDirectory() as base_dir:
+        save_media(generate_library(titles, seed=seed), base_dir)
+        gc.collect()
+
+        # Load the library while tracing the allocations, where the peak
+        #   above the retained memory is the garbage of parsing the JSON files
+        tracemalloc.start()
+        before_load = tracemalloc.take_snapshot()
+        library = [data_file_to_media(filename) for filename in get_data_files(base_dir)]
+        gc.collect()
+        loaded, load_peak = tracemalloc.get_traced_memory()
+        after_load = tracemalloc.take_snapshot()
+
+    report = {
+        "titles": titles,
+        "seed": seed,
+        "objects": count_objects(library),
+        "load": {
+            "retained": loaded,
+            "peak": load_peak,
+            "garbage": load_peak - loaded,
+            "by_category": group_by_category(after_load, before_load)
+        }
+    }
+
+    if widgets:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5 import QtWidgets
+        app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+        from ui import Home, media_objects
+
+        home = Home()
+        media_objects.set_media(library)
+        home.media_list_widget.scroll_area.update_ui()
+        home.media_list_widget.update_stats()
+        app.processEvents()
+        gc.collect()
+        after_widgets = tracemalloc.take_snapshot()
+        report["widgets"] = {
+            "count": len([obj for obj in gc.get_objects() if isinstance(obj, QtWidgets.QWidget)]),
+            "by_category": group_by_category(after_widgets, after_load),
+
+            # The lists the Home screen keeps next to the list of Media
+            "caches": {
+                "filtered_media": sys.getsizeof(media_objects.get_filtered_media()),
+                "removed_media": sys.getsizeof(media_objects.get_removed_media()),
+                "row_widgets": sys.getsizeof(home.media_list_widget.scroll_area.widgets)
+            }
+        }
+        home.deleteLater()
+        app.processEvents()
+
+    tracemalloc.stop()
+    return report
+
+
+def flatten(report: dict, prefix: str = "") -> Dict[str, int]:
+    """Returns every number in the report by its path, like objects.episodes.bytes
+
+    :param report: The report, or a part of it, to flatten
+    :param prefix: The path of the part of the report
+    """
+    values = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, int) and key not in ["titles", "seed"]:
+            values[f"{prefix}{key}"] = value
+    return values
+
+
+def main(args=None) -> int:
+    """Runs the memory report with the specified command line arguments
+    and returns the exit code, which is 1 when any number grew past the baseline
+
+    :param args: The command line arguments. (Defaults to sys.argv)
+    """
+    parser = ArgumentParser(prog="python -m benchmarks.memory",
+                            description="Reports the memory of the Media Queue by category")
+    parser.add_argument("--titles", type=int, default=1000,
+                        help="The size of the generated library (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="The seed of the generated library (default: 0)")
+    parser.add_argument("--widgets", action="store_true",
+                        help="Also build the Home screen under the offscreen Qt platform")
+    parser.add_argument("--output", help="The JSON file to write the report into")
+    parser.add_argument("--baseline", help="The JSON file of the baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="The fraction any number can grow past the baseline (default: 0.1)")
+    args = parser.parse_args(args)
+
+    report = run_memory_report(args.titles, seed=args.seed, widgets=args.widgets)
+    for path, value in flatten(report).items():
+        if path.endswith("count"):
+            print(f"{path:<40} {value:>12,}")
+        else:
+            print(f"{path:<40} {value / 2 ** 20:>10.2f} MiB")
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            dump(report, output_file, indent=4)
+
+    if args.baseline is not None:
+        with open(args.baseline, "r") as baseline_file:
+            baseline = load(baseline_file)
+        if (baseline["titles"], baseline["seed"]) != (report["titles"], report["seed"]):
+            print("The baseline was made with a different library and cannot be compared")
+            return 1
+        baseline = flatten(baseline)
+        regressions = [
+            (path, baseline[path], value)
+            for path, value in flatten(report).items()
+            if path in baseline and value > max(baseline[path], 0) * (1 + args.tolerance)
+        ]
+        for path, previous, current in regressions:
+            print(f"REGRESSION {path}: {previous:,} -> {current:,}")
+        if len(regressions) > 0:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
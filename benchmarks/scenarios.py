@@ -0,0 +1,266 @@
+import os
+import platform
+import sys
+import tracemalloc
+from importlib.util import module_from_spec, spec_from_file_location
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List
+
+from benchmarks.generator import generate_library, PROVIDERS, PERSONS
+from media import Media
+from media.storage import save_media
+from media.util import get_episodes
+from util import (get_data_files, data_file_to_media, iter_csv_media, iter_json_media,
+                  media_to_csv, media_to_json)
+
+# Each filter the Home screen can apply, as set by toggling its comboboxes
+FILTERS = [
+    {"started": True}, {"finished": True}, {"started": False, "finished": False},
+    {"provider": PROVIDERS[0]}, {"provider": PROVIDERS[-1]},
+    {"person": PERSONS[0]}, {"person": PERSONS[0], "provider": PROVIDERS[0]}]
+
+# The search string typed one character at a time
+SEARCH = "crown"
+
+
+def load_media_objects() -> type:
+    """Returns the Media Objects class that the Home screen sorts and filters the Media with.
+    It is loaded from its file since importing it from the ui package would import PyQt5,
+    which the scenarios without widgets must run without
+    """
+    filename = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "ui", "util", "media_objects.py")
+    spec = spec_from_file_location("benchmarks.media_objects", filename)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.MediaObjects
+
+
+def scenario_generate(state: dict):
+    """Generates the library, which constructs every Media, Season, and Episode"""
+    state["library"] = generate_library(state["titles"], seed=state["seed"])
+
+
+def scenario_save(state: dict):
+    """Saves every Media into its JSON file in the data folder"""
+    save_media(state["library"], state["base_dir"])
+
+
+def scenario_load(state: dict):
+    """Loads every Media from its JSON file in the data folder like the Media Loader"""
+    [data_file_to_media(filename) for filename in get_data_files(state["base_dir"])]
+
+
+def setup_sort(state: dict):
+    """Puts the Media back in the generated order so every run sorts unsorted Media"""
+    state["media_objects"].set_media(list(state["library"]))
+
+
+def scenario_sort(state: dict):
+    """Sorts the Media by every attribute like the Home screen"""
+    state["media_objects"].set_media_sort(
+        media_type=True, provider=True, person=True, runtime=True, name=True)
+
+
+def scenario_filter(state: dict):
+    """Applies each filter of the Home screen one after the other"""
+    for media_filter in FILTERS:
+        state["media_objects"].set_media_filters(**media_filter)
+    state["media_objects"].set_media_filters()
+
+
+def scenario_search(state: dict):
+    """Searches the Media as each character of the search string is typed"""
+    for i in range(1, len(SEARCH) + 1):
+        state["media_objects"].set_media_filters(search=SEARCH[:i])
+    state["media_objects"].set_media_filters()
+
+
+def scenario_stats(state: dict):
+    """Computes the stats shown at the bottom of the Home screen"""
+    filtered_media = state["media_objects"].get_filtered_media()
+    len([media for media in filtered_media if media.is_started()])
+    len([media for media in filtered_media if media.is_finished()])
+    sum([media.get_runtime() for media in filtered_media])
+
+
+def scenario_export_csv(state: dict):
+    """Exports every Media into a CSV file"""
+    state["csv_file"] = media_to_csv(state["library"], base_dir=state["base_dir"])
+
+
+def scenario_export_json(state: dict):
+    """Exports every Media into a JSON file"""
+    state["json_file"] = media_to_json(state["library"], base_dir=state["base_dir"])
+
+
+def scenario_import_csv(state: dict):
+    """Imports every Media from the exported CSV file"""
+    list(iter_csv_media(state["csv_file"], providers=set(PROVIDERS), persons=set(PERSONS)))
+
+
+def scenario_import_json(state: dict):
+    """Imports every Media from the exported JSON file"""
+    list(iter_json_media(state["json_file"], providers=set(PROVIDERS), persons=set(PERSONS)))
+
+
+# The scenarios in the order they run since some scenarios
+#   use what an earlier scenario created, like an exported file
+SCENARIOS = {
+    "generate": scenario_generate,
+    "save": scenario_save,
+    "load": scenario_load,
+    "sort": scenario_sort,
+    "filter": scenario_filter,
+    "search": scenario_search,
+    "stats": scenario_stats,
+    "export_csv": scenario_export_csv,
+    "export_json": scenario_export_json,
+    "import_csv": scenario_import_csv,
+    "import_json": scenario_import_json
+}
+
+# The untimed steps that run before each run of a scenario
+SETUPS = {
+    "sort": setup_sort
+}
+
+
+def count_episodes(library: List[Media]) -> int:
+    """Returns the total amount of Episodes in the library
+
+    :param library: The library to count the Episodes of
+    """
+    return sum([len(get_episodes(media)) for media in library])
+
+
+def time_scenario(scenario: callable, state: dict, repeat: int,
+                  *, setup: callable = None, trace_memory: bool = False) -> dict:
+    """Runs the scenario the specified amount of times and returns
+    the best and median wall time of the runs.
+
+    When tracing memory, the scenario runs once more with tracemalloc
+    to get the peak memory allocated by Python during the scenario.
+    That run is not timed since tracing slows every allocation down
+
+    :param scenario: The scenario function to run
+    :param state: The state to give to the scenario function
+    :param repeat: The amount of times to time the scenario
+    :keyword setup: The function to run with the state before each run, which is not timed
+    :keyword trace_memory: Whether or not to also get the peak memory of the scenario
+    """
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup(state)
+        start = perf_counter()
+        scenario(state)
+        runs.append(perf_counter() - start)
+    result = {"best": min(runs), "median": median(runs), "runs": runs}
+
+    if trace_memory:
+        if setup is not None:
+            setup(state)
+        tracemalloc.start()
+        scenario(state)
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(titles: int, *, seed: int = 0, repeat: int = 3,
+                   scenarios: List[str] = None, log: callable = None) -> dict:
+    """Runs the benchmark scenarios on a generated library of the specified size
+    and returns the results as a JSON object.
+
+    Every scenario runs the specified amount of times and the best and median
+    times are kept. Files are saved and exported into a temporary directory
+
+    :param titles: The amount of Media in the generated library
+    :keyword seed: The seed of the generated library. (Defaults to 0)
+    :keyword repeat: The amount of times each scenario runs. (Defaults to 3)
+    :keyword scenarios: The names of the scenarios to run. (Defaults to every scenario)
+    :keyword log: The function used to log the progress of the benchmarks, if any
+
+    :raises KeyError: When a scenario does not exist
+    """
+    if scenarios is None:
+        scenarios = list(SCENARIOS)
+    for scenario in scenarios:
+        if scenario not in SCENARIOS:
+            raise KeyError(f"{scenario} is not a benchmark scenario")
+
+    results = {}
+    with TemporaryDirectory() as base_dir:
+        state = {
+            "titles": titles, "seed": seed, "base_dir": base_dir,
+            "library": generate_library(titles, seed=seed)
+        }
+        state["media_objects"] = load_media_objects()()
+        state["media_objects"].set_media(state["library"])
+
+        # Run the scenarios that create files whenever a later scenario needs them
+        if "load" in scenarios and "save" not in scenarios:
+            scenario_save(state)
+        if "import_csv" in scenarios and "export_csv" not in scenarios:
+            scenario_export_csv(state)
+        if "import_json" in scenarios and "export_json" not in scenarios:
+            scenario_export_json(state)
+
+        for scenario in SCENARIOS:
+            if scenario not in scenarios:
+                continue
+            results[scenario] = time_scenario(SCENARIOS[scenario], state, repeat, setup=SETUPS.get(scenario))
+            if log is not None:
+                log("{} titles: {} best {:.4f}s, median {:.4f}s".format(
+                    titles, scenario, results[scenario]["best"], results[scenario]["median"]))
+
+        episodes = count_episodes(state["library"])
+
+    return {
+        "titles": titles,
+        "episodes": episodes,
+        "seed": seed,
+        "repeat": repeat,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "scenarios": results
+    }
+
+
+def compare_results(results: List[dict], baseline: List[dict],
+                    tolerance: float = 0.25) -> List[Dict[str, float]]:
+    """Compares the results of the benchmarks against the baseline results
+    and returns every scenario that is slower than the baseline by more than the tolerance.
+
+    Only results with the same amount of titles and seed are compared.
+    The best time of each scenario is compared, and so is the peak memory
+    when both results have it
+
+    :param results: The results of the benchmarks
+    :param baseline: The baseline results to compare against
+    :param tolerance: The fraction a scenario can be slower than the baseline. (Defaults to 0.25)
+    """
+    baselines = {(result["titles"], result["seed"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        if (result["titles"], result["seed"]) not in baselines:
+            continue
+        base = baselines[(result["titles"], result["seed"])]
+        for scenario in result["scenarios"]:
+            if scenario not in base["scenarios"]:
+                continue
+            for metric in ["best", "peak_memory"]:
+                if metric not in result["scenarios"][scenario] or metric not in base["scenarios"][scenario]:
+                    continue
+                current = result["scenarios"][scenario][metric]
+                previous = base["scenarios"][scenario][metric]
+                if current > previous * (1 + tolerance):
+                    regressions.append({
+                        "titles": result["titles"], "scenario": scenario, "metric": metric,
+                        "baseline": previous, "current": current,
+                        "ratio": current / previous if previous > 0 else float("inf")
+                    })
+    return regressions
@@ -0,0 +1,172 @@
+import os
+from contextlib import contextmanager
+from json import dump
+from tempfile import TemporaryDirectory
+from typing import List
+
+from PyQt5 import QtWidgets
+
+from benchmarks.generator import generate_library, generate_show, PROVIDERS, PERSONS
+from benchmarks.scenarios import SEARCH, time_scenario
+from options import options
+
+
+def process_events():
+    """Processes every pending event so the layout and painting
+    caused by a scenario is included in its time
+    """
+    QtWidgets.QApplication.processEvents()
+
+
+@contextmanager
+def temporary_options():
+    """Points the options at a temporary home folder while inside the context, with the Streaming
+    Providers and Persons of the generated library, so every machine builds the same Home screen
+    and nothing the widgets save changes the options of the developer running the benchmarks
+    """
+    previous = {name: os.environ.get(name) for name in ["HOME", "USERPROFILE"]}
+    with TemporaryDirectory() as home:
+        with open(f"{home}/options.json", "w") as options_file:
+            dump({"providers": PROVIDERS, "persons": PERSONS, "base_dir": home}, options_file)
+        os.environ["HOME"] = os.environ["USERPROFILE"] = home
+        options.reload()
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            options.reload()
+
+
+def scenario_home(state: dict):
+    """Creates the Home screen and builds the list of Media like after the Media is loaded"""
+    from ui import Home, media_objects
+    if state.get("home") is not None:
+        state["home"].deleteLater()
+    state["home"] = Home()
+    media_objects.set_media(list(state["library"]))
+    state["home"].media_list_widget.scroll_area.update_ui()
+    state["home"].media_list_widget.update_stats()
+    process_events()
+
+
+def scenario_update_home(state: dict):
+    """Rebuilds the list of Media on the existing Home screen"""
+    state["home"].media_list_widget.scroll_area.update_ui()
+    process_events()
+
+
+def scenario_toggle_filters(state: dict):
+    """Selects every option of the started/finished and type filters of the Home screen"""
+    home = state["home"]
+    for combobox in [home.filter_start_finish_combobox, home.filter_type_combobox]:
+        for i in list(range(1, combobox.count())) + [0]:
+            combobox.setCurrentIndex(i)
+            process_events()
+
+
+def scenario_sort(state: dict):
+    """Cycles every sort button of the Home screen through ascending, descending, and none"""
+    home = state["home"]
+    for button in [home.sort_type_button, home.sort_provider_button, home.sort_person_button,
+                   home.sort_runtime_button, home.sort_name_button]:
+        for _ in range(3):
+            button.click()
+            process_events()
+
+
+def scenario_type_search(state: dict):
+    """Types the search string into the search bar of the Home screen
+    one character at a time and then clears it
+    """
+    home = state["home"]
+    for i in range(1, len(SEARCH) + 1):
+        home.search_line_edit.setText(SEARCH[:i])
+        process_events()
+    home.search_line_edit.setText("")
+    process_events()
+
+
+def scenario_open_show(state: dict):
+    """Opens the large TV Show in the TV Show view like editing it from the Home screen"""
+    from ui import TVShowView, media_objects
+    if state.get("tv_show_view") is None:
+        state["tv_show_view"] = TVShowView()
+    media_objects.set_tv_show(state["show"])
+    state["tv_show_view"].edit(lambda *args, **kwargs: None, 0)
+    process_events()
+
+
+# The scenarios in the order they run since every scenario
+#   after the first uses the Home screen it creates
+WIDGET_SCENARIOS = {
+    "home": scenario_home,
+    "update_home": scenario_update_home,
+    "toggle_filters": scenario_toggle_filters,
+    "sort_home": scenario_sort,
+    "type_search": scenario_type_search,
+    "open_show": scenario_open_show
+}
+
+
+def run_widget_benchmarks(titles: int, *, seed: int = 0, repeat: int = 3,
+                          scenarios: List[str] = None, show_seasons: int = 20,
+                          show_episodes: int = 50, log: callable = None) -> dict:
+    """Runs the widget scenarios with the real widgets on a generated library
+    of the specified size and returns the results as a JSON object.
+
+    A QApplication must exist before this is called, which should use
+    the offscreen platform (QT_QPA_PLATFORM=offscreen) to run headless.
+    Every scenario keeps its best and median wall time and its peak memory,
+    which only includes the memory allocated by Python and not by Qt
+
+    :param titles: The amount of Media in the generated library
+    :keyword seed: The seed of the generated library. (Defaults to 0)
+    :keyword repeat: The amount of times each scenario runs. (Defaults to 3)
+    :keyword scenarios: The names of the scenarios to run. (Defaults to every scenario)
+    :keyword show_seasons: The amount of Seasons in the large TV Show. (Defaults to 20)
+    :keyword show_episodes: The amount of Episodes in each Season of the large TV Show. (Defaults to 50)
+    :keyword log: The function used to log the progress of the benchmarks, if any
+
+    :raises KeyError: When a scenario does not exist
+    """
+    if scenarios is None:
+        scenarios = list(WIDGET_SCENARIOS)
+    for scenario in scenarios:
+        if scenario not in WIDGET_SCENARIOS:
+            raise KeyError(f"{scenario} is not a widget benchmark scenario")
+
+    # The options have the providers and persons of the generated library so it shows up in the filters
+    results = {}
+    with temporary_options():
+        state = {
+            "library": generate_library(titles, seed=seed),
+            "show": generate_show(show_seasons, show_episodes, seed=seed)
+        }
+        if "home" not in scenarios:
+            scenario_home(state)
+
+        for scenario in WIDGET_SCENARIOS:
+            if scenario not in scenarios:
+                continue
+            results[scenario] = time_scenario(WIDGET_SCENARIOS[scenario], state, repeat, trace_memory=True)
+            if log is not None:
+                log("{} titles: {} best {:.4f}s, median {:.4f}s, peak {:.1f} MiB".format(
+                    titles, scenario, results[scenario]["best"], results[scenario]["median"],
+                    results[scenario]["peak_memory"] / 2 ** 20))
+
+        for widget in [state.get("home"), state.get("tv_show_view")]:
+            if widget is not None:
+                widget.deleteLater()
+        process_events()
+
+    return {
+        "titles": titles,
+        "seed": seed,
+        "repeat": repeat,
+        "show_episodes": show_seasons * show_episodes,
+        "scenarios": results
+    }
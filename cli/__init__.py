@@ -0,0 +1,2 @@
+from cli.commands import COMMANDS
+from cli.commands import main
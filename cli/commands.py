@@ -0,0 +1,474 @@
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from json import dumps
+from typing import List
+
+from exceptions import ConflictError
+from cli.library import load_library, find_media, format_runtime, update_progress
+from media import Media, Movie, Show, TVShow, Podcast, LimitedSeries
+from media.storage import save_media, sweep_catalogs
+from media.util import get_type, get_episodes, media_matches
+from util import (file_to_media, plan_import, apply_import,
+                  media_to_json, media_to_csv, media_to_delta, media_to_npz,
+                  POLICIES, UpNext, get_activity)
+from options import options
+
+# The classes of Media that can be added, by the name used on the command line
+ADD_TYPES = {
+    "movie": Movie,
+    "tv-show": TVShow,
+    "podcast": Podcast,
+    "limited-series": LimitedSeries
+}
+
+
+def add_filter_arguments(parser: ArgumentParser):
+    """Adds the arguments for the same filters as the Home screen
+
+    :param parser: The parser of the subcommand to add the arguments to
+    """
+    parser.add_argument("--type", choices=get_type(), help="Only include this type of media")
+    parser.add_argument("--provider", help="Only include media on this streaming provider")
+    parser.add_argument("--person", help="Only include media watched by this person")
+    parser.add_argument("--search", help="Only include media whose name contains this text")
+    parser.add_argument("--started", dest="started", action="store_const", const=True,
+                        help="Only include started media")
+    parser.add_argument("--not-started", dest="started", action="store_const", const=False,
+                        help="Only include media that is not started")
+    parser.add_argument("--finished", dest="finished", action="store_const", const=True,
+                        help="Only include finished media")
+    parser.add_argument("--not-finished", dest="finished", action="store_const", const=False,
+                        help="Only include media that is not finished")
+
+
+def filter_library(library: List[Media], args: Namespace) -> List[Media]:
+    """Returns the Media in the library that matches the filter arguments
+
+    :param library: The Media to filter
+    :param args: The parsed command line arguments
+    """
+    return [media for media in library
+            if media_matches(media, started=args.started, finished=args.finished,
+                             media_type=args.type, provider=args.provider,
+                             person=args.person, search=args.search)]
+
+
+def media_summary(media: Media) -> dict:
+    """Returns the summary of the Media shown by the list command
+
+    :param media: The Media to summarize
+    """
+    return {
+        "id": media.get_id(),
+        "type": get_type(media),
+        "name": media.get_name(),
+        "provider": media.get_provider(),
+        "person": media.get_person(),
+        "runtime": media.get_runtime(),
+        "started": media.is_started(),
+        "finished": media.is_finished(),
+        "episodes": media.get_episode_count() if isinstance(media, Show) else 0,
+        "watched": media.get_watched_count() if isinstance(media, Show) else 0
+    }
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+def list_command(library: List[Media], args: Namespace) -> int:
+    """Prints the Media that matches the filters, sorted by name"""
+    media = sorted(filter_library(library, args), key=lambda m: m.get_name().lower())
+    if args.json:
+        print(dumps([media_summary(m) for m in media], indent=4))
+        return 0
+    for m in media:
+        summary = media_summary(m)
+        status = "Finished" if m.is_finished() else "Started" if m.is_started() else ""
+        progress = f"{summary['watched']}/{summary['episodes']}" if summary["episodes"] > 0 else ""
+        print(f"{m.get_id()[:8]}  {summary['type']:<14}  {m.get_provider():<12}  {m.get_person():<10}  "
+              f"{status:<8}  {progress:>9}  {m.get_name()}")
+    return 0
+
+
+def query_command(library: List[Media], args: Namespace) -> int:
+    """Prints a single piece of Media with all of its Episodes"""
+    media = find_media(library, args.media)
+    if args.json:
+        json_object = media.to_json()
+        json_object["type"] = get_type(media)
+        print(dumps(json_object, indent=4))
+        return 0
+    summary = media_summary(media)
+    print(f"{media.get_name()} ({summary['type']})")
+    print(f"  ID:       {media.get_id()}")
+    print(f"  Provider: {media.get_provider()}")
+    print(f"  Person:   {media.get_person()}")
+    print(f"  Status:   {'Finished' if media.is_finished() else 'Started' if media.is_started() else 'Not Started'}")
+    print(f"  Runtime:  {format_runtime(media.get_runtime())}")
+    if summary["episodes"] > 0:
+        print(f"  Watched:  {summary['watched']}/{summary['episodes']} episode(s)")
+        for episode in get_episodes(media):
+            print("    [{}] S{:02d}E{:02d} {} ({} mins)".format(
+                "x" if episode.is_watched() else " ", episode.get_season(),
+                episode.get_episode(), episode.get_name(), episode.get_runtime()))
+    return 0
+
+
+def add_command(library: List[Media], args: Namespace) -> int:
+    """Adds a new piece of Media without any Episodes"""
+    if args.provider not in options.get_providers():
+        raise KeyError(f"{args.provider} is not a streaming provider in the options")
+    if args.person not in options.get_persons():
+        raise KeyError(f"{args.person} is not a person in the options")
+
+    if ADD_TYPES[args.media_type] is Movie:
+        if args.runtime is None:
+            raise ValueError("The runtime of a movie must be given with --runtime")
+        media = Movie(args.name, args.runtime, args.provider, args.person,
+                      started=args.started, finished=args.finished)
+    else:
+        media = ADD_TYPES[args.media_type](args.name, args.provider, args.person,
+                                           started=args.started, finished=args.finished)
+    save_media([media], args.base_dir)
+    library.append(media)
+    print(media.get_id())
+    return 0
+
+
+def mark_watched_command(library: List[Media], args: Namespace) -> int:
+    """Marks a Movie as finished, or the Episodes of a show as watched"""
+    media = find_media(library, args.media)
+    watched = not args.unwatched
+
+    if isinstance(media, Movie):
+        if watched:
+            media.set_finished(True)
+        else:
+            media.set_finished(False)
+            media.set_started(False)
+        save_media([media], args.base_dir)
+        print(f"Marked {media.get_name()} as {'finished' if watched else 'not started'}")
+        return 0
+
+    # Find the Episodes to mark, which are every Episode up to
+    #   the last chosen Episode when --up-to is given
+    if not args.all and args.season is None and args.episode is None:
+        raise ValueError("Choose the episodes with --season and --episode, or use --all")
+    entries = media.get_catalog().get_entries()
+    chosen = [i for i in range(len(entries))
+              if (args.season is None or entries[i][0] == args.season) and
+              (args.episode is None or entries[i][1] == args.episode)]
+    watch_ranges = media.get_watch_ranges()
+    watched_count = watch_ranges.get_count()
+    if args.all:
+        watch_ranges.set_range(0, len(entries), watched)
+    elif len(chosen) == 0:
+        raise KeyError(f"{media.get_name()} has no episode matching the --season and --episode")
+    elif args.up_to:
+        watch_ranges.set_range(0, chosen[-1] + 1, watched)
+    else:
+        for i in chosen:
+            watch_ranges.set_watched(i, watched)
+
+    changed = abs(watch_ranges.get_count() - watched_count)
+    update_progress(media)
+    save_media([media], args.base_dir)
+    print(f"Marked {changed} episode(s) of {media.get_name()} as {'watched' if watched else 'unwatched'}")
+    return 0
+
+
+def import_command(library: List[Media], args: Namespace) -> int:
+    """Imports Media from CSV or JSON files, matching it against the existing Media"""
+    providers = set(options.get_providers())
+    persons = set(options.get_persons())
+    media = []
+    for filename in args.files:
+        media.extend(file_to_media(filename, providers, persons))
+
+    plan = plan_import(library, media)
+    print(f"Importing {len(args.files)} file(s) will result in: {plan.get_summary()}")
+    if args.dry_run:
+        return 0
+    save_media(apply_import(plan, library), args.base_dir)
+    return 0
+
+
+def export_command(library: List[Media], args: Namespace) -> int:
+    """Exports all the Media and prints the filename of the export"""
+    export = {
+        "json": media_to_json, "csv": media_to_csv,
+        "delta": media_to_delta, "npz": media_to_npz
+    }[args.format]
+    print(export(library, compress=args.compress, base_dir=args.base_dir))
+    return 0
+
+
+def clean_command(library: List[Media], args: Namespace) -> int:
+    """Deletes the saved Catalogs that no Show refers to anymore"""
+    removed = sweep_catalogs(args.base_dir)
+    print(f"Removed {len(removed)} unused catalog{'s' if len(removed) != 1 else ''}")
+    return 0
+
+
+def stats_command(library: List[Media], args: Namespace) -> int:
+    """Prints the stats of the Media that matches the filters"""
+    media = filter_library(library, args)
+    shows = [m for m in media if isinstance(m, Show)]
+    stats = {
+        "media": len(media),
+        "types": {media_type: len([m for m in media if get_type(m) == media_type])
+                  for media_type in get_type()},
+        "started": len([m for m in media if m.is_started()]),
+        "finished": len([m for m in media if m.is_finished()]),
+        "runtime": sum([m.get_runtime() for m in media]),
+        "episodes": sum([show.get_episode_count() for show in shows]),
+        "watched_episodes": sum([show.get_watched_count() for show in shows]),
+        "watched_runtime": sum([show.get_watched_runtime() for show in shows]) + sum(
+            [m.get_runtime() for m in media if isinstance(m, Movie) and m.is_finished()])
+    }
+    if args.json:
+        print(dumps(stats, indent=4))
+        return 0
+    total = stats["media"]
+    print(f"{total} media: " + ", ".join(f"{count} {media_type}" for media_type, count in stats["types"].items()))
+    print("{}% Started, {}% Finished".format(
+        round(stats["started"] / total * 100, 2) if total != 0 else 0,
+        round(stats["finished"] / total * 100, 2) if total != 0 else 0))
+    print(f"{stats['watched_episodes']}/{stats['episodes']} episode(s) watched")
+    print(f"Runtime: {format_runtime(stats['runtime'])} ({format_runtime(stats['watched_runtime'])} watched)")
+    return 0
+
+
+def up_next_command(library: List[Media], args: Namespace) -> int:
+    """Prints the started Shows to watch next along with the next Episode to watch in each.
+    The daemon keeps the Shows ranked between requests, otherwise they are ranked from the library
+    """
+    up_next = getattr(args, "up_next", None)
+    if up_next is None:
+        up_next = UpNext(policy=args.policy, providers=args.provider or options.get_providers())
+        up_next.update_all(library, get_activity(args.base_dir))
+
+    items = up_next.get_top(args.limit, person=args.person)
+    summaries = []
+    for item in items:
+        season, episode, name, runtime = item.get_episode()
+        summary = media_summary(item.get_media())
+        summary["next"] = {"season": season, "episode": episode, "name": name, "runtime": runtime}
+        summary["remaining"] = item.get_remaining()
+        summaries.append(summary)
+    if args.json:
+        print(dumps(summaries, indent=4))
+        return 0
+    for summary in summaries:
+        print(f"{summary['id'][:8]}  {summary['provider']:<12}  {summary['person']:<10}  "
+              f"S{summary['next']['season']:02d}E{summary['next']['episode']:02d}  "
+              f"{format_runtime(summary['remaining']) + ' left':<20}  {summary['name']}: {summary['next']['name']}")
+    return 0
+
+
+def serve_command(library: List[Media], args: Namespace) -> int:
+    """Shares the Media over HTTP until stopped so other machines can pull the changes"""
+    from sync import SyncServer
+    server = SyncServer(args.base_dir, host=args.host, port=args.port)
+    print(f"Serving the media of {args.base_dir} on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def pull_command(library: List[Media], args: Namespace) -> int:
+    """Pulls the Media that changed on a sync server since the last pull"""
+    from sync import pull_changes
+    from urllib.error import URLError
+    try:
+        result = pull_changes(args.url, base_dir=args.base_dir)
+    except URLError as e:
+        print(f"mediaqueue pull: Could not pull from {args.url}: {e.reason}", file=sys.stderr)
+        return 1
+    print(f"Pulled version {result.get_version()} from {args.url}: {result.get_summary()}")
+    return 0
+
+
+def sync_command(library: List[Media], args: Namespace) -> int:
+    """Syncs the Media with another base directory in both directions"""
+    from sync import sync_directories
+    if not os.path.isdir(args.other_dir):
+        raise ValueError(f"{args.other_dir} is not a directory")
+    plan = sync_directories(args.base_dir, args.other_dir, dry_run=args.dry_run)
+    print(f"Syncing with {args.other_dir} {'will result' if args.dry_run else 'resulted'} in: {plan.get_summary()}")
+    return 0
+
+
+# The function of each subcommand
+COMMANDS = {
+    "list": list_command,
+    "query": query_command,
+    "add": add_command,
+    "mark-watched": mark_watched_command,
+    "import": import_command,
+    "export": export_command,
+    "clean": clean_command,
+    "stats": stats_command,
+    "up-next": up_next_command,
+    "serve": serve_command,
+    "pull": pull_command,
+    "sync": sync_command
+}
+
+# The subcommands that do not need the Media to be loaded first
+NO_LIBRARY_COMMANDS = ["add", "clean", "serve", "pull", "sync"]
+
+# The subcommands that save Media into the data folder
+SAVING_COMMANDS = ["add", "mark-watched", "import", "pull", "sync"]
+
+# The subcommands that are never sent to the daemon
+NO_DAEMON_COMMANDS = ["serve"]
+
+
+def create_parser() -> ArgumentParser:
+    """Creates the parser of the command line arguments of every subcommand"""
+    parser = ArgumentParser(prog="mediaqueue", description="Manages the Media Queue without the window")
+    parser.add_argument("--base-dir", help="The base directory of the Media. (Defaults to the one in the options)")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Load the Media directly even if the daemon is running")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Keep the Media in memory and answer the commands over a Unix socket")
+    daemon_parser.add_argument("--stop", action="store_true", help="Stop the running daemon")
+
+    list_parser = subparsers.add_parser("list", help="List the media")
+    add_filter_arguments(list_parser)
+    list_parser.add_argument("--json", action="store_true", help="Print the media as JSON")
+
+    query_parser = subparsers.add_parser("query", help="Show a piece of media and its episodes")
+    query_parser.add_argument("media", help="The ID, the start of the ID, or the name of the media")
+    query_parser.add_argument("--json", action="store_true", help="Print the media as JSON")
+
+    add_parser = subparsers.add_parser("add", help="Add a piece of media")
+    add_parser.add_argument("media_type", choices=list(ADD_TYPES))
+    add_parser.add_argument("--name", required=True)
+    add_parser.add_argument("--provider", required=True)
+    add_parser.add_argument("--person", required=True)
+    add_parser.add_argument("--runtime", type=int, help="The runtime of a movie, in minutes")
+    add_parser.add_argument("--started", action="store_true")
+    add_parser.add_argument("--finished", action="store_true")
+
+    mark_parser = subparsers.add_parser("mark-watched", help="Mark a movie or the episodes of a show as watched")
+    mark_parser.add_argument("media", help="The ID, the start of the ID, or the name of the media")
+    mark_parser.add_argument("--season", type=int, help="Only mark the episodes of this season")
+    mark_parser.add_argument("--episode", type=int, help="Only mark this episode")
+    mark_parser.add_argument("--up-to", action="store_true",
+                             help="Mark every episode up to and including the chosen episode")
+    mark_parser.add_argument("--all", action="store_true", help="Mark every episode")
+    mark_parser.add_argument("--unwatched", action="store_true", help="Mark as unwatched instead")
+
+    import_parser = subparsers.add_parser("import", help="Import media from CSV or JSON files")
+    import_parser.add_argument("files", nargs="+")
+    import_parser.add_argument("--dry-run", action="store_true",
+                               help="Only print what the import would do")
+
+    export_parser = subparsers.add_parser("export", help="Export all the media")
+    export_parser.add_argument("format", choices=["json", "csv", "delta", "npz"])
+    export_parser.add_argument("--compress", action="store_true")
+
+    subparsers.add_parser("clean", help="Remove the saved catalogs of episodes that no show uses anymore")
+
+    stats_parser = subparsers.add_parser("stats", help="Print the stats of the media")
+    add_filter_arguments(stats_parser)
+    stats_parser.add_argument("--json", action="store_true", help="Print the stats as JSON")
+
+    up_next_parser = subparsers.add_parser("up-next", help="Print the started shows to watch next")
+    up_next_parser.add_argument("--limit", type=int, default=10, help="The amount of shows to print (default: 10)")
+    up_next_parser.add_argument("--policy", choices=POLICIES, default="recent",
+                                help="Rank the shows by the most recently watched, the least runtime left, "
+                                     "or the streaming provider (default: recent)")
+    up_next_parser.add_argument("--provider", action="append",
+                                help="A preferred streaming provider for the provider policy, best first. "
+                                     "Can be given more than once. (Defaults to the order in the options)")
+    up_next_parser.add_argument("--person", help="Only include shows watched by this person")
+    up_next_parser.add_argument("--json", action="store_true", help="Print the shows as JSON")
+
+    serve_parser = subparsers.add_parser("serve", help="Share the media over HTTP so other machines can pull it")
+    serve_parser.add_argument("--host", default="127.0.0.1",
+                              help="The host to listen on (default: 127.0.0.1, use 0.0.0.0 for the whole network)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="The port to listen on (default: 8765)")
+
+    pull_parser = subparsers.add_parser("pull", help="Pull the media that changed on a sync server")
+    pull_parser.add_argument("url", help="The URL of the sync server, like http://192.168.1.2:8765")
+
+    sync_parser = subparsers.add_parser("sync", help="Sync the media with another base directory in both directions")
+    sync_parser.add_argument("other_dir", help="The other base directory, like a folder on a NAS")
+    sync_parser.add_argument("--dry-run", action="store_true", help="Only print what the sync would do")
+    return parser
+
+
+def run_command(library: List[Media], args: Namespace) -> int:
+    """Runs the subcommand of the parsed arguments on the library and returns the exit code.
+    Errors about the arguments or the Media, files that cannot be read or written,
+    and a missing optional dependency like NumPy, are printed instead of raised
+
+    :param library: The Media to run the subcommand on
+    :param args: The parsed command line arguments
+    """
+    try:
+        return COMMANDS[args.command](library, args)
+    except (KeyError, ValueError, TypeError, ConflictError, ImportError) as e:
+        print(f"mediaqueue {args.command}: {e.args[0] if len(e.args) > 0 else e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        message = e.strerror or str(e)
+        if e.filename is not None:
+            message = f"{message}: {e.filename}"
+        print(f"mediaqueue {args.command}: {message}", file=sys.stderr)
+        return 1
+
+
+def main(args: List[str] = None) -> int:
+    """Runs the subcommand in the command line arguments and returns the exit code.
+
+    When the daemon is running for the base directory, the subcommand is sent to the daemon
+    which already has the Media loaded. Otherwise, the Media is loaded directly
+
+    :param args: The command line arguments. (Defaults to sys.argv)
+    """
+    args = create_parser().parse_args(args)
+    if args.base_dir is None:
+        args.base_dir = options.get_base_dir()
+    if args.base_dir is None or not os.path.isdir(args.base_dir):
+        print("The base directory is not set up yet. Open the Media Queue or use --base-dir", file=sys.stderr)
+        return 2
+    args.base_dir = os.path.abspath(args.base_dir)
+
+    # The daemon runs in its own working directory
+    if args.command == "import":
+        args.files = [os.path.abspath(filename) for filename in args.files]
+    if args.command == "sync":
+        args.other_dir = os.path.abspath(args.other_dir)
+
+    from cli import daemon
+    if args.command == "daemon":
+        if args.stop:
+            return daemon.stop_daemon(args.base_dir)
+        return daemon.run_daemon(args.base_dir)
+
+    # The subcommand only runs here when no daemon is running, since a daemon that
+    #   did not answer may have already run it
+    if not args.no_daemon and args.command not in NO_DAEMON_COMMANDS:
+        try:
+            response = daemon.send_command(args)
+        except ConnectionError as e:
+            print(f"mediaqueue {args.command}: {e}", file=sys.stderr)
+            return 1
+        if response is not None:
+            sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            return response["code"]
+
+    library = [] if args.command in NO_LIBRARY_COMMANDS else load_library(args.base_dir)
+    return run_command(library, args)
@@ -0,0 +1,303 @@
+import os
+import socket
+import sys
+import threading
+from argparse import Namespace
+from contextlib import redirect_stdout, redirect_stderr
+from io import StringIO
+from json import dumps, loads
+from socketserver import StreamRequestHandler, UnixStreamServer
+from typing import Union
+
+from options import options
+from util import UpNext, data_file_to_media, get_data_file_stats
+
+SOCKET_NAME = ".mediaqueue.sock"
+
+
+def get_socket_path(base_dir: str) -> str:
+    """Returns the path of the socket of the daemon for the specified base directory
+
+    :param base_dir: The base directory of the Media
+    """
+    return os.path.join(base_dir, SOCKET_NAME)
+
+
+def connect(base_dir: str) -> Union[socket.socket, None]:
+    """Connects to the daemon of the base directory and returns the socket,
+    or None when no daemon is running
+
+    :param base_dir: The base directory of the Media
+    """
+    path = get_socket_path(base_dir)
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+    except OSError:
+        client.close()
+        return None
+    return client
+
+
+def request(base_dir: str, message: dict) -> Union[dict, None]:
+    """Sends a message to the daemon of the base directory and returns its response,
+    or None when no daemon is running
+
+    :param base_dir: The base directory of the Media
+    :param message: The JSON message to send
+
+    :raises ConnectionError: When the daemon was connected to but did not answer
+    """
+    client = connect(base_dir)
+    if client is None:
+        return None
+    with client, client.makefile("rwb") as stream:
+        stream.write(dumps(message).encode() + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise ConnectionError("The daemon closed the connection without answering")
+    return loads(line)
+
+
+def send_command(args: Namespace) -> Union[dict, None]:
+    """Sends the parsed command line arguments to the daemon and returns
+    the exit code and the output of the command, or None when no daemon is running
+
+    :param args: The parsed command line arguments
+
+    :raises ConnectionError: When the daemon was connected to but did not answer
+    """
+    return request(args.base_dir, {"args": vars(args)})
+
+
+def stop_daemon(base_dir: str) -> int:
+    """Stops the daemon of the base directory and returns the exit code
+
+    :param base_dir: The base directory of the Media
+    """
+    try:
+        response = request(base_dir, {"command": "shutdown"})
+    except ConnectionError as e:
+        print(f"The daemon could not be stopped: {e}", file=sys.stderr)
+        return 1
+    if response is None:
+        print("The daemon is not running", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_daemon(base_dir: str) -> int:
+    """Runs the daemon of the base directory until it is stopped and returns the exit code
+
+    :param base_dir: The base directory of the Media
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        print("The daemon needs Unix sockets, which this platform does not have", file=sys.stderr)
+        return 1
+    path = get_socket_path(base_dir)
+    if connect(base_dir) is not None:
+        print(f"The daemon is already running on {path}", file=sys.stderr)
+        return 1
+
+    # A socket left behind by a daemon that crashed is removed
+    if os.path.exists(path):
+        os.unlink(path)
+
+    server = MediaQueueDaemon(base_dir)
+    print(f"Serving {len(server.library)} media on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stopped.set()
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+    return 0
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+class DaemonRequestHandler(StreamRequestHandler):
+    """Answers every JSON message, one per line, sent on a connection to the daemon.
+
+    A message is either {"command": "shutdown"} or {"args": {...}} with the parsed
+    command line arguments of a subcommand. Every message is answered with
+    {"code": ..., "stdout": ..., "stderr": ...}, where a message that cannot be run
+    is answered with the code 2 and the reason in stderr, like a bad command line,
+    and a command that fails is answered with the code 1 and the error in stderr
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                message = self.parse(line)
+            except ValueError as e:
+                self.write({"code": 2, "stdout": "", "stderr": f"mediaqueue daemon: {e}\n"})
+                continue
+
+            if message.get("command") == "shutdown":
+                self.write({"code": 0})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            try:
+                response = self.server.run(Namespace(**message["args"]))
+            except AttributeError as e:
+                response = {"code": 2, "stdout": "",
+                            "stderr": f"mediaqueue {message['args']['command']}: "
+                                      f"The request is missing the argument {getattr(e, 'name', None) or e}\n"}
+            except Exception as e:
+
+                # The client would otherwise see no answer, so every error is answered
+                response = {"code": 1, "stdout": "",
+                            "stderr": f"mediaqueue {message['args']['command']}: {type(e).__name__}: {e}\n"}
+            self.write(response)
+
+    @staticmethod
+    def parse(line: bytes) -> dict:
+        """Returns the message of a line sent to the daemon
+
+        :param line: The line sent to the daemon
+
+        :raises ValueError: When the line is not a message the daemon can answer
+        """
+        from cli.commands import COMMANDS, NO_DAEMON_COMMANDS
+
+        try:
+            message = loads(line)
+        except ValueError:
+            raise ValueError("The request is not valid JSON")
+        if not isinstance(message, dict):
+            raise ValueError("The request must be a JSON object")
+        if message.get("command") == "shutdown":
+            return message
+        if not isinstance(message.get("args"), dict):
+            raise ValueError("The request must have the arguments of a command in \"args\"")
+        command = message["args"].get("command")
+        if command not in COMMANDS or command in NO_DAEMON_COMMANDS:
+            raise ValueError(f"The daemon cannot run the command {command}")
+        return message
+
+    def write(self, response: dict):
+        """Writes a JSON response to the client
+
+        :param response: The response to write
+        """
+        self.wfile.write(dumps(response).encode() + b"\n")
+        self.wfile.flush()
+
+
+class MediaQueueDaemon(UnixStreamServer):
+    """The Media Queue Daemon keeps the Media of a base directory in memory
+    and runs the command line subcommands on it, sent over a Unix socket.
+
+    The requests are handled one at a time, so the daemon is the only writer
+    of the data folder while every client uses it. The data folder is checked
+    for files that were changed by something else, like the window, every second
+    and only the changed files are loaded again.
+
+    The Up Next engines used by the up-next subcommand are kept for every policy that
+    was asked for and only the changed Media is moved in them on each refresh
+
+    :param base_dir: The base directory of the Media
+    :keyword interval: The seconds between checking the data folder for changes
+    """
+
+    INTERVAL = 1
+
+    def __init__(self, base_dir: str, *, interval: float = INTERVAL):
+        self.base_dir = base_dir
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+        self.files = {}
+        self.media_by_file = {}
+        self.library = []
+        self.up_next = {}
+        self.refresh()
+
+        super().__init__(get_socket_path(base_dir), DaemonRequestHandler)
+        self.watcher = threading.Thread(target=self.watch, name="MediaQueueDaemonWatcher", daemon=True)
+        self.watcher.start()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def run(self, args: Namespace) -> dict:
+        """Runs a subcommand on the Media in memory and returns
+        the exit code and what the subcommand printed
+
+        :param args: The parsed command line arguments of the subcommand
+        """
+        from cli.commands import run_command, NO_LIBRARY_COMMANDS, SAVING_COMMANDS
+
+        stdout, stderr = StringIO(), StringIO()
+        with self.lock, redirect_stdout(stdout), redirect_stderr(stderr):
+            args.base_dir = self.base_dir
+            library = [] if args.command in NO_LIBRARY_COMMANDS else self.library
+            if args.command == "up-next":
+                args.up_next = self.get_up_next(args.policy, args.provider or options.get_providers())
+            try:
+                code = run_command(library, args)
+            finally:
+
+                # Load the files that the subcommand saved right away, even when it failed
+                #   partway through, so the next request sees them
+                if args.command in SAVING_COMMANDS:
+                    self.refresh()
+        return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def get_up_next(self, policy: str, providers: list) -> UpNext:
+        """Returns the Up Next engine for the specified policy and Streaming Providers,
+        which ranks the Media in memory the first time it is asked for
+
+        :param policy: The policy to rank the Shows by
+        :param providers: The preferred Streaming Providers, in order, for the provider policy
+        """
+        key = (policy, tuple(providers))
+        if key not in self.up_next:
+            up_next = UpNext(policy=policy, providers=providers)
+            for filename, media in self.media_by_file.items():
+                stat = self.files.get(filename)
+                up_next.update(media, stat[0] / 1e9 if stat is not None else None)
+            self.up_next[key] = up_next
+        return self.up_next[key]
+
+    def watch(self):
+        """Checks the data folder for changes until the daemon is stopped"""
+        while not self.stopped.wait(self.interval):
+            with self.lock:
+                try:
+                    self.refresh()
+                except OSError as e:
+                    print(f"Could not check the data folder: {e}", file=sys.stderr)
+
+    def refresh(self):
+        """Loads the files in the data folder that were added or changed
+        since the last refresh and removes the Media whose files were deleted
+        """
+        files = get_data_file_stats(self.base_dir)
+        for filename in self.files.keys() - files.keys():
+            media = self.media_by_file.pop(filename, None)
+            if media is not None:
+                for up_next in self.up_next.values():
+                    up_next.remove(media.get_id())
+        for filename, stat in files.items():
+            if self.files.get(filename) != stat:
+                try:
+                    self.media_by_file[filename] = data_file_to_media(filename)
+                    for up_next in self.up_next.values():
+                        up_next.update(self.media_by_file[filename], stat[0] / 1e9)
+                except (OSError, ValueError, KeyError) as e:
+
+                    # A file that is still being written is loaded on the next refresh
+                    print(f"Could not load {filename}: {e}", file=sys.stderr)
+                    stat = None
+            files[filename] = stat
+        self.files = files
+        self.library = list(self.media_by_file.values())
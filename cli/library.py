@@ -0,0 +1,73 @@
+from typing import List, Union
+
+from media import Media, Show
+from util import get_data_files, data_file_to_media
+
+
+def load_library(base_dir: str) -> List[Media]:
+    """Loads every piece of Media saved inside the data folder of the base directory
+
+    :param base_dir: The base directory to load the Media from
+    """
+    return [data_file_to_media(filename) for filename in get_data_files(base_dir)]
+
+
+def find_media(library: List[Media], key: str) -> Media:
+    """Returns the Media whose ID, the start of whose ID, or whose name matches the key.
+    Names are matched ignoring case
+
+    :param library: The Media to look in
+    :param key: The ID, the start of the ID, or the name of the Media
+
+    :raises KeyError: When no Media, or more than one Media, matches the key
+    """
+    matches = [media for media in library if media.get_id() == key]
+    if len(matches) == 0:
+        matches = [media for media in library if media.get_name().lower() == key.lower()]
+    if len(matches) == 0 and len(key) >= 4:
+        matches = [media for media in library if media.get_id().startswith(key)]
+    if len(matches) == 0:
+        raise KeyError(f"No media matches \"{key}\"")
+    if len(matches) > 1:
+        raise KeyError("\"{}\" matches more than one piece of media: {}".format(
+            key, ", ".join(f"{media.get_name()} ({media.get_id()[:8]})" for media in matches)))
+    return matches[0]
+
+
+def format_runtime(minutes: Union[int, float]) -> str:
+    """Returns the runtime in weeks, days, hours, and minutes like the stats on the Home screen
+
+    :param minutes: The runtime in minutes
+    """
+    weeks, days = divmod(int(minutes), 7 * 24 * 60)
+    days, hours = divmod(days, 24 * 60)
+    hours, minutes = divmod(hours, 60)
+    runtime_stats = {
+        "wks": weeks, "days": days,
+        "hours": hours, "mins": minutes
+    }
+    return " ".join([
+        f"{runtime_stats[stat]}{stat[:-1]}"
+        if runtime_stats[stat] == 1
+        else f"{runtime_stats[stat]}{stat}"
+        for stat in runtime_stats
+        if runtime_stats[stat] > 0
+    ]) or "0mins"
+
+
+def update_progress(media: Media):
+    """Updates whether the Media is started or finished from its watched Episodes.
+    A Movie is left unchanged
+
+    :param media: The Media to update
+    """
+    if not isinstance(media, Show) or media.get_episode_count() == 0:
+        return
+    watched = media.get_watched_count()
+    if watched == media.get_episode_count():
+        media.set_finished(True)
+    elif watched > 0:
+        media.set_started(True)
+    else:
+        media.set_started(False)
+        media.set_finished(False)
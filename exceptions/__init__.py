@@ -1 +1,2 @@
 from exceptions.errors import InvalidFormatError
+from exceptions.errors import ConflictError
@@ -1,2 +1,6 @@
 class InvalidFormatError(Exception):
     pass
+
+
+class ConflictError(Exception):
+    pass
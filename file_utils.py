@@ -0,0 +1,60 @@
+import os
+import threading
+from contextlib import contextmanager
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def lock_file(filename: str):
+    """Holds an advisory lock on the specified lock file while inside the context,
+    waiting for any other process, or thread, that holds the lock to release it.
+
+    The lock only keeps out the writers that also take it, so every writer
+    of the Media and the options takes it. The lock file is created if needed
+
+    :param filename: The filename of the lock file
+    """
+    with open(filename, "a+b") as file:
+        if os.name == "nt":
+            # Lock the first byte of the file, retrying until it is free
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def write_atomic(filename: str, data: bytes):
+    """Writes the data into a temporary file next to the specified file
+    and then renames it over the file, so a reader sees either
+    the old file or the new file, but never a partly written file
+
+    :param filename: The filename of the file to write
+    :param data: The data to write into the file
+    """
+    directory, name = os.path.split(filename)
+    temp_filename = os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_filename, "wb") as file:
+            file.write(data)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
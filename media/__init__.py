@@ -1,8 +1,10 @@
 from .media import Media
+from .watch_ranges import WatchRanges
 from .episode import Episode
 from .season import Season
-from .movie import Movie
+from .catalog import Catalog
 from .show import Show
+from .movie import Movie
 from .tv_show import TVShow
 from .limited_series import LimitedSeries
 from .podcast import Podcast
@@ -0,0 +1,160 @@
+from hashlib import sha1
+from itertools import accumulate
+from json import dumps
+from typing import List, Tuple, Union
+from weakref import WeakValueDictionary
+
+from media.watch_ranges import WatchRanges
+
+
+class Catalog:
+    """A Catalog holds what is shared by everyone watching the same Show:
+    its Seasons and Episodes, with the name and runtime of each Episode.
+
+    Whether or not each Episode has been watched is kept by each Show as Watch Ranges
+    over the Episodes of its Catalog, in the order of the Seasons and then the Episodes.
+    A Catalog never changes, so Shows with the same Seasons and Episodes share one
+    Catalog in memory and one file in the data folder, named by its hash
+
+    :param seasons: The Seasons as (season, Episodes) or None when the Show only has Episodes
+    :param episodes: The Episodes as (season, episode, name, runtime) or None when the Show only has Seasons
+
+    :keyword json: The JSON object of a Catalog to load from
+    """
+
+    __instances = WeakValueDictionary()
+
+    def __init__(self, seasons: Tuple[Tuple[int, tuple], ...] = None,
+                 episodes: Tuple[Tuple[int, int, str, int], ...] = None,
+                 *, json: dict = None):
+
+        # Check if the JSON object is given
+        if json is not None:
+            if json.get("seasons") is not None:
+                seasons = tuple((season["season"], Catalog.__to_entries(season["episodes"]))
+                                for season in json["seasons"])
+            if json.get("episodes") is not None:
+                episodes = Catalog.__to_entries(json["episodes"])
+
+        self.__seasons = seasons
+        self.__episodes = episodes
+        self.__entries = tuple(entry for _, entries in seasons or () for entry in entries) + (episodes or ())
+        self.__runtimes = list(accumulate([entry[3] for entry in self.__entries], initial=0))
+        self.__runtime = self.__runtimes[-1]
+        self.__hash = sha1(dumps(self.to_json(), sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+    def __eq__(self, catalog: 'Catalog'):
+        if not isinstance(catalog, Catalog):
+            return False
+        return catalog.get_hash() == self.get_hash()
+
+    def __hash__(self):
+        return hash(self.__hash)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @staticmethod
+    def __to_entries(episodes: List[dict]) -> tuple:
+        """Returns the Episodes of a JSON object as (season, episode, name, runtime)"""
+        return tuple((episode["season"], episode["episode"], episode["name"], episode["runtime"])
+                     for episode in episodes)
+
+    @staticmethod
+    def intern(catalog: 'Catalog') -> 'Catalog':
+        """Returns the Catalog in memory with the same hash as the specified Catalog,
+        or the specified Catalog when there is none, so every Show shares one Catalog
+
+        :param catalog: The Catalog to share
+        """
+        existing = Catalog.__instances.get(catalog.get_hash())
+        if existing is not None:
+            return existing
+        Catalog.__instances[catalog.get_hash()] = catalog
+        return catalog
+
+    @staticmethod
+    def find(catalog_hash: str) -> Union['Catalog', None]:
+        """Returns the Catalog in memory with the specified hash, or None if it is not in memory
+
+        :param catalog_hash: The hash of the Catalog
+        """
+        return Catalog.__instances.get(catalog_hash)
+
+    @staticmethod
+    def from_json(json: dict) -> Tuple['Catalog', WatchRanges]:
+        """Returns the shared Catalog of the JSON object of a Show with every Episode in it,
+        along with the Watch Ranges of the Episodes that were watched
+
+        :param json: The JSON object of the Show
+        """
+        catalog = Catalog.intern(Catalog(json=json))
+        episodes = [episode for season in json.get("seasons") or [] for episode in season["episodes"]]
+        episodes += json.get("episodes") or []
+        return catalog, WatchRanges.from_flags([episode.get("watched", False) for episode in episodes])
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def get_hash(self) -> str:
+        """Returns the hash of this Catalog, which names its file in the data folder"""
+        return self.__hash
+
+    def get_seasons(self) -> Union[Tuple[Tuple[int, tuple], ...], None]:
+        """Returns the Seasons of this Catalog as (season, Episodes),
+        or None when the Show only has Episodes
+        """
+        return self.__seasons
+
+    def get_episodes(self) -> Union[Tuple[Tuple[int, int, str, int], ...], None]:
+        """Returns the Episodes of this Catalog as (season, episode, name, runtime),
+        or None when the Show only has Seasons
+        """
+        return self.__episodes
+
+    def get_entries(self) -> Tuple[Tuple[int, int, str, int], ...]:
+        """Returns every Episode in this Catalog in the order of the Watch Ranges"""
+        return self.__entries
+
+    def get_runtime(self) -> int:
+        """Returns the runtime of every Episode in this Catalog, in minutes"""
+        return self.__runtime
+
+    def get_runtime_between(self, start: int, end: int) -> int:
+        """Returns the runtime of the Episodes from the start index up to,
+        but not including, the end index, in minutes
+
+        :param start: The index of the first Episode
+        :param end: The index after the last Episode
+        """
+        return self.__runtimes[min(end, len(self.__entries))] - self.__runtimes[min(start, len(self.__entries))]
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def to_json(self, watched: WatchRanges = None) -> dict:
+        """Returns the JSON representation of this Catalog, or of the Seasons and Episodes
+        of a Show when the Watch Ranges of the watched Episodes are specified
+
+        :param watched: The Watch Ranges of the Episodes that were watched
+        """
+        index = 0
+
+        def episodes_to_json(entries: tuple) -> List[dict]:
+            nonlocal index
+            episodes = []
+            for season, episode, name, runtime in entries:
+                json_object = {"season": season, "episode": episode, "name": name, "runtime": runtime}
+                if watched is not None:
+                    json_object["watched"] = watched.is_watched(index)
+                episodes.append(json_object)
+                index += 1
+            return episodes
+
+        json_object = {}
+        if self.__seasons is not None:
+            json_object["seasons"] = [{"season": season, "episodes": episodes_to_json(entries)}
+                                      for season, entries in self.__seasons]
+        if self.__episodes is not None:
+            json_object["episodes"] = episodes_to_json(self.__episodes)
+        return json_object
@@ -1,3 +1,9 @@
+from csv import writer
+from io import StringIO
+
+from media.watch_ranges import WatchRanges
+
+
 class Episode:
     """An Episode is part of a Season, a Limited Series, or a Podcast.
 
@@ -46,6 +52,8 @@ class Episode:
         self.__name = name
         self.__runtime = runtime
         self.__watched = watched
+        self.__watch_ranges = None
+        self.__index = None
 
     def __str__(self):
         return "Episode({}, {}, {}, {}, {})".format(
@@ -70,8 +78,20 @@ class Episode:
 
         :param watched: Whether or not the Episode has been watched
         """
+        if self.__watch_ranges is not None:
+            self.__watch_ranges.set_watched(self.__index, watched)
         self.__watched = watched
 
+    def bind(self, watch_ranges: WatchRanges, index: int):
+        """Keeps whether or not this Episode has been watched in the Watch Ranges of its Show
+        so marking this Episode updates the Show right away
+
+        :param watch_ranges: The Watch Ranges of the Show
+        :param index: The index of this Episode in the Show
+        """
+        self.__watch_ranges = watch_ranges
+        self.__index = index
+
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def get_season(self) -> int:
@@ -92,15 +112,24 @@ class Episode:
 
     def is_watched(self) -> bool:
         """Returns whether or not this Episode has been watched"""
+        if self.__watch_ranges is not None:
+            return self.__watch_ranges.is_watched(self.__index)
         return self.__watched
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def to_csv(self) -> str:
         """Returns the CSV representation of this Episode"""
-        return "{},{},\"{}\",{},{}".format(
+        csv_file = StringIO()
+        writer(csv_file, lineterminator="").writerow(self.to_csv_row())
+        return csv_file.getvalue()
+
+    def to_csv_row(self) -> list:
+        """Returns the row of the CSV representation of this Episode"""
+        return [
             self.get_season(), self.get_episode(),
-            self.get_name(), self.get_runtime(), self.is_watched())
+            self.get_name(), self.get_runtime(), self.is_watched()
+        ]
 
     def to_json(self) -> dict:
         """Returns the JSON representation of this Episode"""
@@ -1,9 +1,8 @@
-import os
-from json import dump
 from typing import List
 
 from media import Episode, Show
-from options import options
+from media.storage import save_media
+from profiling import profiler
 
 
 class LimitedSeries(Show):
@@ -56,15 +55,14 @@ class LimitedSeries(Show):
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def to_csv(self) -> str:
-        """Returns the CSV representation of this LimitedSeries object"""
-        show_csv = "\"{}\",{},{},{},{}".format(
-            self.get_name(), self.get_provider(),
-            self.get_person(),
-            self.is_started(), self.is_finished()
-        )
-        episodes_csv = "\n".join(episode.to_csv() for episode in self.get_episodes())
-        return f"LimitedSeries\n{show_csv}\n{episodes_csv}"
+    def to_csv_rows(self) -> List[list]:
+        """Returns the rows of the CSV representation of this LimitedSeries object"""
+        return [
+            ["LimitedSeries"],
+            [self.get_name(), self.get_provider(),
+             self.get_person(),
+             self.is_started(), self.is_finished()]
+        ] + [episode.to_csv_row() for episode in self.get_episodes()]
 
     def to_json(self) -> dict:
         """Returns the JSON representation of this LimitedSeries object"""
@@ -72,11 +70,11 @@ class LimitedSeries(Show):
         super_json.pop("seasons")   # A limited series shouldn't have Seasons
         return super_json
 
+    @profiler.profile("LimitedSeries.save")
     def save(self):
-        """Saves this LimitedSeries object into a JSON file"""
-        if not os.path.exists(f"{options.get_base_dir()}/data"):
-            os.mkdir(f"{options.get_base_dir()}/data")
-        if not os.path.exists(f"{options.get_base_dir()}/data/{LimitedSeries.FOLDER}"):
-            os.mkdir(f"{options.get_base_dir()}/data/{LimitedSeries.FOLDER}")
-        with open("{}/data/{}/{}.json".format(options.get_base_dir(), LimitedSeries.FOLDER, self.get_id()), "w") as jsonfile:
-            dump(self.to_json(), jsonfile, indent=4)
+        """Saves this LimitedSeries object into a JSON file through the storage, which checks
+        that the file was not changed by something else since this LimitedSeries was loaded
+
+        :raises ConflictError: When the file was changed by something else since this LimitedSeries was loaded
+        """
+        save_media([self])
@@ -1,4 +1,7 @@
+from csv import writer
+from io import StringIO
 from json import load
+from typing import List
 from uuid import uuid4
 
 from exceptions import InvalidFormatError
@@ -32,6 +35,7 @@ class Media:
                  json: dict = None, filename: str = None):
 
         media_id = None  # Give the ID some default value
+        version = 0
 
         # Check if a JSON or CSV file was given
         if filename is not None:
@@ -55,6 +59,7 @@ class Media:
             person = json["person"]
             started = False if "started" not in json else json["started"]
             finished = False if "finished" not in json else json["finished"]
+            version = json.get("version", 0)
 
         # Validate the parameters values
         if name is None:
@@ -85,6 +90,7 @@ class Media:
         self.__person = person
         self.__started = started
         self.__finished = finished
+        self.__version = version
 
     def __eq__(self, media: 'Media'):
         if not isinstance(media, Media):
@@ -121,6 +127,12 @@ class Media:
         """Returns whether or not this Media has been finished"""
         return self.__finished
 
+    def get_version(self) -> int:
+        """Returns the version of this Media object, which is how many times it has been saved.
+        A Media object that has never been saved has a version of 0
+        """
+        return self.__version
+
     def get_runtime(self, in_hours: bool = False) -> int:
         """Returns the runtime of this media"""
         raise NotImplementedError()
@@ -131,6 +143,10 @@ class Media:
         """Sets the ID for this Media object"""
         self.__id = id
 
+    def set_version(self, version: int):
+        """Sets the version of this Media object"""
+        self.__version = version
+
     def set_name(self, name: str):
         """Sets the name for this Media object"""
         self.__name = name
@@ -159,12 +175,22 @@ class Media:
 
     def to_csv(self) -> str:
         """Returns the CSV representation of this Media object"""
+        csv_file = StringIO()
+        writer(csv_file, lineterminator="\n").writerows(self.to_csv_rows())
+        return csv_file.getvalue().rstrip("\n")
+
+    def to_csv_rows(self) -> List[list]:
+        """Returns the rows of the CSV representation of this Media object"""
         raise NotImplementedError()
 
     def to_json(self) -> dict:
         """Returns the JSON representation of this Media object"""
         raise NotImplementedError()
 
+    def to_record(self) -> dict:
+        """Returns the JSON representation of this Media object as it is saved in the data folder"""
+        return self.to_json()
+
     def save(self):
         """Saves this Media object into a JSON file"""
         raise NotImplementedError()
@@ -1,8 +1,9 @@
-import os
-from json import dump, load
+from json import load
+from typing import List
 
 from media import Media
-from options import options
+from media.storage import save_media
+from profiling import profiler
 
 
 class Movie(Media):
@@ -87,13 +88,14 @@ class Movie(Media):
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def to_csv(self) -> str:
-        """Returns the CSV representation of this Movie"""
-        return "Movie\n\"{}\",{},{},{},{},{}".format(
-            self.get_name(), self.get_runtime(),
-            self.get_provider(), self.get_person(),
-            self.is_started(), self.is_finished()
-        )
+    def to_csv_rows(self) -> List[list]:
+        """Returns the rows of the CSV representation of this Movie"""
+        return [
+            ["Movie"],
+            [self.get_name(), self.get_runtime(),
+             self.get_provider(), self.get_person(),
+             self.is_started(), self.is_finished()]
+        ]
 
     def to_json(self) -> dict:
         """Returns the JSON representation of this Movie"""
@@ -107,11 +109,11 @@ class Movie(Media):
             "finished": self.is_finished()
         }
 
+    @profiler.profile("Movie.save")
     def save(self):
-        """Saves this Movie into a JSON file"""
-        if not os.path.exists(f"{options.get_base_dir()}/data"):
-            os.mkdir(f"{options.get_base_dir()}/data")
-        if not os.path.exists(f"{options.get_base_dir()}/data/{Movie.FOLDER}"):
-            os.mkdir(f"{options.get_base_dir()}/data/{Movie.FOLDER}")
-        with open("{}/data/{}/{}.json".format(options.get_base_dir(), Movie.FOLDER, self.get_id()), "w") as jsonfile:
-            dump(self.to_json(), jsonfile, indent=4)
+        """Saves this Movie into a JSON file through the storage, which checks
+        that the file was not changed by something else since this Movie was loaded
+
+        :raises ConflictError: When the file was changed by something else since this Movie was loaded
+        """
+        save_media([self])
@@ -1,9 +1,8 @@
-import os
-from json import dump
 from typing import List
 
 from media import Season, TVShow
-from options import options
+from media.storage import save_media
+from profiling import profiler
 
 
 class Podcast(TVShow):
@@ -44,15 +43,17 @@ class Podcast(TVShow):
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def to_csv(self) -> str:
-        """Returns the JSON representation of this Podcast"""
-        return super().to_csv().replace("TVShow", "Podcast", 1)
+    def to_csv_rows(self) -> List[list]:
+        """Returns the rows of the CSV representation of this Podcast"""
+        rows = super().to_csv_rows()
+        rows[0] = ["Podcast"]
+        return rows
 
+    @profiler.profile("Podcast.save")
     def save(self):
-        """Saves this Podcast object into a JSON file"""
-        if not os.path.exists(f"{options.get_base_dir()}/data"):
-            os.mkdir(f"{options.get_base_dir()}/data")
-        if not os.path.exists(f"{options.get_base_dir()}/data/{Podcast.FOLDER}"):
-            os.mkdir(f"{options.get_base_dir()}/data/{Podcast.FOLDER}")
-        with open("{}/data/{}/{}.json".format(options.get_base_dir(), Podcast.FOLDER, self.get_id()), "w") as jsonfile:
-            dump(self.to_json(), jsonfile, indent=4)
+        """Saves this Podcast object into a JSON file through the storage, which checks
+        that the file was not changed by something else since this Podcast was loaded
+
+        :raises ConflictError: When the file was changed by something else since this Podcast was loaded
+        """
+        save_media([self])
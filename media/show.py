@@ -2,7 +2,8 @@ import os
 from json import dump, load
 from typing import List, Union
 
-from media import Media, Season, Episode
+from media import Media, Season, Episode, Catalog
+from media.watch_ranges import WatchRanges
 
 
 class Show(Media):
@@ -11,6 +12,14 @@ class Show(Media):
 
     Note that this should not be created. Use TVShow, LimitedSeries, or Podcast
 
+    A Show loaded from JSON keeps its Seasons and Episodes in a Catalog that is shared
+    with every other Show that has the same Seasons and Episodes, like the same Show
+    watched by another Person. The Season and Episode objects are only created once they are needed.
+
+    Which Episodes were watched is kept in the Watch Ranges of the Show, which every Episode
+    of the Show reads and marks, so the amount of watched Episodes and the next Episode
+    to watch are known without looking at every Episode
+
     :param name: The name of this Show
     :param provider: The name of the StreamingProvider this Show is located on
     :param person: The Person that is watching this Show
@@ -41,22 +50,37 @@ class Show(Media):
             with open(filename, "r") as jsonfile:
                 json = load(jsonfile)
 
+        self.__catalog = None
+        self.__watched = None
+        self.__seasons = seasons
+        self.__episodes = episodes
+        self.__loaded = True
+
         # Check if a JSON object was given
         if json is not None:
-            if {"seasons", "episodes"}.isdisjoint(json.keys()):
-                raise KeyError("Seasons or Episodes must be given")
-
-            seasons = json.get("seasons", None)
-            episodes = json.get("episodes", None)
 
-            # Convert the Seasons/Episodes to objects
-            if seasons is not None:
-                seasons = [Season(json=season) for season in seasons]
-            if episodes is not None:
-                episodes = [Episode(json=episode) for episode in episodes]
-
-        self.__seasons = seasons
-        self.__episodes = episodes
+            # The Seasons and Episodes are either in a Catalog, which must already be loaded
+            #   when only its hash is given, or in the JSON object itself
+            if "catalog" in json:
+                catalog = json["catalog"]
+                if isinstance(catalog, str):
+                    catalog = Catalog.find(catalog)
+                    if catalog is None:
+                        raise KeyError(f"The catalog {json['catalog']} must be loaded")
+                elif isinstance(catalog, dict):
+                    catalog = Catalog(json=catalog)
+                self.__catalog = Catalog.intern(catalog)
+                self.__watched = WatchRanges(len(self.__catalog), json=json.get("watched", ""))
+            else:
+                if {"seasons", "episodes"}.isdisjoint(json.keys()):
+                    raise KeyError("Seasons or Episodes must be given")
+                self.__catalog, self.__watched = Catalog.from_json(json)
+            self.__seasons = None
+            self.__episodes = None
+            self.__loaded = False
+        else:
+            self.__watched = WatchRanges.from_flags([episode.is_watched() for episode in self.__all_episodes()])
+            self.__bind_episodes()
 
     def __eq__(self, show: 'Show'):
         if not isinstance(show, Show):
@@ -71,10 +95,47 @@ class Show(Media):
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def get_catalog(self) -> Catalog:
+        """Returns the Catalog of the Seasons and Episodes in this Show"""
+        if self.__catalog is None:
+
+            # The Catalog has the same Seasons and Episodes as the JSON object of this Show,
+            #   so a Show without any keeps them as empty lists when it is loaded again
+            json_object = self.to_json()
+            self.__catalog = Catalog.intern(Catalog(json={
+                key: json_object[key] for key in ["seasons", "episodes"] if key in json_object}))
+        return self.__catalog
+
+    def get_watch_ranges(self) -> WatchRanges:
+        """Returns the Watch Ranges of the Episodes in this Show that were watched,
+        in the order of the Episodes in its Catalog
+        """
+        return self.__watched
+
+    def get_episode_count(self) -> int:
+        """Returns the amount of Episodes in this Show"""
+        return len(self.__watched)
+
+    def get_watched_count(self) -> int:
+        """Returns the amount of Episodes in this Show that were watched"""
+        return self.__watched.get_count()
+
+    def get_watched_runtime(self) -> int:
+        """Returns the runtime of the Episodes in this Show that were watched, in minutes"""
+        catalog = self.get_catalog()
+        return sum([catalog.get_runtime_between(start, end) for start, end in self.__watched.get_ranges()])
+
+    def get_next_unwatched(self) -> Union[int, None]:
+        """Returns the index of the first Episode in this Show that was not watched,
+        or None when every Episode was watched
+        """
+        return self.__watched.get_first_unwatched()
+
     def get_seasons(self) -> Union[List[Season], None]:
         """Returns the list of Seasons in this Show or None if no Seasons
         should exist (i.e. only Episodes exist)
         """
+        self.__load_episodes()
         if self.__seasons is not None:
             return [season for season in self.__seasons]
         return self.__seasons
@@ -83,6 +144,7 @@ class Show(Media):
         """Returns the list of Episodes in this Show or None if no Episodes
         should exist (i.e. only Seasons must exist)
         """
+        self.__load_episodes()
         if self.__episodes is not None:
             return [episode for episode in self.__episodes]
         return self.__episodes
@@ -94,14 +156,72 @@ class Show(Media):
         """
         if in_hours:
             return round(self.get_runtime() // 60)
+        if not self.__loaded:
+            return self.__catalog.get_runtime()
         if self.get_seasons() is not None:
             return sum([season.get_runtime() for season in self.get_seasons()])
         return sum([episode.get_runtime() for episode in self.get_episodes()])
 
+    def __load_episodes(self):
+        """Creates the Season and Episode objects of this Show from its Catalog
+        the first time they are needed
+        """
+        if self.__loaded:
+            return
+        json_object = self.__catalog.to_json(self.__watched)
+        if "seasons" in json_object:
+            self.__seasons = [Season(json=season) for season in json_object["seasons"]]
+        if "episodes" in json_object:
+            self.__episodes = [Episode(json=episode) for episode in json_object["episodes"]]
+
+        # A Catalog saved without Seasons or Episodes is a Show without any
+        if self.__seasons is None and self.__episodes is None:
+            self.__seasons, self.__episodes = [], []
+        self.__loaded = True
+        self.__bind_episodes()
+
+    def __all_episodes(self) -> List[Episode]:
+        """Returns every Episode object in this Show in the order of its Catalog"""
+        episodes = [episode for season in self.__seasons or [] for episode in season.get_episodes()]
+        return episodes + (self.__episodes or [])
+
+    def __bind_episodes(self):
+        """Makes every Episode object in this Show read and mark the Watch Ranges of this Show"""
+        episodes = self.__all_episodes()
+        for i in range(len(episodes)):
+            episodes[i].bind(self.__watched, i)
+
+    def __episodes_to_json(self) -> dict:
+        """Returns the JSON representation of the Seasons and Episodes in this Show"""
+        if not self.__loaded:
+            return self.__catalog.to_json(self.__watched)
+        json_object = {}
+        if self.__seasons is not None:
+            json_object["seasons"] = [season.to_json() for season in self.__seasons]
+        if self.__episodes is not None:
+            json_object["episodes"] = [episode.to_json() for episode in self.__episodes]
+        return json_object
+
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def to_json(self) -> dict:
         """Returns a JSON representation of this Show object"""
+        json_object = self.__episodes_to_json()
+        return {
+            "id": self.get_id(),
+            "name": self.get_name(),
+            "provider": self.get_provider(),
+            "person": self.get_person(),
+            "started": self.is_started(),
+            "finished": self.is_finished(),
+            "seasons": json_object.get("seasons", []),
+            "episodes": json_object.get("episodes", [])
+        }
+
+    def to_record(self) -> dict:
+        """Returns the JSON representation of this Show object as it is saved in the data folder,
+        which refers to its Catalog by hash and holds the ranges of the watched Episodes
+        """
         return {
             "id": self.get_id(),
             "name": self.get_name(),
@@ -109,14 +229,8 @@ class Show(Media):
             "person": self.get_person(),
             "started": self.is_started(),
             "finished": self.is_finished(),
-            "seasons": [
-                season.to_json()
-                for season in self.get_seasons()
-            ] if self.get_seasons() is not None else [],
-            "episodes": [
-                episode.to_json()
-                for episode in self.get_episodes()
-            ] if self.get_episodes() is not None else []
+            "catalog": self.get_catalog().get_hash(),
+            "watched": self.__watched.to_json()
         }
 
     def save(self):
@@ -0,0 +1,210 @@
+import os
+from contextlib import contextmanager
+from json import JSONDecodeError, dumps, load
+from typing import List, Union
+
+from exceptions import ConflictError
+from file_utils import lock_file, write_atomic
+from media import Media, Show, Catalog
+from media.watch_ranges import WatchRanges
+from options import options
+from profiling import profiler
+
+LOCK_FILE = ".lock"
+CATALOGS = "catalogs"
+
+
+@contextmanager
+def lock_data(base_dir: str = None):
+    """Holds the lock on the data folder of the base directory while inside the context
+    so no other Media Queue, or script, writes any Media at the same time
+
+    :param base_dir: The base directory to lock. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    os.makedirs(f"{base_dir}/data", exist_ok=True)
+    with lock_file(f"{base_dir}/data/{LOCK_FILE}"):
+        yield
+
+
+def read_version(filename: str) -> Union[int, None]:
+    """Returns the version of the Media saved in the specified file,
+    or None when there is no file
+
+    :param filename: The filename of the JSON file of the Media
+    """
+    try:
+        with open(filename, "r") as jsonfile:
+            return load(jsonfile).get("version", 0)
+    except FileNotFoundError:
+        return None
+    except JSONDecodeError:
+        return 0  # A file that was not written by the Media Queue
+
+
+def load_catalog(catalog_hash: str, base_dir: str = None) -> Catalog:
+    """Returns the Catalog with the specified hash, which is only read
+    from the data folder when it is not already in memory
+
+    :param catalog_hash: The hash of the Catalog
+    :param base_dir: The base directory of the data folder. (Defaults to the base directory in the options)
+
+    :raises FileNotFoundError: When there is no Catalog with the hash in the data folder
+    """
+    catalog = Catalog.find(catalog_hash)
+    if catalog is not None:
+        return catalog
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    with open(f"{base_dir}/data/{CATALOGS}/{catalog_hash}.json", "r") as catalog_file:
+        return Catalog.intern(Catalog(json=load(catalog_file)))
+
+
+def save_catalog(catalog: Catalog, base_dir: str = None):
+    """Saves a Catalog into the data folder unless it is already there.
+    A Catalog never changes, so a file with its hash always holds the same Catalog
+
+    :param catalog: The Catalog to save
+    :param base_dir: The base directory of the data folder. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    filename = f"{base_dir}/data/{CATALOGS}/{catalog.get_hash()}.json"
+    if not os.path.exists(filename):
+        os.makedirs(f"{base_dir}/data/{CATALOGS}", exist_ok=True)
+        write_atomic(filename, dumps(catalog.to_json()).encode())
+
+
+def sweep_catalogs(base_dir: str = None) -> List[str]:
+    """Deletes the Catalogs in the data folder that no saved Show refers to anymore,
+    like the Catalog a Show had before its Episodes were changed, and returns their hashes.
+    Every Show is read while holding the lock on the data folder, so no Catalog that is
+    being saved along with its Show is deleted
+
+    :param base_dir: The base directory of the data folder. (Defaults to the base directory in the options)
+
+    :raises ValueError: When the file of a Show cannot be read, in which case nothing is deleted
+    """
+    from media import TVShow, Podcast, LimitedSeries  # These import the storage themselves
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+
+    with lock_data(base_dir):
+        if not os.path.isdir(f"{base_dir}/data/{CATALOGS}"):
+            return []
+        used = set()
+        for media_type in [TVShow, Podcast, LimitedSeries]:
+            folder = f"{base_dir}/data/{media_type.FOLDER}"
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(f"{folder}/{name}", "r") as jsonfile:
+                        catalog_hash = load(jsonfile).get("catalog")
+                except JSONDecodeError:
+                    raise ValueError(f"{folder}/{name} could not be read, so no catalog was removed")
+                if isinstance(catalog_hash, str):
+                    used.add(catalog_hash)
+
+        removed = []
+        for name in os.listdir(f"{base_dir}/data/{CATALOGS}"):
+            if name.endswith(".json") and name[:-len(".json")] not in used:
+                os.remove(f"{base_dir}/data/{CATALOGS}/{name}")
+                removed.append(name[:-len(".json")])
+        return removed
+
+
+def read_media_json(filename: str, base_dir: str = None) -> dict:
+    """Returns the JSON object saved in the file of a piece of Media with the Seasons
+    and Episodes of its Catalog in it, like the JSON object of an exported piece of Media
+
+    :param filename: The filename of the JSON file of the Media
+    :param base_dir: The base directory of the data folder. (Defaults to the base directory in the options)
+
+    :raises FileNotFoundError: When the file, or the Catalog it refers to, cannot be found
+    """
+    with open(filename, "r") as jsonfile:
+        json_object = load(jsonfile)
+    if isinstance(json_object.get("catalog"), str):
+        catalog = load_catalog(json_object.pop("catalog"), base_dir)
+        json_object.update(catalog.to_json(WatchRanges(len(catalog), json=json_object.pop("watched", ""))))
+    return json_object
+
+
+def media_to_bytes(media: Media, version: int) -> bytes:
+    """Returns the contents of the JSON file of a piece of Media with the specified version.
+    A Show refers to its Catalog, which must be saved along with it
+
+    :param media: The Media to get the contents of
+    :param version: The version to save the Media with
+    """
+    json_object = media.to_record()
+    json_object["version"] = version
+    return dumps(json_object, indent=4).encode()
+
+
+@profiler.profile("save_media")
+def save_media(media: List[Media], base_dir: str = None, *, force: bool = False):
+    """Saves a batch of Media into their JSON files at once.
+    Each Media folder is only checked and created once for the whole batch
+
+    The Catalog of every Show is saved too, unless another Show already saved it.
+    Every file is written to the side and renamed into place while holding the lock
+    on the data folder. Each saved Media goes up by one version, and a piece of Media
+    whose file has a different version than the one it was loaded with was changed by
+    something else since, in which case nothing in the batch is saved
+
+    :param media: The list of Media to save
+    :param base_dir: The base directory to save the Media in. (Defaults to the base directory in the options)
+    :keyword force: Whether or not to save the Media with the version it has,
+        without checking the files, like when it was pulled from another Media Queue
+
+    :raises ConflictError: When a piece of Media was changed by something else since it was loaded
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+
+    with lock_data(base_dir):
+        folders = set()
+        filenames = []
+        for medium in media:
+            folder = f"{base_dir}/data/{medium.FOLDER}"
+            if folder not in folders:
+                os.makedirs(folder, exist_ok=True)
+                folders.add(folder)
+            filenames.append(f"{folder}/{medium.get_id()}.json")
+
+        # Check every version before writing anything
+        if not force:
+            for medium, filename in zip(media, filenames):
+                version = read_version(filename)
+                if version is not None and version != medium.get_version():
+                    raise ConflictError(
+                        f"\"{medium.get_name()}\" was changed by another program since it was loaded "
+                        f"(version {version} is saved, but version {medium.get_version()} was loaded)")
+
+        for medium, filename in zip(media, filenames):
+            if isinstance(medium, Show):
+                save_catalog(medium.get_catalog(), base_dir)
+            version = medium.get_version() if force else medium.get_version() + 1
+            write_atomic(filename, media_to_bytes(medium, version))
+            medium.set_version(version)
+
+
+def delete_media(media: Media, base_dir: str = None):
+    """Deletes the JSON file of a piece of Media while holding the lock on the data folder.
+    A file that was already deleted, like by a sync, is skipped
+
+    :param media: The Media to delete
+    :param base_dir: The base directory the Media is saved in. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+
+    with lock_data(base_dir):
+        filename = f"{base_dir}/data/{media.FOLDER}/{media.get_id()}.json"
+        if os.path.exists(filename):
+            os.remove(filename)
@@ -1,9 +1,8 @@
-import os
-from json import dump
 from typing import List
 
 from media import Season, Show
-from options import options
+from media.storage import save_media
+from profiling import profiler
 
 
 class TVShow(Show):
@@ -55,19 +54,18 @@ class TVShow(Show):
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def to_csv(self) -> str:
-        """Returns the CSV representation of this TVShow object"""
-        show_csv = "\"{}\",{},{},{},{}".format(
-            self.get_name(),
-            self.get_provider(), self.get_person(),
-            self.is_started(), self.is_finished()
-        )
-        episodes_csv = "\n".join(
-            episode.to_csv()
+    def to_csv_rows(self) -> List[list]:
+        """Returns the rows of the CSV representation of this TVShow object"""
+        return [
+            ["TVShow"],
+            [self.get_name(),
+             self.get_provider(), self.get_person(),
+             self.is_started(), self.is_finished()]
+        ] + [
+            episode.to_csv_row()
             for season in self.get_seasons()
             for episode in season.get_episodes()
-        )
-        return f"TVShow\n{show_csv}\n{episodes_csv}"
+        ]
 
     def to_json(self) -> dict:
         """Returns the JSON representation of this TVShow object"""
@@ -75,11 +73,11 @@ class TVShow(Show):
         super_json.pop("episodes")  # A TV Show consists of Seasons of Episodes
         return super_json
 
+    @profiler.profile("TVShow.save")
     def save(self):
-        """Saves this TVShow object into a JSON file"""
-        if not os.path.exists(f"{options.get_base_dir()}/data"):
-            os.mkdir(f"{options.get_base_dir()}/data")
-        if not os.path.exists(f"{options.get_base_dir()}/data/{TVShow.FOLDER}"):
-            os.mkdir(f"{options.get_base_dir()}/data/{TVShow.FOLDER}")
-        with open("{}/data/{}/{}.json".format(options.get_base_dir(), TVShow.FOLDER, self.get_id()), "w") as jsonfile:
-            dump(self.to_json(), jsonfile, indent=4)
+        """Saves this TVShow object into a JSON file through the storage, which checks
+        that the file was not changed by something else since this TVShow was loaded
+
+        :raises ConflictError: When the file was changed by something else since this TVShow was loaded
+        """
+        save_media([self])
@@ -1,6 +1,6 @@
 from typing import List, Type, Union
 
-from media import Media, LimitedSeries, Podcast, TVShow, Movie
+from media import Media, Episode, LimitedSeries, Podcast, TVShow, Movie
 
 
 def get_type(media: Union[Media, str] = None,
@@ -38,3 +38,47 @@ def get_type(media: Union[Media, str] = None,
         if media == "All":
             return Media
         return None
+
+
+def media_matches(media: Media, *, started: bool = None, finished: bool = None,
+                  media_type: str = None, provider: str = None,
+                  person: str = None, search: str = None) -> bool:
+    """Returns whether or not the specified Media matches every filter.
+    A filter that is None is ignored
+
+    :param media: The Media to check
+    :keyword started: Whether or not the Media must be started
+    :keyword finished: Whether or not the Media must be finished
+    :keyword media_type: The type of Media it must be, like "TV Show"
+    :keyword provider: The Streaming Provider the Media must be on
+    :keyword person: The Person who must be watching the Media
+    :keyword search: The text the name of the Media must contain, ignoring case
+    """
+    if search is not None and search.lower() not in media.get_name().lower():
+        return False
+    if started is not None and started is not media.is_started():
+        return False
+    if finished is not None and finished is not media.is_finished():
+        return False
+    if media_type is not None and media_type != get_type(media):
+        return False
+    if provider is not None and provider != media.get_provider():
+        return False
+    if person is not None and person != media.get_person():
+        return False
+    return True
+
+
+def get_episodes(media: Media) -> List[Episode]:
+    """Returns all the Episodes of the specified Media in order,
+    which is empty for a Movie
+
+    :param media: The Media to get the Episodes of
+    """
+    if isinstance(media, (TVShow, Podcast)):
+        return [episode
+                for season in media.get_seasons()
+                for episode in season.get_episodes()]
+    if isinstance(media, LimitedSeries):
+        return media.get_episodes()
+    return []
@@ -0,0 +1,149 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Tuple, Union
+
+
+class WatchRanges:
+    """The Watch Ranges hold which Episodes of a Show have been watched as ranges
+    of Episode indices, in the order of the Seasons and then the Episodes.
+
+    Most Shows are watched in order, so "everything up to S12E5" is a single range.
+    Whether or not an Episode was watched is found by a binary search over the ranges.
+    Marking an Episode splits or merges the ranges around it, and the amount of
+    watched Episodes and the first unwatched Episode are always known.
+    The ranges are saved like slices, so "0:65,70:71" is the first 65 Episodes and the 71st
+
+    :param length: The amount of Episodes in the Show
+    :param ranges: The ranges of watched Episodes as (start, end), where the end is not included
+
+    :keyword json: The JSON representation of the ranges to load from, or the hex bitmap
+        of the watched Episodes that older versions saved
+    """
+
+    def __init__(self, length: int = 0, ranges: Iterable[Tuple[int, int]] = None,
+                 *, json: str = None):
+
+        # Check if the JSON representation is given
+        if json is not None:
+            if len(json) == 0 or ":" in json:
+                ranges = [tuple(int(index) for index in watched_range.split(":"))
+                          for watched_range in json.split(",") if len(watched_range) > 0]
+            else:
+                bits = format(int(json, 16), "b")[::-1]
+                ranges = WatchRanges.__flags_to_ranges([bit == "1" for bit in bits[:length]])
+
+        self.__length = length
+        self.__starts = []
+        self.__ends = []
+        self.__count = 0
+        for start, end in ranges or []:
+            self.set_range(start, end, True)
+
+    def __eq__(self, watch_ranges: 'WatchRanges'):
+        if not isinstance(watch_ranges, WatchRanges):
+            return False
+        return watch_ranges.get_ranges() == self.get_ranges() and len(watch_ranges) == len(self)
+
+    def __len__(self):
+        return self.__length
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @staticmethod
+    def __flags_to_ranges(flags: List[bool]) -> List[Tuple[int, int]]:
+        """Returns the ranges of the flags that are True"""
+        ranges = []
+        start = None
+        for i in range(len(flags)):
+            if flags[i] and start is None:
+                start = i
+            elif not flags[i] and start is not None:
+                ranges.append((start, i))
+                start = None
+        if start is not None:
+            ranges.append((start, len(flags)))
+        return ranges
+
+    @staticmethod
+    def from_flags(flags: List[bool]) -> 'WatchRanges':
+        """Returns the Watch Ranges of a list of whether or not each Episode was watched
+
+        :param flags: Whether or not each Episode was watched, in order
+        """
+        return WatchRanges(len(flags), WatchRanges.__flags_to_ranges(flags))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def is_watched(self, index: int) -> bool:
+        """Returns whether or not the Episode at the specified index was watched
+
+        :param index: The index of the Episode
+        """
+        i = bisect_right(self.__starts, index) - 1
+        return i >= 0 and index < self.__ends[i]
+
+    def get_count(self) -> int:
+        """Returns the amount of Episodes that were watched"""
+        return self.__count
+
+    def get_first_unwatched(self) -> Union[int, None]:
+        """Returns the index of the first Episode that was not watched,
+        or None when every Episode was watched
+        """
+        first = self.__ends[0] if len(self.__starts) > 0 and self.__starts[0] == 0 else 0
+        return first if first < self.__length else None
+
+    def get_ranges(self) -> List[Tuple[int, int]]:
+        """Returns the ranges of watched Episodes as (start, end), where the end is not included"""
+        return list(zip(self.__starts, self.__ends))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def set_watched(self, index: int, watched: bool):
+        """Sets whether or not the Episode at the specified index was watched
+
+        :param index: The index of the Episode
+        :param watched: Whether or not the Episode was watched
+        """
+        self.set_range(index, index + 1, watched)
+
+    def set_range(self, start: int, end: int, watched: bool):
+        """Sets whether or not every Episode from the start index up to,
+        but not including, the end index was watched
+
+        :param start: The index of the first Episode
+        :param end: The index after the last Episode
+        :param watched: Whether or not the Episodes were watched
+        """
+        if start >= end:
+            return
+
+        if watched:
+            self.__length = max(self.__length, end)
+
+            # Merge every range that overlaps, or touches, the new range into it
+            i = bisect_left(self.__ends, start)
+            j = bisect_right(self.__starts, end)
+            if i < j:
+                start = min(start, self.__starts[i])
+                end = max(end, self.__ends[j - 1])
+            replacement = [(start, end)]
+        else:
+            # Cut the new range out of every range that overlaps it
+            i = bisect_right(self.__ends, start)
+            j = bisect_left(self.__starts, end)
+            replacement = []
+            if i < j and self.__starts[i] < start:
+                replacement.append((self.__starts[i], start))
+            if i < j and self.__ends[j - 1] > end:
+                replacement.append((end, self.__ends[j - 1]))
+
+        self.__count -= sum([self.__ends[k] - self.__starts[k] for k in range(i, j)])
+        self.__count += sum([range_end - range_start for range_start, range_end in replacement])
+        self.__starts[i:j] = [range_start for range_start, _ in replacement]
+        self.__ends[i:j] = [range_end for _, range_end in replacement]
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def to_json(self) -> str:
+        """Returns the JSON representation of these Watch Ranges"""
+        return ",".join([f"{start}:{end}" for start, end in zip(self.__starts, self.__ends)])
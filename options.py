@@ -1,7 +1,11 @@
 import os
-from json import dump, load
+from contextlib import contextmanager
+from json import dumps, load
 from pathlib import Path
-from typing import List
+from typing import List, Union
+
+from exceptions import ConflictError
+from file_utils import lock_file, write_atomic
 
 
 class MediaQueueOptions:
@@ -9,6 +13,10 @@ class MediaQueueOptions:
 
     The current options include a list of Streaming Providers
     and the People to keep track of
+
+    The options file has a version that goes up every time it is saved. When another
+    Media Queue, or a script, saved the options since they were loaded, the changes
+    are loaded before making a new change so neither change is lost
     """
 
     __instance = None
@@ -28,22 +36,21 @@ class MediaQueueOptions:
         self.__providers = []
         self.__persons = []
         self.__base_dir = None
+        self.__person_filter = None
+        self.__up_next_policy = "recent"
+        self.__version = 0
 
         # Check if the options file exists
-        if not os.path.exists(f"{Path.home()}/options.json"):
-            with open(f"{Path.home()}/options.json", "w") as options_file:
-                dump({
+        with self.__lock():
+            if not os.path.exists(f"{Path.home()}/options.json"):
+                write_atomic(f"{Path.home()}/options.json", dumps({
                     "providers": [],
                     "persons": [],
                     "base_dir": self.__base_dir
-                }, options_file, indent=4)
+                }, indent=4).encode())
 
         # Load the file
-        with open(f"{Path.home()}/options.json", "r") as options_file:
-            options_json = load(options_file)
-            self.__providers = options_json["providers"]
-            self.__persons = options_json["persons"]
-            self.__base_dir = options_json["base_dir"]
+        self.reload()
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
@@ -59,10 +66,51 @@ class MediaQueueOptions:
         """Returns the base directory of where the user wants their data to go"""
         return self.__base_dir
 
+    def get_person_filter(self) -> Union[str, None]:
+        """Returns the Person whose Media was shown when the Media Queue was last closed,
+        or None when every Person's Media was shown
+        """
+        return self.__person_filter
+
+    def get_up_next_policy(self) -> str:
+        """Returns the policy the Continue Watching panel ranks the Shows by"""
+        return self.__up_next_policy
+
+    def get_version(self) -> int:
+        """Returns the version of the options file the options were loaded from"""
+        return self.__version
+
     def set_base_dir(self, base_dir: str):
         """Sets the base directory to store all the data"""
-        self.__base_dir = base_dir
-        self.save()
+        with self.__lock():
+            self.__reload_if_changed()
+            self.__base_dir = base_dir
+            self.__write()
+
+    def set_person_filter(self, person: Union[str, None]):
+        """Sets the Person whose Media is shown so only their Media is loaded
+        the next time the Media Queue starts
+
+        :param person: The Person to show, or None to show every Person
+        """
+        with self.__lock():
+            self.__reload_if_changed()
+            if person == self.__person_filter:
+                return
+            self.__person_filter = person
+            self.__write()
+
+    def set_up_next_policy(self, policy: str):
+        """Sets the policy the Continue Watching panel ranks the Shows by
+
+        :param policy: The policy to rank the Shows by (recent, shortest, or provider)
+        """
+        with self.__lock():
+            self.__reload_if_changed()
+            if policy == self.__up_next_policy:
+                return
+            self.__up_next_policy = policy
+            self.__write()
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
@@ -72,12 +120,14 @@ class MediaQueueOptions:
 
         :param provider: The Streaming Provider to add
         """
-        for p in self.get_providers():
-            if p.lower() == provider.lower():
-                return False
-        self.__providers.append(provider)
-        self.__providers.sort()
-        self.save()
+        with self.__lock():
+            self.__reload_if_changed()
+            for p in self.get_providers():
+                if p.lower() == provider.lower():
+                    return False
+            self.__providers.append(provider)
+            self.__providers.sort()
+            self.__write()
         return True
 
     def add_person(self, person: str) -> bool:
@@ -86,12 +136,14 @@ class MediaQueueOptions:
 
         :param person: The Person to add
         """
-        for p in self.get_persons():
-            if p.lower() == person.lower():
-                return False
-        self.__persons.append(person)
-        self.__persons.sort()
-        self.save()
+        with self.__lock():
+            self.__reload_if_changed()
+            for p in self.get_persons():
+                if p.lower() == person.lower():
+                    return False
+            self.__persons.append(person)
+            self.__persons.sort()
+            self.__write()
         return True
 
     def remove_provider(self, index: int) -> bool:
@@ -102,8 +154,15 @@ class MediaQueueOptions:
         """
         if index >= len(self.__providers):
             return False
-        self.__providers.pop(index)
-        self.save()
+
+        # Remove the Streaming Provider by name since the list could change when reloading
+        provider = self.__providers[index]
+        with self.__lock():
+            self.__reload_if_changed()
+            if provider not in self.__providers:
+                return False
+            self.__providers.remove(provider)
+            self.__write()
         return True
 
     def remove_person(self, index: int) -> bool:
@@ -114,20 +173,70 @@ class MediaQueueOptions:
         """
         if index >= len(self.__persons):
             return False
-        self.__persons.pop(index)
-        self.save()
+
+        # Remove the Person by name since the list could change when reloading
+        person = self.__persons[index]
+        with self.__lock():
+            self.__reload_if_changed()
+            if person not in self.__persons:
+                return False
+            self.__persons.remove(person)
+            self.__write()
         return True
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def reload(self):
+        """Loads the options from the json file"""
+        with open(f"{Path.home()}/options.json", "r") as options_file:
+            options_json = load(options_file)
+            self.__providers = options_json["providers"]
+            self.__persons = options_json["persons"]
+            self.__base_dir = options_json["base_dir"]
+            self.__person_filter = options_json.get("person_filter")
+            self.__up_next_policy = options_json.get("up_next_policy", "recent")
+            self.__version = options_json.get("version", 0)
+
     def save(self):
-        """Saves the options into the json file"""
-        with open(f"{Path.home()}/options.json", "w") as options_file:
-            dump({
-                "providers": self.__providers,
-                "persons": self.__persons,
-                "base_dir": self.__base_dir
-            }, options_file, indent=4)
+        """Saves the options into the json file
+
+        :raises ConflictError: When the options file was saved by something else since it was loaded
+        """
+        with self.__lock():
+            version = self.__read_version()
+            if version != self.__version:
+                raise ConflictError(
+                    f"The options were changed by another program since they were loaded "
+                    f"(version {version} is saved, but version {self.__version} was loaded)")
+            self.__write()
+
+    @contextmanager
+    def __lock(self):
+        """Holds the lock on the options file while inside the context"""
+        with lock_file(f"{Path.home()}/.options.json.lock"):
+            yield
+
+    def __read_version(self) -> int:
+        """Returns the version of the options file"""
+        with open(f"{Path.home()}/options.json", "r") as options_file:
+            return load(options_file).get("version", 0)
+
+    def __reload_if_changed(self):
+        """Loads the options again if the options file was saved by something else"""
+        if self.__read_version() != self.__version:
+            self.reload()
+
+    def __write(self):
+        """Writes the options into the json file with the next version"""
+        write_atomic(f"{Path.home()}/options.json", dumps({
+            "providers": self.__providers,
+            "persons": self.__persons,
+            "base_dir": self.__base_dir,
+            "person_filter": self.__person_filter,
+            "up_next_policy": self.__up_next_policy,
+            "version": self.__version + 1
+        }, indent=4).encode())
+        self.__version += 1
 
 
 options = MediaQueueOptions.get_instance()
@@ -0,0 +1,213 @@
+import atexit
+import cProfile
+import inspect
+import multiprocessing
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from json import dumps
+from pathlib import Path
+from time import perf_counter_ns
+
+PROFILE_ENV = "MEDIAQUEUE_PROFILE"
+PROFILE_DIR_ENV = "MEDIAQUEUE_PROFILE_DIR"
+
+
+class MediaQueueProfiler:
+    """A class to time the major actions of the Media Queue when profiling is enabled
+
+    Profiling is enabled by setting the MEDIAQUEUE_PROFILE environment variable
+    to 1, or to cprofile to also capture a cProfile of each action, or with the
+    --profile and --cprofile command line flags of the Media Queue.
+
+    Each action is recorded as a span in a trace file using the Trace Event Format
+    which can be opened in chrome://tracing or https://ui.perfetto.dev.
+    The trace file, and the cProfile files, are saved in the folder set by
+    the MEDIAQUEUE_PROFILE_DIR environment variable, or mediaqueue_profiles in the home folder.
+
+    When profiling is disabled, a span does nothing besides checking a flag
+    """
+
+    __instance = None
+
+    @staticmethod
+    def get_instance():
+        if MediaQueueProfiler.__instance is None:
+            MediaQueueProfiler()
+        return MediaQueueProfiler.__instance
+
+    def __init__(self):
+
+        if MediaQueueProfiler.__instance is not None:
+            raise TypeError("An instance of MediaQueueProfiler already exists! Use .get_instance()")
+        else:
+            MediaQueueProfiler.__instance = self
+        self.__enabled = False
+        self.__cprofile = False
+        self.__profile_dir = None
+        self.__trace_file = None
+        self.__first_event = True
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__profile_count = 0
+        self.__profiling = False
+
+        # Only the main process records a trace, not the processes of the importer
+        profile = os.environ.get(PROFILE_ENV, "").lower()
+        if profile not in ["", "0", "false"] and multiprocessing.parent_process() is None:
+            self.enable(cprofile=profile == "cprofile")
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def is_enabled(self) -> bool:
+        """Returns whether or not profiling is enabled"""
+        return self.__enabled
+
+    def get_trace_filename(self) -> str:
+        """Returns the filename of the trace file, if profiling is enabled"""
+        return self.__trace_file.name if self.__trace_file is not None else None
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def enable(self, *, cprofile: bool = False, profile_dir: str = None):
+        """Enables profiling and opens a new trace file
+
+        :keyword cprofile: Whether or not to capture a cProfile of each action
+        :keyword profile_dir: The folder to save the trace file and cProfile files in.
+            (Defaults to the MEDIAQUEUE_PROFILE_DIR environment variable or mediaqueue_profiles in the home folder)
+        """
+        if self.__enabled:
+            return
+        if profile_dir is None:
+            profile_dir = os.environ.get(PROFILE_DIR_ENV, f"{Path.home()}/mediaqueue_profiles")
+        os.makedirs(profile_dir, exist_ok=True)
+
+        now = datetime.now()
+        self.__profile_dir = profile_dir
+        self.__cprofile = cprofile
+        self.__trace_file = open("{}/{}_{}_{}_{}_{}_{}_trace.json".format(
+            profile_dir, now.year, now.month, now.day,
+            now.hour, now.minute, now.second), "w")
+        self.__trace_file.write("[")
+        self.__trace_file.flush()
+        self.__enabled = True
+        atexit.register(self.disable)
+        print(f"Profiling the Media Queue into {self.__trace_file.name}", file=sys.stderr)
+
+    def disable(self):
+        """Disables profiling and closes the trace file"""
+        if not self.__enabled:
+            return
+        self.__enabled = False
+        with self.__lock:
+            self.__trace_file.write("\n]\n")
+            self.__trace_file.close()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """Records the time it takes to run the code inside the span.
+
+        A cProfile is only captured for the outermost span, and only when no other
+        thread is capturing one, since only one cProfile can be active at once
+
+        :param name: The name of the action
+        :param args: Any details about the action to record with the span, like a count
+        """
+        if not self.__enabled:
+            yield
+            return
+
+        depth = getattr(self.__local, "depth", 0)
+        self.__local.depth = depth + 1
+        profile = None
+        if self.__cprofile and depth == 0:
+            with self.__lock:
+                if not self.__profiling:
+                    self.__profiling = True
+                    profile = cProfile.Profile()
+            if profile is not None:
+                profile.enable()
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = perf_counter_ns()
+            self.__local.depth = depth
+            if profile is not None:
+                profile.disable()
+                args["profile"] = self.__dump_profile(name, profile)
+                self.__profiling = False
+            self.__write_event({
+                "name": name, "ph": "X", "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "ts": start // 1000, "dur": (end - start) // 1000,
+                "args": {key: str(value) for key, value in args.items()}
+            })
+
+    def profile(self, name: str, *, slot: bool = False) -> callable:
+        """Returns a decorator that records each call of a function in a span.
+
+        The wrapper hides the arguments of the function from Qt, which would otherwise
+        drop the extra arguments a signal sends to a slot. So for a function connected to
+        a signal with more arguments, like a menu action sending whether it is checked,
+        the extra positional arguments are dropped when it is a slot.
+        Every other function gets its arguments unchanged
+
+        :param name: The name of the action
+        :keyword slot: Whether or not the function is connected to a signal
+            that can send more positional arguments than it takes
+        """
+        def decorator(func: callable) -> callable:
+            parameters = inspect.signature(func).parameters.values()
+            max_args = None
+            if slot and not any(parameter.kind == parameter.VAR_POSITIONAL for parameter in parameters):
+                max_args = len([parameter for parameter in parameters
+                                if parameter.kind in [parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD]])
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if max_args is not None:
+                    args = args[:max_args]
+                if not self.__enabled:
+                    return func(*args, **kwargs)
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __dump_profile(self, name: str, profile: cProfile.Profile) -> str:
+        """Saves the specified cProfile into the profile folder and returns its filename
+
+        :param name: The name of the action that was profiled
+        :param profile: The cProfile of the action
+        """
+        with self.__lock:
+            self.__profile_count += 1
+            count = self.__profile_count
+        filename = "{}/{}_{}.prof".format(
+            self.__profile_dir, count, "".join(c if c.isalnum() else "_" for c in name))
+        profile.dump_stats(filename)
+        return filename
+
+    def __write_event(self, event: dict):
+        """Writes the specified event into the trace file right away
+        so the trace is still useful if the app freezes or crashes
+
+        :param event: The trace event to write
+        """
+        with self.__lock:
+            if not self.__enabled:
+                return
+            self.__trace_file.write(("\n" if self.__first_event else ",\n") + dumps(event))
+            self.__trace_file.flush()
+            self.__first_event = False
+
+
+profiler = MediaQueueProfiler.get_instance()
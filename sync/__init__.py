@@ -0,0 +1,8 @@
+from sync.server import SyncLibrary
+from sync.server import SyncServer
+from sync.client import PullResult
+from sync.client import pull_changes
+from sync.directory import SyncPlan
+from sync.directory import plan_sync
+from sync.directory import apply_sync
+from sync.directory import sync_directories
@@ -0,0 +1,168 @@
+import gzip
+import os
+from json import dumps, load, loads
+from typing import List
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from media import Media, Movie, TVShow, Podcast, LimitedSeries
+from media.storage import lock_data, save_media
+from file_utils import write_atomic
+from options import options
+from sync.server import SYNC
+
+PULL_STATE = "pulls.json"
+
+
+class PullResult:
+    """The Pull Result holds the Media that was pulled from a sync server
+
+    :param version: The version of the library on the server that was pulled
+    :param media: The Media that was added or changed on the server
+    :param deleted: The IDs of the Media that was deleted on the server
+    :param transferred: The amount of bytes that were downloaded
+    """
+
+    def __init__(self, version: int, media: List[Media], deleted: List[str], transferred: int):
+        self.__version = version
+        self.__media = media
+        self.__deleted = deleted
+        self.__transferred = transferred
+
+    def get_version(self) -> int:
+        """Returns the version of the library on the server that was pulled"""
+        return self.__version
+
+    def get_media(self) -> List[Media]:
+        """Returns the Media that was added or changed on the server"""
+        return self.__media
+
+    def get_deleted(self) -> List[str]:
+        """Returns the IDs of the Media that was deleted on the server"""
+        return self.__deleted
+
+    def get_transferred(self) -> int:
+        """Returns the amount of bytes that were downloaded"""
+        return self.__transferred
+
+    def get_summary(self) -> str:
+        """Returns a summary of the pull, like "3 changed, 1 deleted (2.1 KB)" """
+        return "{} changed, {} deleted ({:.1f} KB)".format(
+            len(self.__media), len(self.__deleted), self.__transferred / 1024)
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+def load_pull_state(base_dir: str = None) -> dict:
+    """Returns the version of the library last pulled from each sync server, by URL
+
+    :param base_dir: The base directory of the Media. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    filename = f"{base_dir}/{SYNC}/{PULL_STATE}"
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, "r") as state_file:
+        return load(state_file)
+
+
+def save_pull_state(state: dict, base_dir: str = None):
+    """Saves the version of the library last pulled from each sync server
+
+    :param state: The version of the library last pulled from each sync server, by URL
+    :param base_dir: The base directory of the Media. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    os.makedirs(f"{base_dir}/{SYNC}", exist_ok=True)
+    write_atomic(f"{base_dir}/{SYNC}/{PULL_STATE}", dumps(state, indent=4).encode())
+
+
+def fetch_changes(url: str, since: int, *, timeout: float = 30) -> tuple:
+    """Fetches the changes after the specified version from a sync server
+    and returns them as a JSON object, or None if nothing changed,
+    along with the amount of bytes that were downloaded
+
+    :param url: The URL of the sync server, like http://192.168.1.2:8765
+    :param since: The version of the library last pulled from the server
+    :keyword timeout: The seconds to wait for the server. (Defaults to 30)
+    """
+    request = Request(f"{url.rstrip('/')}/changes?since={since}", headers={
+        "Accept-Encoding": "gzip",
+        "If-None-Match": f"\"v{since}\""
+    })
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            transferred = len(body)
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+    except HTTPError as e:
+        if e.code == 304:
+            return None, 0
+        raise
+    return loads(body), transferred
+
+
+def is_valid_media_id(media_id: str) -> bool:
+    """Returns whether or not a media ID sent by a sync server is a plain file name,
+    so it cannot be used to write or delete a file outside of the data folder
+
+    :param media_id: The media ID to check
+    """
+    return (isinstance(media_id, str) and media_id not in ["", ".", ".."] and
+            os.path.basename(media_id) == media_id and
+            "/" not in media_id and "\\" not in media_id and "\0" not in media_id)
+
+
+def pull_changes(url: str, *, base_dir: str = None, timeout: float = 30) -> PullResult:
+    """Pulls the Media that changed on a sync server since the last pull from it,
+    saves it, and removes the Media that was deleted on the server.
+    The first pull from a server downloads all of its Media
+
+    :param url: The URL of the sync server, like http://192.168.1.2:8765
+    :keyword base_dir: The base directory of the Media. (Defaults to the base directory in the options)
+    :keyword timeout: The seconds to wait for the server. (Defaults to 30)
+
+    :raises URLError: When the server cannot be reached
+    :raises KeyError: When the server sends Media of an unknown type
+    :raises ValueError: When the server sends a media ID that is not a plain file name
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    state = load_pull_state(base_dir)
+    since = state.get(url, 0)
+
+    changes, transferred = fetch_changes(url, since, timeout=timeout)
+    if changes is None:
+        return PullResult(since, [], [], transferred)
+
+    # The versions on the server started over, so pull everything again
+    if changes["version"] < since:
+        since = 0
+        changes, more = fetch_changes(url, since, timeout=timeout)
+        transferred += more
+
+    # The IDs become file names, so nothing is saved or deleted when any of them could point outside the data folder
+    for media_id in [change["json"].get("id") for change in changes["changed"]] + changes["deleted"]:
+        if not is_valid_media_id(media_id):
+            raise ValueError(f"The sync server sent an invalid media ID: {media_id!r}")
+
+    folders = {media_type.FOLDER: media_type for media_type in [Movie, TVShow, Podcast, LimitedSeries]}
+    media = [folders[change["type"]](json=change["json"]) for change in changes["changed"]]
+    save_media(media, base_dir, force=True)
+
+    deleted = []
+    with lock_data(base_dir):
+        for media_id in changes["deleted"]:
+            for folder in folders:
+                filename = f"{base_dir}/data/{folder}/{media_id}.json"
+                if os.path.exists(filename):
+                    os.remove(filename)
+                    deleted.append(media_id)
+
+    state[url] = changes["version"]
+    save_pull_state(state, base_dir)
+    return PullResult(changes["version"], media, deleted, transferred)
@@ -0,0 +1,329 @@
+import os
+from contextlib import contextmanager
+from hashlib import sha1
+from json import dumps, load, loads
+from typing import Dict, List, Tuple
+
+from media import Show, Movie, TVShow, Podcast, LimitedSeries
+from media.storage import CATALOGS, lock_data, media_to_bytes, read_media_json, save_catalog
+from file_utils import write_atomic
+from util import get_data_file_stats
+from sync.server import SYNC
+
+MANIFEST = "manifest.json"
+PEERS = "peers.json"
+
+MEDIA_FOLDERS = {media_type.FOLDER: media_type for media_type in [Movie, TVShow, Podcast, LimitedSeries]}
+
+
+def load_manifest(base_dir: str) -> Dict[str, dict]:
+    """Returns the manifest of the data folder of a base directory, which holds
+    the type, hash, and version of every piece of Media, by ID.
+
+    The manifest is cached in the sync folder along with the modification time
+    and the size of each file, so only the files that changed since the manifest
+    was last loaded are hashed again. The version of a piece of Media goes up
+    every time its hash changes
+
+    :param base_dir: The base directory of the Media
+    """
+    filename = f"{base_dir}/{SYNC}/{MANIFEST}"
+    cached = {}
+    if os.path.exists(filename):
+        with open(filename, "r") as manifest_file:
+            cached = load(manifest_file)
+
+    manifest = {}
+    for path, stat in get_data_file_stats(base_dir).items():
+        media_id = os.path.basename(path)[:-len(".json")]
+        folder = os.path.basename(os.path.dirname(path))
+        record = cached.get(media_id)
+        if record is not None and record["type"] == folder and record["stat"] == list(stat):
+            manifest[media_id] = record
+            continue
+        with open(path, "rb") as json_file:
+            media_hash = sha1(json_file.read()).hexdigest()
+        version = 0 if record is None else record["version"]
+        if record is None or record["hash"] != media_hash:
+            version += 1
+        manifest[media_id] = {"type": folder, "hash": media_hash, "version": version, "stat": list(stat)}
+
+    if manifest != cached:
+        os.makedirs(f"{base_dir}/{SYNC}", exist_ok=True)
+        write_atomic(filename, dumps(manifest).encode())
+    return manifest
+
+
+def load_last_sync(base_dir: str, other_dir: str) -> Dict[str, str]:
+    """Returns the hash of every piece of Media, by ID, as it was
+    after the last sync of the base directory with the other directory
+
+    :param base_dir: The base directory of the Media
+    :param other_dir: The base directory it was synced with
+    """
+    filename = f"{base_dir}/{SYNC}/{PEERS}"
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, "r") as peers_file:
+        return load(peers_file).get(os.path.abspath(other_dir), {})
+
+
+def save_last_sync(base_dir: str, other_dir: str, hashes: Dict[str, str]):
+    """Saves the hash of every piece of Media, by ID, after syncing
+    the base directory with the other directory
+
+    :param base_dir: The base directory of the Media
+    :param other_dir: The base directory it was synced with
+    :param hashes: The hash of every piece of Media after the sync, by ID
+    """
+    filename = f"{base_dir}/{SYNC}/{PEERS}"
+    peers = {}
+    if os.path.exists(filename):
+        with open(filename, "r") as peers_file:
+            peers = load(peers_file)
+    peers[os.path.abspath(other_dir)] = hashes
+    os.makedirs(f"{base_dir}/{SYNC}", exist_ok=True)
+    write_atomic(filename, dumps(peers).encode())
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+def merge_media_json(newer: dict, older: dict) -> dict:
+    """Merges two versions of the same piece of Media that were both changed since the last sync.
+    The fields, like the name, come from the version that was changed last,
+    and an Episode is watched if it was watched in either version
+
+    :param newer: The JSON of the version that was changed last
+    :param older: The JSON of the other version
+    """
+    def episodes(json_object: dict) -> List[dict]:
+        if "seasons" in json_object:
+            return [episode for season in json_object["seasons"] for episode in season["episodes"]]
+        return json_object.get("episodes", [])
+
+    watched = {(episode["season"], episode["episode"])
+               for episode in episodes(older) if episode["watched"]}
+    merged = dict(newer)
+    if "seasons" in merged:
+        merged["seasons"] = [dict(season, episodes=[dict(episode) for episode in season["episodes"]])
+                             for season in merged["seasons"]]
+    elif "episodes" in merged:
+        merged["episodes"] = [dict(episode) for episode in merged["episodes"]]
+
+    merged_episodes = episodes(merged)
+    for episode in merged_episodes:
+        if (episode["season"], episode["episode"]) in watched:
+            episode["watched"] = True
+
+    # An Episode that was only watched in the older version still starts the Media
+    if any(episode["watched"] for episode in merged_episodes) and not merged.get("finished", False):
+        merged["started"] = True
+    return merged
+
+
+class SyncPlan:
+    """The Sync Plan holds what syncing two base directories will do
+
+    :param base_dir: The first base directory
+    :param other_dir: The second base directory
+    """
+
+    def __init__(self, base_dir: str, other_dir: str):
+        self.__base_dir = base_dir
+        self.__other_dir = other_dir
+        self.__copies = []
+        self.__deletes = []
+        self.__merges = []
+        self.__unchanged = {}
+
+    def get_base_dir(self) -> str:
+        """Returns the first base directory"""
+        return self.__base_dir
+
+    def get_other_dir(self) -> str:
+        """Returns the second base directory"""
+        return self.__other_dir
+
+    def get_copies(self) -> List[Tuple[str, str, str, str]]:
+        """Returns the Media to copy as (ID, type, from directory, to directory)"""
+        return self.__copies
+
+    def get_deletes(self) -> List[Tuple[str, str, str]]:
+        """Returns the Media to delete as (ID, type, directory)"""
+        return self.__deletes
+
+    def get_merges(self) -> List[Tuple[str, str, str]]:
+        """Returns the Media changed in both directories as (ID, type in the first, type in the second)"""
+        return self.__merges
+
+    def get_unchanged(self) -> Dict[str, str]:
+        """Returns the hash of the Media that is the same in both directories, by ID"""
+        return self.__unchanged
+
+    def get_summary(self) -> str:
+        """Returns a summary of the plan, like "3 copied, 1 deleted, 2 merged" """
+        return "{} copied, {} deleted, {} merged".format(
+            len(self.__copies), len(self.__deletes), len(self.__merges))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def copy(self, media_id: str, media_type: str, from_dir: str, to_dir: str):
+        """Adds Media to copy from one directory to the other"""
+        self.__copies.append((media_id, media_type, from_dir, to_dir))
+
+    def delete(self, media_id: str, media_type: str, directory: str):
+        """Adds Media to delete from a directory"""
+        self.__deletes.append((media_id, media_type, directory))
+
+    def merge(self, media_id: str, media_type: str, other_type: str):
+        """Adds Media that was changed in both directories"""
+        self.__merges.append((media_id, media_type, other_type))
+
+    def keep(self, media_id: str, media_hash: str):
+        """Adds Media that is the same in both directories"""
+        self.__unchanged[media_id] = media_hash
+
+
+def plan_sync(base_dir: str, other_dir: str) -> SyncPlan:
+    """Compares the manifests of two base directories against the hashes of the last sync
+    between them and plans what to copy, delete, and merge in both directions.
+
+    Media that changed in only one directory since the last sync is copied to the other.
+    Media deleted in one directory is deleted in the other, unless it was changed there.
+    Media changed in both directories, or different in both on the first sync, is merged
+
+    :param base_dir: The first base directory
+    :param other_dir: The second base directory
+    """
+    manifest = load_manifest(base_dir)
+    other_manifest = load_manifest(other_dir)
+    last_sync = load_last_sync(base_dir, other_dir)
+
+    plan = SyncPlan(base_dir, other_dir)
+    for media_id in manifest.keys() | other_manifest.keys():
+        record = manifest.get(media_id)
+        other_record = other_manifest.get(media_id)
+        last_hash = last_sync.get(media_id)
+
+        if record is not None and other_record is not None:
+            if record["hash"] == other_record["hash"]:
+                plan.keep(media_id, record["hash"])
+            elif other_record["hash"] == last_hash:
+                plan.copy(media_id, record["type"], base_dir, other_dir)
+            elif record["hash"] == last_hash:
+                plan.copy(media_id, other_record["type"], other_dir, base_dir)
+            else:
+                plan.merge(media_id, record["type"], other_record["type"])
+
+        # The Media is only in one of the directories
+        else:
+            from_dir, to_dir = (base_dir, other_dir) if record is not None else (other_dir, base_dir)
+            record = record or other_record
+            if last_hash is None or record["hash"] != last_hash:
+                plan.copy(media_id, record["type"], from_dir, to_dir)
+            else:
+                plan.delete(media_id, record["type"], from_dir)
+    return plan
+
+
+@contextmanager
+def lock_directories(base_dir: str, other_dir: str):
+    """Holds the locks on the data folders of both base directories while inside the context.
+    The locks are always taken in the same order so two syncs cannot wait on each other
+
+    :param base_dir: The first base directory
+    :param other_dir: The second base directory
+    """
+    first, second = sorted([os.path.abspath(base_dir), os.path.abspath(other_dir)])
+    with lock_data(first), lock_data(second):
+        yield
+
+
+def apply_sync(plan: SyncPlan):
+    """Copies, deletes, and merges the Media in the plan while holding the locks
+    on both data folders, and saves the hashes after the sync in both directories
+    so the next sync only looks at what changed since
+
+    :param plan: The plan of the sync
+    """
+    with lock_directories(plan.get_base_dir(), plan.get_other_dir()):
+        __apply_sync(plan)
+
+
+def __apply_sync(plan: SyncPlan):
+    """Applies the plan of the sync while the locks on both data folders are held
+
+    :param plan: The plan of the sync
+    """
+    base_dir, other_dir = plan.get_base_dir(), plan.get_other_dir()
+
+    def filename(directory: str, media_type: str, media_id: str) -> str:
+        return f"{directory}/data/{media_type}/{media_id}.json"
+
+    def remove_other_types(directory: str, media_type: str, media_id: str):
+        for folder in MEDIA_FOLDERS:
+            if folder != media_type and os.path.exists(filename(directory, folder, media_id)):
+                os.remove(filename(directory, folder, media_id))
+
+    def copy_catalog(catalog_hash: str, from_dir: str, to_dir: str):
+        catalog_filename = f"{to_dir}/data/{CATALOGS}/{catalog_hash}.json"
+        if not os.path.exists(catalog_filename):
+            os.makedirs(f"{to_dir}/data/{CATALOGS}", exist_ok=True)
+            with open(f"{from_dir}/data/{CATALOGS}/{catalog_hash}.json", "rb") as catalog_file:
+                write_atomic(catalog_filename, catalog_file.read())
+
+    # Copy the files as they are so the hashes in both directories match,
+    #   along with the Catalog of a Show when the other directory does not have it yet
+    for media_id, media_type, from_dir, to_dir in plan.get_copies():
+        os.makedirs(f"{to_dir}/data/{media_type}", exist_ok=True)
+        remove_other_types(to_dir, media_type, media_id)
+        with open(filename(from_dir, media_type, media_id), "rb") as json_file:
+            data = json_file.read()
+        catalog_hash = loads(data).get("catalog")
+        if isinstance(catalog_hash, str):
+            copy_catalog(catalog_hash, from_dir, to_dir)
+        write_atomic(filename(to_dir, media_type, media_id), data)
+
+    for media_id, media_type, directory in plan.get_deletes():
+        os.remove(filename(directory, media_type, media_id))
+
+    # The version that was changed last wins, so compare the modification times
+    for media_id, media_type, other_type in plan.get_merges():
+        path, other_path = filename(base_dir, media_type, media_id), filename(other_dir, other_type, media_id)
+        json_object, other_object = read_media_json(path, base_dir), read_media_json(other_path, other_dir)
+        if os.stat(path).st_mtime_ns >= os.stat(other_path).st_mtime_ns:
+            merged_type, merged = media_type, merge_media_json(json_object, other_object)
+        else:
+            merged_type, merged = other_type, merge_media_json(other_object, json_object)
+
+        # The merge is newer than both versions
+        media = MEDIA_FOLDERS[merged_type](json=merged)
+        data = media_to_bytes(media, max(json_object.get("version", 0), other_object.get("version", 0)) + 1)
+        for directory in [base_dir, other_dir]:
+            if isinstance(media, Show):
+                save_catalog(media.get_catalog(), directory)
+            os.makedirs(f"{directory}/data/{merged_type}", exist_ok=True)
+            remove_other_types(directory, merged_type, media_id)
+            write_atomic(filename(directory, merged_type, media_id), data)
+
+    # Both directories now hold the same files
+    manifest = load_manifest(base_dir)
+    hashes = {media_id: record["hash"] for media_id, record in manifest.items()}
+    save_last_sync(base_dir, other_dir, hashes)
+    save_last_sync(other_dir, base_dir, hashes)
+
+
+def sync_directories(base_dir: str, other_dir: str, *, dry_run: bool = False) -> SyncPlan:
+    """Syncs the Media of two base directories in both directions and returns the plan.
+    Both data folders are locked while planning and applying the sync
+
+    :param base_dir: The first base directory
+    :param other_dir: The second base directory
+    :keyword dry_run: Whether or not to only plan the sync without changing anything
+    """
+    with lock_directories(base_dir, other_dir):
+        plan = plan_sync(base_dir, other_dir)
+        if not dry_run:
+            __apply_sync(plan)
+    return plan
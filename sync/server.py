@@ -0,0 +1,272 @@
+import gzip
+import os
+import threading
+from hashlib import sha1
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, load
+from time import monotonic
+from typing import Tuple, Union
+from urllib.parse import urlsplit, parse_qs
+
+from media.storage import read_media_json
+from file_utils import write_atomic
+from util import get_data_file_stats
+
+SYNC = "sync"
+SERVER_STATE = "server.json"
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+
+class SyncLibrary:
+    """The Sync Library keeps track of the version and the ETag of every piece of Media
+    in the data folder of a base directory so clients can pull only what changed.
+
+    The library has a version which goes up by one every time changes are found in
+    the data folder. Each piece of Media remembers the version it last changed in,
+    and each deleted piece of Media is kept as a tombstone with the version it was deleted in.
+    The ETag of a piece of Media is the hash of its file, so saving the same Media
+    again does not count as a change. The versions are saved in the sync folder
+    of the base directory so clients can keep pulling changes after a restart
+
+    :param base_dir: The base directory of the Media
+    :keyword interval: The seconds between checking the data folder for changes
+    """
+
+    INTERVAL = 1
+
+    def __init__(self, base_dir: str, *, interval: float = INTERVAL):
+        self.base_dir = base_dir
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.last_refresh = None
+
+        self.version = 0
+        self.media = {}
+        self.deleted = {}
+        self.files = {}
+        filename = f"{base_dir}/{SYNC}/{SERVER_STATE}"
+        if os.path.exists(filename):
+            with open(filename, "r") as state_file:
+                state = load(state_file)
+            self.version = state["version"]
+            self.media = state["media"]
+            self.deleted = state["deleted"]
+        self.refresh()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def get_version(self) -> int:
+        """Returns the version of the library"""
+        return self.version
+
+    def get_index(self) -> dict:
+        """Returns the version of the library and the type, version, and ETag
+        of every piece of Media as a JSON object
+        """
+        with self.lock:
+            return {
+                "version": self.version,
+                "media": {
+                    media_id: {key: record[key] for key in ["type", "version", "etag"]}
+                    for media_id, record in self.media.items()
+                }
+            }
+
+    def get_media(self, media_id: str) -> Union[Tuple[bytes, str], None]:
+        """Returns the JSON of a piece of Media, with the Seasons and Episodes
+        of its Catalog in it, and its ETag, or None when there is no Media with the ID
+
+        :param media_id: The ID of the Media
+        """
+        with self.lock:
+            record = self.media.get(media_id)
+            if record is None:
+                return None
+            try:
+                json_object = read_media_json(self.get_filename(media_id, record["type"]), self.base_dir)
+                return dumps(json_object, indent=4).encode(), record["etag"]
+            except FileNotFoundError:
+                return None
+
+    def get_changes(self, since: int) -> dict:
+        """Returns the Media that changed, and the IDs of the Media that was deleted,
+        after the specified version as a JSON object
+
+        :param since: The version of the library the client last pulled
+        """
+        with self.lock:
+            changed = []
+            for media_id, record in self.media.items():
+                if record["version"] > since:
+                    try:
+                        changed.append({"type": record["type"], "json": read_media_json(
+                            self.get_filename(media_id, record["type"]), self.base_dir)})
+                    except FileNotFoundError:
+                        continue  # The deletion is found in the next refresh
+            return {
+                "version": self.version,
+                "changed": changed,
+                "deleted": [media_id for media_id, version in self.deleted.items() if version > since]
+            }
+
+    def get_filename(self, media_id: str, folder: str) -> str:
+        """Returns the filename of a piece of Media in the data folder
+
+        :param media_id: The ID of the Media
+        :param folder: The folder of the type of Media
+        """
+        return f"{self.base_dir}/data/{folder}/{media_id}.json"
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def refresh_if_needed(self):
+        """Refreshes the library if it has not been refreshed within the interval"""
+        if self.last_refresh is None or monotonic() - self.last_refresh >= self.interval:
+            self.refresh()
+
+    def refresh(self):
+        """Checks the data folder for Media that was added, changed, or deleted
+        since the last refresh and gives it the next version of the library.
+        Only the files whose modification time or size changed are hashed again
+        """
+        with self.lock:
+            self.last_refresh = monotonic()
+            files = get_data_file_stats(self.base_dir)
+            changes = {}
+            for filename, stat in files.items():
+                if self.files.get(filename) == stat:
+                    continue
+                try:
+                    with open(filename, "rb") as json_file:
+                        etag = sha1(json_file.read()).hexdigest()
+                except OSError:
+                    files[filename] = None
+                    continue
+                media_id = os.path.basename(filename)[:-len(".json")]
+                folder = os.path.basename(os.path.dirname(filename))
+                record = self.media.get(media_id)
+                if record is None or record["etag"] != etag or record["type"] != folder:
+                    changes[media_id] = {"type": folder, "etag": etag}
+
+            current = {os.path.basename(filename)[:-len(".json")] for filename in files}
+            deleted = [media_id for media_id in self.media if media_id not in current]
+            self.files = files
+            if len(changes) == 0 and len(deleted) == 0:
+                return
+
+            self.version += 1
+            for media_id, record in changes.items():
+                record["version"] = self.version
+                self.media[media_id] = record
+                self.deleted.pop(media_id, None)
+            for media_id in deleted:
+                self.media.pop(media_id)
+                self.deleted[media_id] = self.version
+            self.save()
+
+    def save(self):
+        """Saves the versions of the library into the sync folder"""
+        os.makedirs(f"{self.base_dir}/{SYNC}", exist_ok=True)
+        write_atomic(f"{self.base_dir}/{SYNC}/{SERVER_STATE}", dumps(
+            {"version": self.version, "media": self.media, "deleted": self.deleted}).encode())
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+class SyncRequestHandler(BaseHTTPRequestHandler):
+    """Answers the requests of the sync clients
+
+    GET /media               The version of the library and the version and ETag of each Media
+    GET /media/<id>          The JSON of one piece of Media
+    GET /changes?since=<v>   The Media changed, and the IDs of the Media deleted, after version v
+
+    Every response has an ETag, and a request whose If-None-Match header
+    matches it is answered with 304 Not Modified and no body
+    """
+
+    server_version = "MediaQueueSync/1.0"
+
+    def do_GET(self):
+        library = self.server.library
+        library.refresh_if_needed()
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part != ""]
+
+        if parts == ["media"]:
+            index = library.get_index()
+            self.send_json(dumps(index).encode(), f"\"v{index['version']}\"")
+        elif len(parts) == 2 and parts[0] == "media":
+            media = library.get_media(parts[1])
+            if media is None:
+                self.send_error(HTTPStatus.NOT_FOUND, f"No media has the ID {parts[1]}")
+            else:
+                self.send_json(media[0], f"\"{media[1]}\"")
+        elif parts == ["changes"]:
+            try:
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+            except ValueError:
+                self.send_error(HTTPStatus.BAD_REQUEST, "since must be a version number")
+                return
+
+            # Nothing changed since the version the client has
+            etag = f"\"v{library.get_version()}\""
+            if since == library.get_version() or self.headers.get("If-None-Match") == etag:
+                self.send_not_modified(etag)
+                return
+            changes = library.get_changes(since)
+            self.send_json(dumps(changes).encode(), f"\"v{changes['version']}\"")
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def send_json(self, body: bytes, etag: str):
+        """Sends a JSON body with its ETag, or 304 Not Modified when the client
+        already has it. The body is compressed when the client accepts gzip
+
+        :param body: The JSON body to send
+        :param etag: The ETag of the body
+        """
+        if self.headers.get("If-None-Match") == etag:
+            self.send_not_modified(etag)
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        if len(body) >= GZIP_MIN_SIZE and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_not_modified(self, etag: str):
+        """Tells the client that what it has is still up to date
+
+        :param etag: The ETag the client has
+        """
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+
+class SyncServer(ThreadingHTTPServer):
+    """The Sync Server shares the Media of a base directory over HTTP
+    so the Media Queue on other machines can pull the changes
+
+    :param base_dir: The base directory of the Media
+    :keyword host: The host to listen on. (Defaults to localhost)
+    :keyword port: The port to listen on. (Defaults to 8765)
+    """
+
+    HOST = "127.0.0.1"
+    PORT = 8765
+
+    daemon_threads = True
+
+    def __init__(self, base_dir: str, *, host: str = HOST, port: int = PORT):
+        self.library = SyncLibrary(base_dir)
+        super().__init__((host, port), SyncRequestHandler)
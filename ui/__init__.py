@@ -1,25 +1,46 @@
+from importlib import import_module
+
 from ui.util.media_objects import media_objects
 from ui.dialogs.message_box import MessageBox
 from ui.util.grid_layout_manager import add_grid_to_layout
-
-from ui.scroll_widgets.episode_list_scroll_area import EpisodeListScrollArea
-from ui.scroll_widgets.episode_list_widget import EpisodeListWidget
+from ui.util.media_loader import MediaLoader
+from ui.util.data_watcher import DataWatcher
+from ui.util.watchdog import EventLoopWatchdog
 
 from ui.scroll_widgets.media_list_scroll_area import MediaListScrollArea
 from ui.scroll_widgets.media_list_widget import MediaListWidget
+from ui.scroll_widgets.up_next_widget import UpNextWidget
 
-from ui.scroll_widgets.person_list_scroll_area import PersonListScrollArea
-from ui.scroll_widgets.provider_list_scroll_area import ProviderListScrollArea
-
-from ui.dialogs.provider_dialog import ProviderDialog
-from ui.dialogs.person_dialog import PersonDialog
-
-from ui.dialogs.episode import EpisodeDialog
-
-from ui.limited_series import LimitedSeriesView
-from ui.tv_show import TVShowView
-from ui.podcast import PodcastView
-from ui.dialogs.movie import MovieDialog
 from ui.home import Home
 from ui.app_menu_bar import AppMenuBar
 from ui.app import MediaQueue
+
+# The views and dialogs that are not needed to show the Home screen
+#   are only imported the first time they are used
+LAZY_IMPORTS = {
+    "EpisodeListScrollArea": "ui.scroll_widgets.episode_list_scroll_area",
+    "EpisodeListWidget": "ui.scroll_widgets.episode_list_widget",
+    "PersonListScrollArea": "ui.scroll_widgets.person_list_scroll_area",
+    "ProviderListScrollArea": "ui.scroll_widgets.provider_list_scroll_area",
+    "ProviderDialog": "ui.dialogs.provider_dialog",
+    "PersonDialog": "ui.dialogs.person_dialog",
+    "EpisodeDialog": "ui.dialogs.episode",
+    "ImportDialog": "ui.dialogs.import_dialog",
+    "MovieDialog": "ui.dialogs.movie",
+    "LimitedSeriesView": "ui.limited_series",
+    "TVShowView": "ui.tv_show",
+    "PodcastView": "ui.podcast",
+    "SyncPuller": "ui.util.sync_puller"
+}
+
+
+def __getattr__(name: str):
+    """Imports a lazily imported view or dialog the first time it is needed
+
+    :param name: The name of the view or dialog to import
+    """
+    if name not in LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    value = getattr(import_module(LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
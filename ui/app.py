@@ -3,8 +3,8 @@ from pathlib import Path
 
 from PyQt5 import QtWidgets, QtGui
 
-from ui import Home, TVShowView, PodcastView, LimitedSeriesView
-from ui import AppMenuBar, MessageBox
+from ui import Home
+from ui import AppMenuBar, MessageBox, EventLoopWatchdog
 from util import resource_path
 from options import options
 
@@ -30,25 +30,19 @@ class MediaQueue(QtWidgets.QApplication):
         self.widget = QtWidgets.QStackedWidget(self.window)
 
         # Set up the views
-        self.limited_series_view = LimitedSeriesView(self.widget)
-        self.podcast_view = PodcastView(self.widget)
-        self.tv_show_view = TVShowView(self.widget)
-        self.home_view = Home({
-            "tv_show": self.tv_show_view,
-            "podcast": self.podcast_view,
-            "limited_series": self.limited_series_view
-        }, self.widget)
+        #   The TV Show, Podcast, and Limited Series views are created
+        #   the first time they are needed in get_view
+        self.views = {}
+        self.home_view = Home(self.widget, get_view_func=self.get_view)
 
         # Setup the Menu Bar for loading data into the Media Queue
         self.window.setMenuBar(AppMenuBar(self.window,
                                           update_media_func=self.update_media,
                                           update_providers_func=self.update_providers,
-                                          update_persons_func=self.update_persons))
+                                          update_persons_func=self.update_persons,
+                                          load_all_media_func=self.home_view.load_all_media))
 
         self.widget.addWidget(self.home_view)
-        self.widget.addWidget(self.tv_show_view)
-        self.widget.addWidget(self.podcast_view)
-        self.widget.addWidget(self.limited_series_view)
 
         self.window.setCentralWidget(self.widget)
         self.window.show()
@@ -59,28 +53,62 @@ class MediaQueue(QtWidgets.QApplication):
                        self.window)
             options.set_base_dir(QtWidgets.QFileDialog.getExistingDirectory(
                 self.window, "Choose a Directory", str(Path.home())))
+
+        # Load the Media once the window is showing
+        self.home_view.load_media()
+
+        # Watch for slots that block the event loop, if enabled
+        self.watchdog = None
+        if EventLoopWatchdog.is_enabled():
+            self.watchdog = EventLoopWatchdog(self, status_bar=self.window.statusBar())
+            self.aboutToQuit.connect(self.watchdog.stop)
+            self.watchdog.start()
         sys.exit(self.exec_())
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def get_view(self, view_id: str) -> QtWidgets.QFrame:
+        """Returns the view with the specified ID.
+        The view is created, and imported, the first time it is needed
+
+        :param view_id: The ID of the view (tv_show, podcast, or limited_series)
+        """
+        if view_id not in self.views:
+            if view_id == "tv_show":
+                from ui import TVShowView
+                view = TVShowView(self.widget)
+            elif view_id == "podcast":
+                from ui import PodcastView
+                view = PodcastView(self.widget)
+            elif view_id == "limited_series":
+                from ui import LimitedSeriesView
+                view = LimitedSeriesView(self.widget)
+            else:
+                raise KeyError(f"There is no view with the ID {view_id}")
+            self.widget.addWidget(view)
+            self.views[view_id] = view
+        return self.views[view_id]
+
     def update_media(self):
-        """Updates the stats about the media along with the Scroll Area widget"""
+        """Updates the stats about the media along with the Scroll Area widget
+        and the Continue Watching panel
+        """
         self.home_view.media_list_widget.scroll_area.update_ui()
         self.home_view.media_list_widget.update_stats()
+        self.home_view.update_up_next()
 
     def update_providers(self):
         """Updates any dropdowns that contain the list of providers"""
         self.home_view.update_providers_filters()
-        self.limited_series_view.update_providers()
-        self.podcast_view.update_providers()
-        self.tv_show_view.update_providers()
+        self.home_view.up_next_widget.update_policy()
+        for view in self.views.values():
+            view.update_providers()
 
     def update_persons(self):
         """Updates any dropdowns that contain the list of persons"""
         self.home_view.update_persons_filters()
-        self.limited_series_view.update_persons()
-        self.podcast_view.update_persons()
-        self.tv_show_view.update_persons()
+        for view in self.views.values():
+            view.update_persons()
 
 
 if __name__ == "__main__":
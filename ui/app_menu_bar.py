@@ -4,10 +4,12 @@ from functools import partial
 
 from PyQt5 import QtWidgets
 
+from media.storage import save_media
 from ui import media_objects, MessageBox
-from ui import ProviderDialog, PersonDialog
-from util import json_to_media, csv_to_media, media_to_json, media_to_csv
+from util import (media_to_json, media_to_csv, media_to_delta, media_to_npz, is_npz_available,
+                  plan_import, apply_import)
 from options import options
+from profiling import profiler
 
 
 class AppMenuBar(QtWidgets.QMenuBar):
@@ -15,6 +17,8 @@ class AppMenuBar(QtWidgets.QMenuBar):
     to import and export media as a file
 
     :param update_media_func: The function used to update the media in the app
+    :param load_all_media_func: The function used to load the Media of every Person
+        before doing something that needs all of it
     """
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
@@ -22,11 +26,15 @@ class AppMenuBar(QtWidgets.QMenuBar):
     def __init__(self, parent: QtWidgets.QWidget = None,
                  *, update_media_func: callable = None,
                  update_providers_func: callable = None,
-                 update_persons_func: callable = None):
+                 update_persons_func: callable = None,
+                 load_all_media_func: callable = None):
         super().__init__(parent)
         self.update_media_func = update_media_func
         self.update_providers_func = update_providers_func
         self.update_persons_func = update_persons_func
+        self.load_all_media_func = load_all_media_func
+        self.import_dialog = None
+        self.sync_puller = None
 
         self.file_menu = self.addMenu("File")
         self.file_menu_import_all = self.file_menu.addMenu(" Import Media")
@@ -45,6 +53,22 @@ class AppMenuBar(QtWidgets.QMenuBar):
             " To JSON", partial(self.export_media, "json", False), "Alt+S")
         self.file_menu_export_all.addAction(
             " To CSV", partial(self.export_media, "csv", False), "Alt+Shift+S")
+        self.file_menu_export_all.addAction(
+            " Changes Since Last Export", partial(self.export_media, "delta", False), "Alt+D")
+        self.file_menu_export_all.addSeparator()
+        self.file_menu_export_all.addAction(
+            " To Compressed JSON", partial(self.export_media, "json", False, True))
+        self.file_menu_export_all.addAction(
+            " To Compressed CSV", partial(self.export_media, "csv", False, True))
+        self.file_menu_export_all.addSeparator()
+
+        # NumPy is optional, so the NPZ export is disabled when it is not installed
+        npz_action = self.file_menu_export_all.addAction(
+            " To NPZ (Columnar Arrays)" if is_npz_available() else " To NPZ (Requires NumPy)",
+            partial(self.export_media, "npz", False))
+        npz_action.setEnabled(is_npz_available())
+        self.file_menu.addSeparator()
+        self.file_menu.addAction(" Pull From Sync Server", self.pull_media, "Ctrl+P")
 
         self.options_menu = self.addMenu("Options")
         self.options_menu.addAction(" Configure Streaming Providers", self.configure_providers, "Ctrl+1")
@@ -58,45 +82,69 @@ class AppMenuBar(QtWidgets.QMenuBar):
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    @profiler.profile("AppMenuBar.import_media", slot=True)
     def import_media(self, as_file: str):
         """Asks the user to select a file to import.
         The user will only be able to select .csv files
+
+        The selected files are parsed at the same time in the Import Dialog
+        which commits all the imported Media at once
+        """
+        from ui import ImportDialog
+        filenames, _ = QtWidgets.QFileDialog.getOpenFileNames(
+            None, "Select Media", ".",
+            "CSV Files(*.csv *.csv.gz)" if as_file == "csv" else "JSON Files(*.json *.json.gz)")
+        if len(filenames) > 0:
+            self.import_dialog = ImportDialog(filenames, self, commit_media_func=self.commit_media)
+
+    @profiler.profile("AppMenuBar.commit_media")
+    def commit_media(self, media: list):
+        """Matches the imported Media against the existing Media, asks the user
+        to confirm how many pieces of Media will be added, updated, or skipped,
+        and then saves all the added and updated Media in one batch
+
+        :param media: The imported Media to commit
         """
         try:
-            filenames, _ = QtWidgets.QFileDialog.getOpenFileNames(
-                None, "Select Media", ".",
-                "CSV Files(*.csv)" if as_file == "csv" else "JSON Files(*.json)")
-            if len(filenames) > 0:
-                if as_file == "csv":
-                    target_load_func = csv_to_media
-                else:
-                    target_load_func = json_to_media
-                media = []
-                for filename in filenames:
-                    for media_obj in target_load_func(filename):
-                        media.append(media_obj)
-                        media_obj.save()
-                media_objects.get_media().extend(media)
-                self.update_media_func()
-                MessageBox("Import Success",
-                           "Successfully imported media from the selected file(s)",
-                           self)
+            # Match against the Media of every Person so nothing is imported twice
+            if self.load_all_media_func is not None:
+                self.load_all_media_func()
+            plan = plan_import(media_objects.get_media(), media,
+                               media_objects.get_removed_indices())
+            answer = QtWidgets.QMessageBox.question(
+                self, "Confirm Import",
+                f"Importing the selected file(s) will result in: {plan.get_summary()}.\n\n"
+                "Do you want to continue?")
+            if answer != QtWidgets.QMessageBox.Yes:
+                return
+
+            save_media(apply_import(plan, media_objects.get_media()))
+            self.update_media_func()
+            MessageBox("Import Success",
+                       f"Successfully imported media from the selected file(s): {plan.get_summary()}",
+                       self)
         except Exception as e:
             e = str(e)
             MessageBox("Import Failure",
                        f"The import failed because: \"{e}\"",
                        self)
 
-    def export_media(self, as_file: str, single: False):
+    @profiler.profile("AppMenuBar.export_media", slot=True)
+    def export_media(self, as_file: str, single: False, compress: bool = False):
         """Exports all Media into the specified filetype
 
         :param as_file: The file type to export the media as
         :param single: Whether or not to export a single piece of Media
+        :param compress: Whether or not to compress the exported file with gzip
         """
         if not os.path.exists(f"{options.get_base_dir()}/exports"):
             os.mkdir(f"{options.get_base_dir()}/exports")
         try:
-            media = media_objects.get_media()
+            if not single and self.load_all_media_func is not None:
+                self.load_all_media_func()
+            # The Media removed in this session is still in the list of Media
+            removed_media = media_objects.get_removed_media()
+            media = [medium for medium in media_objects.get_media() if medium.get_id() not in removed_media]
             if single:
                 inner_media = None
                 if media_objects.get_movie() is not None:
@@ -115,9 +163,17 @@ class AppMenuBar(QtWidgets.QMenuBar):
 
             # Export the media
             if as_file == "json":
-                media_to_json(media)
+                media_to_json(media, compress=compress)
             if as_file == "csv":
-                media_to_csv(media)
+                media_to_csv(media, compress=compress)
+            if as_file == "npz":
+                media_to_npz(media, compress=compress)
+            if as_file == "delta":
+                media_to_delta(media, compress=compress)
+                MessageBox("Export Success",
+                           "Successfully exported the changes since the last export",
+                           self)
+                return
             MessageBox("Export Success",
                        "Successfully exported {} as {}".format(
                            "all media" if not single else f"\"{media.get_name()}\"",
@@ -129,14 +185,52 @@ class AppMenuBar(QtWidgets.QMenuBar):
                        f"The export failed because: \"{e}\"",
                        self)
 
+    def pull_media(self):
+        """Asks the user for the URL of a sync server and pulls the Media
+        that changed on it since the last pull on a background thread
+        """
+        from ui import SyncPuller
+        from sync.client import load_pull_state
+        if self.sync_puller is not None and self.sync_puller.isRunning():
+            return
+
+        urls = list(load_pull_state())
+        url, accepted = QtWidgets.QInputDialog.getText(
+            self, "Pull From Sync Server", "URL of the sync server:",
+            text=urls[-1] if len(urls) > 0 else "http://127.0.0.1:8765")
+        if not accepted or len(url.strip()) == 0:
+            return
+
+        self.sync_puller = SyncPuller(self, url.strip(), options.get_base_dir())
+        self.sync_puller.pulled.connect(self.merge_pulled_media)
+        self.sync_puller.pull_failed.connect(
+            lambda error: MessageBox("Pull Failure", f"The pull failed because: \"{error}\"", self))
+        self.sync_puller.start()
+
+    @profiler.profile("AppMenuBar.merge_pulled_media")
+    def merge_pulled_media(self, result):
+        """Merges the Media pulled from a sync server into the list of Media
+
+        :param result: The PullResult of the pull
+        """
+        if self.load_all_media_func is not None:
+            self.load_all_media_func()
+        media_objects.merge_media(result.get_media(), result.get_deleted())
+        self.update_media_func()
+        MessageBox("Pull Success",
+                   f"Pulled version {result.get_version()} from the sync server: {result.get_summary()}",
+                   self)
+
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def configure_providers(self):
         """Allows a user to configure the Streaming Providers in the application"""
+        from ui import ProviderDialog
         ProviderDialog(self, update_func=self.update_providers_func).exec_()
 
     def configure_persons(self):
         """Allows a user to configure the Persons in the application"""
+        from ui import PersonDialog
         PersonDialog(self, update_func=self.update_persons_func).exec_()
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from PyQt5 import QtWidgets, QtCore
+
+from ui import MessageBox
+from util import file_to_media
+from options import options
+
+
+class ImportDialog(QtWidgets.QProgressDialog):
+    """The Import Dialog parses the selected files in a process pool
+    while showing the progress of the import.
+
+    The dialog is not modal so the app can still be used during the import,
+    and the import can be canceled at any time before it is committed.
+    Once every file has been parsed, all the Media is committed at once
+
+    :param filenames: The filenames of the CSV or JSON files to import
+    :keyword commit_media_func: The function used to commit all the imported Media
+    """
+
+    POLL_INTERVAL = 100
+
+    def __init__(self, filenames: List[str], parent: QtWidgets.QWidget = None,
+                 *, commit_media_func: callable = None):
+        super().__init__("Importing Media...", "Cancel", 0, len(filenames), parent)
+        self.filenames = filenames
+        self.commit_media_func = commit_media_func
+
+        self.setWindowTitle("Import Media")
+        self.setWindowModality(QtCore.Qt.NonModal)
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.canceled.connect(self.cancel_import)
+
+        # Parse every file in its own process, validating the providers
+        #   and persons against the same precomputed sets
+        providers = set(options.get_providers())
+        persons = set(options.get_persons())
+        self.executor = ProcessPoolExecutor(max_workers=min(len(filenames), os.cpu_count() or 1))
+        self.futures = [
+            self.executor.submit(file_to_media, filename, providers, persons)
+            for filename in filenames
+        ]
+
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.setInterval(ImportDialog.POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.check_progress)
+        self.poll_timer.start()
+        self.show()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def check_progress(self):
+        """Updates the progress of the import and commits the imported Media
+        once every file has been parsed
+        """
+        finished = len([future for future in self.futures if future.done()])
+        self.setValue(finished)
+        self.setLabelText(f"Importing Media... {finished}/{len(self.futures)} file(s)")
+        if finished < len(self.futures):
+            return
+
+        self.poll_timer.stop()
+        self.executor.shutdown(wait=False)
+
+        # Keep the Media in the order the files were selected
+        media = []
+        failures = []
+        for i in range(len(self.futures)):
+            try:
+                media.extend(self.futures[i].result())
+            except Exception as e:
+                failures.append(f"{os.path.basename(self.filenames[i])}: {e}")
+
+        self.close()
+        if len(failures) > 0:
+            MessageBox("Import Failure",
+                       "The following file(s) could not be imported:\n{}".format("\n".join(failures)),
+                       self.parent())
+        if len(media) > 0:
+            self.commit_media_func(media)
+
+    def cancel_import(self):
+        """Cancels the import before any of the imported Media is committed"""
+        self.poll_timer.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.close()
@@ -2,6 +2,7 @@ import sys
 from functools import partial
 from PyQt5 import QtWidgets, QtCore
 
+from exceptions import ConflictError
 from media import Movie
 from ui import MessageBox, add_grid_to_layout, media_objects
 from options import options
@@ -171,6 +172,7 @@ class MovieDialog(QtWidgets.QDialog):
             if is_saving:
                 movie = media_objects.get_movie()
                 id = movie.get_id()
+                version = movie.get_version()
             movie = Movie(
                 self.name_line_edit.text(),
                 self.hours_spinner.value() * 60 + self.minutes_spinner.value(),
@@ -181,6 +183,7 @@ class MovieDialog(QtWidgets.QDialog):
             )
             if is_saving:
                 movie.set_id(id)
+                movie.set_version(version)
             movie.save()
             media_objects.set_movie(movie)
             self.clear_widgets()
@@ -189,6 +192,8 @@ class MovieDialog(QtWidgets.QDialog):
             MessageBox(
                 "Missing Values",
                 "You must specify the Name, Runtime, Provider, and Person to create or save a Movie")
+        except ConflictError as e:
+            MessageBox("Save Conflict", str(e), self)
 
 
 if __name__ == "__main__":
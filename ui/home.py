@@ -1,14 +1,17 @@
 import os
 import sys
+import time
 from functools import partial
 
 from PyQt5 import QtWidgets, QtCore
 
-from media import Movie, TVShow, Podcast, LimitedSeries
+from media.storage import delete_media
 from media.util import get_type
-from ui import MovieDialog, MediaListWidget, add_grid_to_layout, media_objects
-from ui import MessageBox
+from ui import MediaListWidget, UpNextWidget, add_grid_to_layout, media_objects
+from ui import MessageBox, MediaLoader, DataWatcher
+from util import get_data_files, data_file_to_media, get_activity
 from options import options
+from profiling import profiler
 
 
 class Home(QtWidgets.QFrame):
@@ -25,39 +28,47 @@ class Home(QtWidgets.QFrame):
 
     All the Media will follow an explicit sorting algorithm which will
     sort the Media in the precedence of Type -> Streaming Provider -> Person -> Name
+
+    When there is more than one Person, only the Media of the Person that was
+    filtered by when the app was last closed is loaded at first. The Media of
+    the other Persons is loaded once the Person filter shows them
+
+    The Continue Watching panel above the list shows the started Shows to watch next.
+    It is updated whenever a piece of Media is loaded, changed, or removed
+    instead of ranking every Show again
+
+    :keyword get_view_func: The function used to retrieve the TV Show, Podcast,
+        or Limited Series view by its ID
     """
 
-    def __init__(self, views: dict, parent: QtWidgets.QWidget = None, flags=QtCore.Qt.WindowFlags()):
+    REFRESH_INTERVAL = 250
+
+    def __init__(self, parent: QtWidgets.QWidget = None, flags=QtCore.Qt.WindowFlags(),
+                 *, get_view_func: callable = None):
         super().__init__(parent, flags)
-        self.views = views
-
-        # Load all the media inside the movies, tv shows, podcasts, and limited series folders
-        media = []
-        paths = [Movie.FOLDER, TVShow.FOLDER, Podcast.FOLDER, LimitedSeries.FOLDER]
-        for path in paths:
-            if os.path.exists(f"{options.get_base_dir()}/data/{path}"):
-                for file in os.listdir(f"{options.get_base_dir()}/data/{path}"):
-                    try:
-                        if path == Movie.FOLDER and file.endswith(".json"):
-                            media.append(Movie(filename=f"{options.get_base_dir()}/data/{path}/{file}"))
-                        elif path == TVShow.FOLDER and file.endswith(".json"):
-                            media.append(TVShow(filename=f"{options.get_base_dir()}/data/{path}/{file}"))
-                        elif path == Podcast.FOLDER and file.endswith(".json"):
-                            media.append(Podcast(filename=f"{options.get_base_dir()}/data/{path}/{file}"))
-                        elif path == LimitedSeries.FOLDER and file.endswith(".json"):
-                            media.append(LimitedSeries(filename=f"{options.get_base_dir()}/data/{path}/{file}"))
-                    except Exception as e:
-                        MessageBox(f"Error loading {file}",
-                                   str(e),
-                                   self)
-        media_objects.set_media(media)
+        self.get_view_func = get_view_func
+
+        # The Media is loaded on a background thread after the window is shown
+        #   so start off with an empty list of Media
+        media_objects.set_media([])
+        self.media_loader = None
+        self.loaded_persons = None
+        self.data_watcher = None
+        self.pending_media = []
+        self.activity = {}
+        self.load_progress_bar = None
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setInterval(Home.REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh_loaded_media)
 
         # Setup the MediaListWidget and the attributes for the filter comboboxes
         self.media_list_widget = MediaListWidget(
             self,
             edit_media_func=self.add_edit_media,
-            remove_media_func=self.remove_media
+            remove_media_func=self.remove_media,
+            media_changed_func=self.update_up_next
         )
+        self.up_next_widget = UpNextWidget(self, edit_media_func=self.add_edit_media)
         self.filter_labels = None
 
         self.filter_start_finish_combobox = None
@@ -90,7 +101,9 @@ class Home(QtWidgets.QFrame):
 
         layout.addWidget(self.setup_filters_ui(self))
         layout.addWidget(self.setup_sort_ui(self))
+        layout.addWidget(self.up_next_widget)
         layout.addWidget(self.media_list_widget, 1)
+        layout.addWidget(self.setup_progress_ui(self))
         layout.addWidget(self.setup_new_buttons_ui())
         self.update_persons_filters()
         self.update_providers_filters()
@@ -200,6 +213,18 @@ class Home(QtWidgets.QFrame):
         sort_widgets.setLayout(layout)
         return sort_widgets
 
+    def setup_progress_ui(self, parent: QtWidgets.QWidget) -> QtWidgets.QWidget:
+        """Creates and returns the progress bar shown while the Media is loading
+
+        :param parent: The parent widget for the progress bar
+        """
+
+        self.load_progress_bar = QtWidgets.QProgressBar(parent)
+        self.load_progress_bar.setFormat("Loading Media... %v/%m")
+        self.load_progress_bar.setToolTip("The Media in your Media Queue is still loading")
+        self.load_progress_bar.setVisible(False)
+        return self.load_progress_bar
+
     def setup_new_buttons_ui(self):
         """Creates the buttons meant to be used when adding a new piece of Media"""
 
@@ -233,6 +258,190 @@ class Home(QtWidgets.QFrame):
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    @profiler.profile("Home.load_media")
+    def load_media(self):
+        """Starts loading all the Media inside the movies, tv shows, podcasts,
+        and limited series folders on a background thread.
+
+        The Media is added to the list in batches so the filters and sorting
+        can already be used while the rest of the Media is still loading.
+        Only the Media of the Person that was last filtered by is loaded
+        """
+        self.activity = get_activity(options.get_base_dir())
+        person = options.get_person_filter()
+        if len(options.get_persons()) > 1 and person in options.get_persons():
+            self.loaded_persons = [person]
+            self.filter_person_combobox.setCurrentText(person)
+            self.start_loader(persons=[person])
+        else:
+            self.loaded_persons = None
+            self.start_loader()
+
+    def start_loader(self, *, persons: list = None, exclude_persons: list = None):
+        """Starts loading the Media of the specified Persons on a background thread
+
+        :keyword persons: The Persons whose Media to load. (Defaults to every Person)
+        :keyword exclude_persons: The Persons whose Media not to load. (Defaults to no Person)
+        """
+        self.media_loader = MediaLoader(self, options.get_base_dir(),
+                                        persons=persons, exclude_persons=exclude_persons)
+        self.media_loader.batch_loaded.connect(self.pending_media.extend)
+        self.media_loader.progress.connect(self.update_load_progress)
+        self.media_loader.load_failed.connect(
+            lambda file, error: MessageBox(f"Error loading {file}", error, self))
+        self.media_loader.finished.connect(self.refresh_loaded_media)
+        self.media_loader.finished.connect(self.watch_data)
+        self.load_progress_bar.setVisible(True)
+        self.refresh_timer.start()
+        self.media_loader.start()
+
+    def update_load_progress(self, loaded: int, total: int):
+        """Updates the progress bar for the Media that is loading
+
+        :param loaded: The amount of Media files that have been loaded
+        :param total: The total amount of Media files to load
+        """
+        self.load_progress_bar.setMaximum(total)
+        self.load_progress_bar.setValue(loaded)
+
+    def is_loading(self) -> bool:
+        """Returns whether or not any Media is still being loaded on a background thread"""
+        return any(loader.isRunning() for loader in self.findChildren(MediaLoader))
+
+    @profiler.profile("Home.refresh_loaded_media")
+    def refresh_loaded_media(self):
+        """Adds any Media that has been loaded since the last refresh
+        to the list of Media and updates the UI.
+
+        The Media is held back while a piece of Media is being edited since
+        the list of Media would be re-sorted which changes the index of the edited Media
+        """
+
+        is_editing = (QtWidgets.QApplication.activeModalWidget() is not None or
+                      (self.parent() is not None and self.parent().currentWidget() is not self))
+        if len(self.pending_media) > 0 and not is_editing:
+            self.add_pending_media()
+            self.media_list_widget.scroll_area.update_ui()
+            self.media_list_widget.update_stats()
+
+        # Stop refreshing once everything has been loaded and added to the list
+        if not self.is_loading() and len(self.pending_media) == 0:
+            self.refresh_timer.stop()
+            self.load_progress_bar.setVisible(False)
+
+    def add_pending_media(self):
+        """Adds the Media that has been loaded to the list of Media.
+        Media that is already in the list, like Media that moved to another Person
+        while the Media of that Person was loading, is only added once
+        """
+        current_ids = {medium.get_id() for medium in media_objects.get_media()}
+        for medium in self.pending_media:
+            if medium.get_id() not in current_ids:
+                media_objects.get_media().append(medium)
+                current_ids.add(medium.get_id())
+                self.up_next_widget.up_next.update(medium, self.activity.get(medium.get_id()))
+        self.pending_media.clear()
+        self.up_next_widget.update_ui()
+
+    def load_persons(self, person: str = None):
+        """Starts loading the Media of a Person that has not been loaded yet
+        on a background thread, or the Media of every Person that has not
+        been loaded yet when no Person is specified
+
+        :param person: The Person whose Media to load
+        """
+        if self.loaded_persons is None or person in self.loaded_persons:
+            return
+        if person is None:
+            exclude_persons = self.loaded_persons
+            self.loaded_persons = None
+            self.start_loader(exclude_persons=exclude_persons)
+        else:
+            self.loaded_persons.append(person)
+            self.start_loader(persons=[person])
+
+    @profiler.profile("Home.load_all_media")
+    def load_all_media(self):
+        """Loads the Media of every Person that has not been loaded yet and adds it
+        to the list of Media right away, waiting for any Media that is still loading.
+        This is used before anything that needs all the Media, like importing or exporting it
+        """
+        for loader in self.findChildren(MediaLoader):
+            loader.wait()
+        # Deliver the batches the loaders sent before they finished
+        QtWidgets.QApplication.processEvents()
+
+        if self.loaded_persons is not None:
+            for filename in get_data_files(options.get_base_dir(), exclude_persons=self.loaded_persons):
+                try:
+                    self.pending_media.append(data_file_to_media(filename))
+                except Exception as e:
+                    MessageBox(f"Error loading {os.path.basename(filename)}", str(e), self)
+            self.loaded_persons = None
+
+        if len(self.pending_media) > 0:
+            self.add_pending_media()
+            self.media_list_widget.scroll_area.update_ui()
+            self.media_list_widget.update_stats()
+
+    def watch_data(self):
+        """Starts watching the data folder for Media that is changed outside of the app,
+        like by a script or a sync, once all the Media has been loaded
+        """
+        if self.data_watcher is None:
+            self.data_watcher = DataWatcher(self, options.get_base_dir())
+            self.data_watcher.media_changed.connect(self.merge_changed_media)
+        self.data_watcher.start()
+
+    @profiler.profile("Home.merge_changed_media")
+    def merge_changed_media(self, media: list, removed_ids: list):
+        """Merges the Media that was changed outside of the app into the list of Media.
+
+        Changed Media replaces the Media with the same ID and only its row is updated.
+        New Media is added like loaded Media so it is held back while editing,
+        unless the Media of its Person has not been loaded yet.
+        The files the app saved itself have the same version and contents
+        as the Media in the list, so they are skipped
+
+        :param media: The Media that was added or changed
+        :param removed_ids: The IDs of the Media whose files were deleted
+        """
+        current_media = media_objects.get_media()
+        indices = {current_media[i].get_id(): i for i in range(len(current_media))}
+        pending_ids = {medium.get_id() for medium in self.pending_media}
+        removed_media = media_objects.get_removed_media()
+
+        changed = []
+        added = []
+        for medium in media:
+            index = indices.get(medium.get_id())
+            if index is None:
+                if medium.get_id() not in pending_ids and (
+                        self.loaded_persons is None or medium.get_person() in self.loaded_persons):
+                    added.append(medium)
+            elif (medium.get_version() != current_media[index].get_version() or
+                  medium.to_json() != current_media[index].to_json()):
+                changed.append(medium)
+        removed_ids = [media_id for media_id in removed_ids
+                       if media_id in indices and media_id not in removed_media]
+
+        if len(changed) > 0 or len(removed_ids) > 0:
+            media_objects.merge_media(changed, removed_ids)
+            for medium in changed:
+                self.media_list_widget.scroll_area.update_row(indices[medium.get_id()])
+                self.up_next_widget.up_next.update(medium, time.time())
+            for media_id in removed_ids:
+                self.up_next_widget.up_next.remove(media_id)
+            self.up_next_widget.update_ui()
+            self.media_list_widget.scroll_area.filter()
+            self.media_list_widget.update_stats()
+        if len(added) > 0:
+            self.pending_media.extend(added)
+            self.refresh_timer.start()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @profiler.profile("Home.filter_media", slot=True)
     def filter_media(self, clear: bool = False):
         """Filters the Media in the app based off the filter combo boxes
 
@@ -284,6 +493,11 @@ class Home(QtWidgets.QFrame):
                              if self.filter_person_combobox is not None else "All")
             filter_person = None if filter_person == "All" else filter_person
 
+            # Load the Media of the Person once it is shown, unless the Media is not loading yet
+            if self.media_loader is not None and filter_person != options.get_person_filter():
+                self.load_persons(filter_person)
+                options.set_person_filter(filter_person)
+
             # Get the filtering from the search bar
             filter_search = self.search_line_edit.text().lower()
             if len(filter_search) == 0:
@@ -293,9 +507,11 @@ class Home(QtWidgets.QFrame):
             started=filter_start_finish[0], finished=filter_start_finish[1],
             media_type=filter_type, provider=filter_provider,
             person=filter_person, search=filter_search)
+        self.up_next_widget.update_person(filter_person)
         self.media_list_widget.update_stats()
         self.media_list_widget.scroll_area.filter()
 
+    @profiler.profile("Home.cycle_sort", slot=True)
     def cycle_sort(self, sort: str):
         """Cycles the specified sorting variable to the next sort value
 
@@ -331,6 +547,7 @@ class Home(QtWidgets.QFrame):
 
         self.sort_media()
 
+    @profiler.profile("Home.sort_media", slot=True)
     def sort_media(self, clear: bool = False):
         """Sorts the Media in the app based off the sorting values
 
@@ -356,11 +573,31 @@ class Home(QtWidgets.QFrame):
         """
 
         if index is not None:
-            media_objects.get_removed_media().append(index)
+            media = media_objects.get_media()[index]
+            media_objects.get_removed_media().add(media.get_id())
             self.filter_media()
 
-            media = media_objects.get_media()[index]
-            os.remove(f"{options.get_base_dir()}/data/{media.FOLDER}/{media.get_id()}.json")
+            delete_media(media, options.get_base_dir())
+            self.up_next_widget.up_next.remove(media.get_id())
+            self.up_next_widget.update_ui()
+
+    def update_up_next(self, index: int = None):
+        """Updates the Continue Watching panel after the Media at the specified index
+        was changed, or ranks every piece of Media again when no index is specified,
+        like after importing or pulling Media
+
+        :param index: The index of the Media that was changed
+        """
+        up_next = self.up_next_widget.up_next
+        if index is not None:
+            up_next.update(media_objects.get_media()[index], time.time())
+        else:
+            removed_media = media_objects.get_removed_media()
+            up_next.clear()
+            up_next.update_all([medium for medium in media_objects.get_media()
+                                if medium.get_id() not in removed_media],
+                               get_activity(options.get_base_dir()))
+        self.up_next_widget.update_ui()
 
     def callback_tv_show(self, index: int = None, canceled: bool = False):
         """The callback function when a user is finished editing a TV Show
@@ -406,6 +643,11 @@ class Home(QtWidgets.QFrame):
             self.media_list_widget.scroll_area.update_ui()
             self.filter_media()
 
+            # Move the Show in the Continue Watching panel, keeping when it was last watched if canceled
+            if index is not None or not canceled:
+                self.up_next_widget.up_next.update(tv_show, None if canceled else time.time())
+                self.up_next_widget.update_ui()
+
     def callback_podcast(self, index: int = None, canceled: bool = False):
         """The callback function when a user is finished editing a Podcast
 
@@ -450,6 +692,11 @@ class Home(QtWidgets.QFrame):
             self.media_list_widget.scroll_area.update_ui()
             self.filter_media()
 
+            # Move the Show in the Continue Watching panel, keeping when it was last watched if canceled
+            if index is not None or not canceled:
+                self.up_next_widget.up_next.update(podcast, None if canceled else time.time())
+                self.up_next_widget.update_ui()
+
     def callback_limited_series(self, index: int = None, canceled: bool = False):
         """The callback function when a user is finished editing a LimitedSeries
 
@@ -494,6 +741,11 @@ class Home(QtWidgets.QFrame):
             self.media_list_widget.scroll_area.update_ui()
             self.filter_media()
 
+            # Move the Show in the Continue Watching panel, keeping when it was last watched if canceled
+            if index is not None or not canceled:
+                self.up_next_widget.up_next.update(limited_series, None if canceled else time.time())
+                self.up_next_widget.update_ui()
+
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def add_edit_media(self, media_type: str, index: int = None):
@@ -519,6 +771,7 @@ class Home(QtWidgets.QFrame):
         #   after adding/editing a piece of Media
         view_id = callback_func = None
         if media_type == "Movie":   # The Movie type is a dialog and therefore does not have a view
+            from ui import MovieDialog
             movie_dialog = MovieDialog(self)
             if movie_dialog.result == QtWidgets.QDialog.Accepted:
                 movie = media_objects.get_movie()
@@ -543,8 +796,9 @@ class Home(QtWidgets.QFrame):
             callback_func = self.callback_tv_show
 
         if media_type != "Movie":
-            self.views[view_id].edit(callback_func, index)
-            self.parent().setCurrentWidget(self.views[view_id])
+            view = self.get_view_func(view_id)
+            view.edit(callback_func, index)
+            self.parent().setCurrentWidget(view)
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
@@ -569,5 +823,6 @@ class Home(QtWidgets.QFrame):
 
 if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)
-    home = Home({})
+    home = Home()
+    home.load_media()
     sys.exit(app.exec_())
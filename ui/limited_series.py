@@ -3,6 +3,7 @@ from functools import partial
 
 from PyQt5 import QtWidgets, QtCore
 
+from exceptions import ConflictError
 from media import LimitedSeries
 from ui import MessageBox, add_grid_to_layout, EpisodeDialog, EpisodeListWidget
 from ui import media_objects
@@ -160,6 +161,7 @@ class LimitedSeriesView(QtWidgets.QFrame):
         self.provider_dropdown.setCurrentIndex(0)
         self.person_dropdown.setCurrentIndex(0)
         self.episodes_widget.scroll_area.update_ui()
+        self.episodes_widget.update_filter_options()
 
     def cancel(self):
         """Cancels adding or editing a Limited Series and moves back to the previous screen"""
@@ -186,6 +188,7 @@ class LimitedSeriesView(QtWidgets.QFrame):
             if is_saving:
                 limited_series = media_objects.get_limited_series()
                 id = limited_series.get_id()
+                version = limited_series.get_version()
             limited_series = LimitedSeries(
                 self.name_line_edit.text(),
                 self.provider_dropdown.currentText(),
@@ -198,6 +201,7 @@ class LimitedSeriesView(QtWidgets.QFrame):
             )
             if is_saving:
                 limited_series.set_id(id)
+                limited_series.set_version(version)
             media_objects.set_limited_series(limited_series)
 
             # Save the Limited Series into a file and go back to the previous screen
@@ -210,6 +214,8 @@ class LimitedSeriesView(QtWidgets.QFrame):
                 "Missing Values",
                 "You must specify the Name, the Streaming Provider and the Person",
                 self)
+        except ConflictError as e:
+            MessageBox("Save Conflict", str(e), self)
 
     def edit(self, callback: callable = None, index: int = None):
         """Sets whether the user is editing or adding a Limited Series in this view
@@ -277,6 +283,7 @@ class LimitedSeriesView(QtWidgets.QFrame):
             media_objects.get_episodes()[index] = None
             media_objects.get_removed_episodes().append(index)
             self.episodes_widget.scroll_area.filter()
+            self.episodes_widget.update_range_options()
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
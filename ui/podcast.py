@@ -3,6 +3,7 @@ from functools import partial
 
 from PyQt5 import QtWidgets, QtCore
 
+from exceptions import ConflictError
 from media import Season, Episode, Podcast
 from ui import MessageBox, add_grid_to_layout, EpisodeDialog, EpisodeListWidget
 from ui import media_objects
@@ -161,6 +162,7 @@ class PodcastView(QtWidgets.QFrame):
         self.person_dropdown.setCurrentIndex(0)
         self.episodes_widget.scroll_area.widgets = []
         self.episodes_widget.scroll_area.update_ui()
+        self.episodes_widget.update_filter_options()
 
     def cancel(self):
         """Cancels adding or editing a Podcast and moves back to the previous screen"""
@@ -194,6 +196,7 @@ class PodcastView(QtWidgets.QFrame):
             if is_saving:
                 podcast = media_objects.get_podcast()
                 id = podcast.get_id()
+                version = podcast.get_version()
             podcast = Podcast(
                 self.name_line_edit.text(),
                 self.provider_dropdown.currentText(),
@@ -207,6 +210,7 @@ class PodcastView(QtWidgets.QFrame):
             )
             if is_saving:
                 podcast.set_id(id)
+                podcast.set_version(version)
             media_objects.set_podcast(podcast)
 
             # Save the Podcast into a file and go back to the previous screen
@@ -219,6 +223,8 @@ class PodcastView(QtWidgets.QFrame):
                 "Missing Values",
                 "You must specify the Name, the Streaming Provider and the Person",
                 self)
+        except ConflictError as e:
+            MessageBox("Save Conflict", str(e), self)
 
     def edit(self, callback: callable = None, index: int = None):
         """Sets whether the user is editing or adding a Podcast in this view
@@ -286,6 +292,7 @@ class PodcastView(QtWidgets.QFrame):
             media_objects.get_episodes()[index] = None
             media_objects.get_removed_episodes().append(index)
             self.episodes_widget.scroll_area.filter()
+            self.episodes_widget.update_range_options()
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
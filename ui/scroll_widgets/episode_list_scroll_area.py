@@ -5,6 +5,7 @@ from PyQt5 import QtWidgets, QtCore
 
 from ui import add_grid_to_layout
 from ui import media_objects
+from profiling import profiler
 
 
 class EpisodeListScrollArea(QtWidgets.QScrollArea):
@@ -31,15 +32,18 @@ class EpisodeListScrollArea(QtWidgets.QScrollArea):
         self.widget = None
         self.widgets = None
         self.no_episodes_label = None
+        self.last_watched_index = None
 
         self.update_ui()
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    @profiler.profile("EpisodeListScrollArea.update_ui")
     def update_ui(self):
         """Creates/Updates the UI for the List of Episodes"""
         value_y = self.verticalScrollBar().value()
         value_x = self.horizontalScrollBar().value()
+        self.last_watched_index = None
 
         # Setup the widgets and labels for the Scroll Area
         self.widget = QtWidgets.QWidget(self.parent())
@@ -121,25 +125,50 @@ class EpisodeListScrollArea(QtWidgets.QScrollArea):
         """Updates the watched attribute of the Episode
         at the specified index
 
+        If the Shift key is held down, every Episode between the last
+        Episode that was clicked and this Episode will be updated
+
         :param index: The index of the Episode to edit
         """
 
         # Add 1 to the index when accessing the widgets
         #   due to the column headings
         watched = self.widgets[index + 1][0].isChecked()
-        media_objects.get_episodes()[index].set_watched(watched)
+        last_index = self.last_watched_index
+        self.last_watched_index = index
+        if (QtWidgets.QApplication.keyboardModifiers() & QtCore.Qt.ShiftModifier and
+                last_index is not None and last_index < len(media_objects.get_episodes())):
+            self.set_watched(watched, min(last_index, index), max(last_index, index))
+        else:
+            self.set_watched(watched, index, index)
+
+    def set_watched(self, watched: bool, start: int = None, end: int = None):
+        """Sets the watched attribute of every Episode between
+        the start and end index at once and updates the stats and filter a single time
+
+        :param watched: Whether or not the Episodes have been watched
+        :param start: The index of the first Episode to change. (Defaults to the first Episode)
+        :param end: The index of the last Episode to change. (Defaults to the last Episode)
+        """
+
+        for i in media_objects.set_episodes_watched(watched, start, end):
+            self.widgets[i + 1][0].setChecked(watched)
         self.update_season_func()
         self.filter()
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    @profiler.profile("EpisodeListScrollArea.filter")
     def filter(self):
         """Filters the Episodes in the ScrollArea"""
         filtered_episodes = media_objects.get_filtered_episodes()
 
         # Set the visibility of the widgets
         #   based off the filtered episodes
-        for i in range(len(media_objects.get_episodes())):
+        #   Episodes are compared by identity so this does not compare every pair of Episodes
+        filtered_ids = {id(episode) for episode in filtered_episodes}
+        episodes = media_objects.get_episodes()
+        for i in range(len(episodes)):
             for ew in self.widgets[i + 1]:
-                ew.setVisible(media_objects.get_episodes()[i] in filtered_episodes)
+                ew.setVisible(id(episodes[i]) in filtered_ids)
         self.no_episodes_label.setVisible(len(filtered_episodes) == 0)
@@ -40,6 +40,12 @@ class EpisodeListWidget(QtWidgets.QWidget):
         self.add_episode_button = None
         self.filter_options = None
 
+        # Create the widget attributes for marking a range of Episodes
+        self.range_start_combobox = None
+        self.range_end_combobox = None
+        self.mark_watched_button = None
+        self.mark_unwatched_button = None
+
         # Create the widget attributes for the count and runtime stats
         self.percent_watched_label = None
         self.percent_unwatched_label = None
@@ -80,6 +86,19 @@ class EpisodeListWidget(QtWidgets.QWidget):
         self.runtime_label = QtWidgets.QLabel(self)
         self.update_stats()
 
+        self.range_start_combobox = QtWidgets.QComboBox(self)
+        self.range_start_combobox.setToolTip("The first Episode to mark as watched or unwatched")
+        self.range_end_combobox = QtWidgets.QComboBox(self)
+        self.range_end_combobox.setToolTip("The last Episode to mark as watched or unwatched")
+
+        self.mark_watched_button = QtWidgets.QPushButton("Mark Watched", self)
+        self.mark_watched_button.clicked.connect(partial(self.mark_range, True))
+        self.mark_watched_button.setToolTip("Mark every Episode from the first to the last Episode as watched")
+
+        self.mark_unwatched_button = QtWidgets.QPushButton("Mark Unwatched", self)
+        self.mark_unwatched_button.clicked.connect(partial(self.mark_range, False))
+        self.mark_unwatched_button.setToolTip("Mark every Episode from the first to the last Episode as unwatched")
+
         self.filter_combobox = QtWidgets.QComboBox(self)
         self.filter_combobox.currentIndexChanged.connect(filter_function)
         self.update_filter_options()
@@ -89,7 +108,11 @@ class EpisodeListWidget(QtWidgets.QWidget):
 
         layout.addWidget(self.filter_combobox, 0, 0, 1, 3)
         layout.addWidget(self.add_episode_button, 0, 3)
-        layout.addWidget(self.scroll_area, 1, 0, 1, 4)
+        layout.addWidget(self.range_start_combobox, 1, 0)
+        layout.addWidget(self.range_end_combobox, 1, 1)
+        layout.addWidget(self.mark_watched_button, 1, 2)
+        layout.addWidget(self.mark_unwatched_button, 1, 3)
+        layout.addWidget(self.scroll_area, 2, 0, 1, 4)
         layout.addWidget(self.percent_watched_label, 5, 0)
         layout.addWidget(self.percent_unwatched_label, 5, 1)
         layout.addWidget(self.runtime_label, 5, 2)
@@ -101,20 +124,17 @@ class EpisodeListWidget(QtWidgets.QWidget):
         """Updates the stats at the bottom of the widget
         for how many Episodes show up and the total runtime
         """
-        total_episodes = len(media_objects.get_filtered_episodes())
+        filtered_episodes = media_objects.get_filtered_episodes()
+        total_episodes = len(filtered_episodes)
         watched_episodes = len([
             episode
-            for episode in media_objects.get_filtered_episodes()
+            for episode in filtered_episodes
             if episode.is_watched()
         ])
-        unwatched_episodes = len([
-            episode
-            for episode in media_objects.get_filtered_episodes()
-            if not episode.is_watched()
-        ])
+        unwatched_episodes = total_episodes - watched_episodes
         weeks, days = divmod(sum([
             episode.get_runtime()
-            for episode in media_objects.get_filtered_episodes()
+            for episode in filtered_episodes
         ]), 7 * 24 * 60)
         days, hours = divmod(days, 24 * 60)
         hours, minutes = divmod(hours, 60)
@@ -137,8 +157,7 @@ class EpisodeListWidget(QtWidgets.QWidget):
             round(unwatched_episodes / total_episodes * 100, 2)
             if total_episodes != 0 else 0))
         self.runtime_label.setText(f"Runtime: {runtime_text}")
-        self.count_label.setText("Count: {}".format(
-            len(media_objects.get_filtered_episodes())))
+        self.count_label.setText("Count: {}".format(total_episodes))
 
     def update_filter_options(self):
         """Updates the filter options based off the episodes in the widget"""
@@ -161,3 +180,45 @@ class EpisodeListWidget(QtWidgets.QWidget):
         self.filter_combobox.clear()
         self.filter_combobox.addItems(self.filter_options)
         self.filter_combobox.setCurrentIndex(0)
+        self.update_range_options()
+
+    def update_range_options(self):
+        """Updates the Episodes that can be chosen as the first and last Episode
+        when marking a range of Episodes as watched or unwatched.
+        The removed Episodes are left out since they cannot be marked
+        """
+
+        months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                  "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+        self.range_start_combobox.clear()
+        self.range_end_combobox.clear()
+        episodes = media_objects.get_episodes()
+        removed_episodes = set(media_objects.get_removed_episodes())
+        for i in range(len(episodes)):
+            episode = episodes[i]
+            if episode is None or i in removed_episodes:
+                continue
+            if self.hide_season is True:
+                text = f"Episode {episode.get_episode()}: {episode.get_name()}"
+            elif self.hide_season is None:
+                text = "{} {} {}: {}".format(
+                    episode.get_season(), months[episode.get_episode() // 1000 - 1],
+                    episode.get_episode() % 1000, episode.get_name())
+            else:
+                text = f"S{episode.get_season()}E{episode.get_episode()}: {episode.get_name()}"
+            self.range_start_combobox.addItem(text, i)
+            self.range_end_combobox.addItem(text, i)
+        self.range_end_combobox.setCurrentIndex(self.range_end_combobox.count() - 1)
+
+    def mark_range(self, watched: bool):
+        """Marks every Episode between the chosen first and last Episode
+        as watched or unwatched in a single step
+
+        :param watched: Whether or not to mark the Episodes as watched
+        """
+
+        start = self.range_start_combobox.currentData()
+        end = self.range_end_combobox.currentData()
+        if start is None or end is None:
+            return
+        self.scroll_area.set_watched(watched, min(start, end), max(start, end))
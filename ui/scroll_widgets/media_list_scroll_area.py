@@ -1,10 +1,12 @@
 from functools import partial
 from PyQt5 import QtWidgets, QtCore
 
+from exceptions import ConflictError
 from media.util import get_type
-from ui import add_grid_to_layout
+from ui import add_grid_to_layout, MessageBox
 from ui import media_objects
 from options import options
+from profiling import profiler
 
 
 class MediaListScrollArea(QtWidgets.QScrollArea):
@@ -13,16 +15,18 @@ class MediaListScrollArea(QtWidgets.QScrollArea):
 
     :keyword edit_media_func: The function to use when editing one Media
     :keyword remove_media_func: The function to use when removing one Media
+    :keyword media_changed_func: The function to use after one Media is changed and saved
     """
 
     def __init__(self, parent: QtWidgets.QWidget = None,
                  *, edit_media_func: callable = None, remove_media_func: callable = None,
-                 update_stats_func: callable = None):
+                 media_changed_func: callable = None, update_stats_func: callable = None):
         super().__init__(parent)
 
         # Save the parameters as attributes
         self.edit_media_func = edit_media_func
         self.remove_media_func = remove_media_func
+        self.media_changed_func = media_changed_func
         self.update_stats_func = update_stats_func
 
         # Create the widget attributes for inside the scroll area
@@ -34,6 +38,7 @@ class MediaListScrollArea(QtWidgets.QScrollArea):
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    @profiler.profile("MediaListScrollArea.update_ui")
     def update_ui(self):
         """Creates/updates the UI for the list of Media"""
         value_y = self.verticalScrollBar().value()
@@ -117,6 +122,35 @@ class MediaListScrollArea(QtWidgets.QScrollArea):
         self.verticalScrollBar().setValue(value_y)
         self.horizontalScrollBar().setValue(value_x)
 
+    def update_row(self, index: int):
+        """Updates the widgets of the Media at the specified index
+        after the Media was changed, without creating the whole list again
+
+        :param index: The index of the Media to update
+        """
+        medium = media_objects.get_media()[index]
+        widgets = self.widgets[index + 1]
+        widgets[0].setChecked(medium.is_started())
+        widgets[0].setToolTip(f"Set the started status of {medium.get_name()}")
+        widgets[1].setChecked(medium.is_finished())
+        widgets[1].setToolTip(f"Set the finished status of {medium.get_name()}")
+
+        hours, minutes = divmod(medium.get_runtime(), 60)
+        labels = [get_type(medium), medium.get_provider(), medium.get_person(),
+                  "{}hr{} {}min{}".format(
+                      hours, "s" if hours != 1 else "",
+                      minutes, "s" if minutes != 1 else "")]
+        if len(options.get_persons()) == 1:
+            labels.pop(2)
+        if len(options.get_providers()) == 2:
+            labels.pop(1)
+        for label, text in zip(widgets[2:-2], labels):
+            label.setText(text)
+
+        widgets[-2].setText(medium.get_name().replace("&", "&&"))
+        widgets[-2].setToolTip(f"Edit {medium.get_name()}")
+        widgets[-1].setToolTip(f"Remove {medium.get_name()} from the media queue")
+
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def update_start(self, index: int):
@@ -133,7 +167,7 @@ class MediaListScrollArea(QtWidgets.QScrollArea):
         if started and finished:
             self.widgets[index + 1][1].setChecked(False)
         media_objects.get_media()[index].set_started(started)
-        media_objects.get_media()[index].save()
+        self.save_media(index)
         self.filter()
 
     def update_finish(self, index: int):
@@ -150,18 +184,35 @@ class MediaListScrollArea(QtWidgets.QScrollArea):
         if finished and started:
             self.widgets[index + 1][0].setChecked(False)
         media_objects.get_media()[index].set_finished(finished)
-        media_objects.get_media()[index].save()
+        self.save_media(index)
         self.filter()
 
+    def save_media(self, index: int):
+        """Saves the Media at the specified index and tells the user
+        when it was changed by another program since it was loaded
+
+        :param index: The index of the Media to save
+        """
+        try:
+            media_objects.get_media()[index].save()
+        except ConflictError as e:
+            MessageBox("Save Conflict", str(e), self)
+        if self.media_changed_func is not None:
+            self.media_changed_func(index)
+
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    @profiler.profile("MediaListScrollArea.filter")
     def filter(self):
         """Filters the Media in the ScrollArea"""
         filtered_media = media_objects.get_filtered_media()
 
         # Set the visibility of the widgets
         #   based off the filtered media
-        for i in range(len(media_objects.get_media())):
+        #   Media is compared by identity so this does not compare every pair of Media
+        filtered_ids = {id(medium) for medium in filtered_media}
+        media = media_objects.get_media()
+        for i in range(len(media)):
             for mw in self.widgets[i + 1]:
-                mw.setVisible(media_objects.get_media()[i] in filtered_media)
+                mw.setVisible(id(media[i]) in filtered_ids)
         self.no_media_label.setVisible(len(filtered_media) == 0)
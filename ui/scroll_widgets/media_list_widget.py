@@ -12,16 +12,19 @@ class MediaListWidget(QtWidgets.QWidget):
 
     :keyword edit_media_func: The function to use when editing one Media
     :keyword remove_media_func: The function to use when remove one Media
+    :keyword media_changed_func: The function to use after one Media is changed and saved
     """
 
     def __init__(self, parent: QtWidgets.QWidget = None, flags=QtCore.Qt.WindowFlags(),
-                 edit_media_func: callable = None, remove_media_func: callable = None):
+                 edit_media_func: callable = None, remove_media_func: callable = None,
+                 media_changed_func: callable = None):
         super().__init__(parent, flags)
 
         # Create the Scroll Area
         self.scroll_area = MediaListScrollArea(
             self, edit_media_func=edit_media_func,
             remove_media_func=remove_media_func,
+            media_changed_func=media_changed_func,
             update_stats_func=self.update_stats
         )
         self.scroll_area.setAlignment(QtCore.Qt.AlignHCenter)
@@ -63,20 +66,21 @@ class MediaListWidget(QtWidgets.QWidget):
         """Updates the stats at the bottom of the widget
         for how many Media show up and the total runtime.
         """
-        total_media = len(media_objects.get_filtered_media())
+        filtered_media = media_objects.get_filtered_media()
+        total_media = len(filtered_media)
         started_media = len([
             media
-            for media in media_objects.get_filtered_media()
+            for media in filtered_media
             if media.is_started()
         ])
         finished_media = len([
             media
-            for media in media_objects.get_filtered_media()
+            for media in filtered_media
             if media.is_finished()
         ])
         weeks, days = divmod(sum([
             media.get_runtime()
-            for media in media_objects.get_filtered_media()
+            for media in filtered_media
         ]), 7 * 24 * 60)
         days, hours = divmod(days, 24 * 60)
         hours, minutes = divmod(hours, 60)
@@ -101,6 +105,4 @@ class MediaListWidget(QtWidgets.QWidget):
             if total_media != 0 else 0
         ))
         self.runtime_label.setText(f"Runtime: {runtime_text}")
-        self.count_label.setText("Count: {}".format(
-            len(media_objects.get_filtered_media())
-        ))
+        self.count_label.setText("Count: {}".format(total_media))
@@ -0,0 +1,124 @@
+from functools import partial
+from PyQt5 import QtWidgets, QtCore
+
+from media import Media
+from media.util import get_type
+from ui import add_grid_to_layout
+from ui import media_objects
+from util import POLICIES, UpNext
+from options import options
+
+
+class UpNextWidget(QtWidgets.QGroupBox):
+    """The Up Next Widget is the Continue Watching panel on the Home screen
+    which shows the Shows to watch next along with the next Episode to watch in each.
+
+    The Shows come from an Up Next engine that is updated whenever a piece of Media
+    is loaded, changed, or removed, so only the first few Shows are read when the panel updates.
+    The panel is hidden when no Show has been started
+
+    :keyword edit_media_func: The function to use when opening one Media
+    """
+
+    AMOUNT = 5
+    POLICY_NAMES = {"recent": "Recently Watched", "shortest": "Shortest Remaining", "provider": "Streaming Provider"}
+
+    def __init__(self, parent: QtWidgets.QWidget = None,
+                 *, edit_media_func: callable = None):
+        super().__init__("Continue Watching", parent)
+
+        # Save the parameters as attributes
+        self.edit_media_func = edit_media_func
+
+        policy = options.get_up_next_policy()
+        self.up_next = UpNext(policy=policy if policy in POLICIES else "recent",
+                              providers=options.get_providers())
+        self.person = None
+
+        # Create the widget attributes for inside the panel
+        self.policy_combobox = None
+        self.widget = None
+        self.widgets = None
+
+        self.setup_ui()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def setup_ui(self):
+        """Sets up the UI for the Up Next Widget"""
+
+        layout = QtWidgets.QVBoxLayout()
+
+        self.policy_combobox = QtWidgets.QComboBox(self)
+        self.policy_combobox.addItems([UpNextWidget.POLICY_NAMES[policy] for policy in POLICIES])
+        self.policy_combobox.setCurrentIndex(POLICIES.index(self.up_next.get_policy()))
+        self.policy_combobox.currentIndexChanged.connect(self.update_policy)
+        self.policy_combobox.setToolTip("Choose how to rank the shows to continue watching")
+
+        self.widget = QtWidgets.QWidget(self)
+        layout.addWidget(self.policy_combobox, 0, QtCore.Qt.AlignRight)
+        layout.addWidget(self.widget)
+
+        self.setLayout(layout)
+        self.update_ui()
+
+    def update_ui(self):
+        """Creates/Updates the rows for the Shows to watch next"""
+
+        # Replace the rows of the Shows with new ones
+        self.widget.deleteLater()
+        self.widget = QtWidgets.QWidget(self)
+        layout = QtWidgets.QGridLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.widgets = []
+        for item in self.up_next.get_top(UpNextWidget.AMOUNT, person=self.person):
+            medium = item.get_media()
+            season, episode, name, runtime = item.get_episode()
+            remaining_hours, remaining_minutes = divmod(item.get_remaining(), 60)
+
+            media_button = QtWidgets.QPushButton(medium.get_name(), self.widget)
+            media_button.clicked.connect(partial(self.open_media, medium))
+            media_button.setToolTip(f"Continue watching {medium.get_name()}")
+
+            self.widgets.append([
+                media_button,
+                QtWidgets.QLabel(f"S{season}E{episode} {name}", self.widget),
+                QtWidgets.QLabel(medium.get_provider(), self.widget),
+                QtWidgets.QLabel(f"{remaining_hours}hr{'s' if remaining_hours != 1 else ''} "
+                                 f"{remaining_minutes}min{'s' if remaining_minutes != 1 else ''} left", self.widget)
+            ])
+
+        add_grid_to_layout(self.widgets, layout)
+        self.widget.setLayout(layout)
+        self.layout().addWidget(self.widget)
+        self.setVisible(len(self.widgets) > 0)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def open_media(self, medium: Media):
+        """Opens the specified Show like it was clicked in the list of Media.
+        The index of the Show is found when it is clicked since sorting the Media moves it
+
+        :param medium: The Show to open
+        """
+        media = media_objects.get_media()
+        for i in range(len(media)):
+            if media[i] is medium:
+                self.edit_media_func(get_type(medium), i)
+                return
+
+    def update_policy(self):
+        """Ranks the Shows again by the policy chosen in the combobox"""
+        policy = POLICIES[self.policy_combobox.currentIndex()]
+        self.up_next.set_policy(policy, options.get_providers())
+        options.set_up_next_policy(policy)
+        self.update_ui()
+
+    def update_person(self, person: str = None):
+        """Shows only the Shows of the specified Person
+
+        :param person: The Person whose Shows to show, or None to show every Person
+        """
+        self.person = person
+        self.update_ui()
@@ -3,6 +3,7 @@ from functools import partial
 
 from PyQt5 import QtWidgets, QtCore
 
+from exceptions import ConflictError
 from media import Season, Episode, TVShow
 from ui import MessageBox, add_grid_to_layout, EpisodeDialog, EpisodeListWidget
 from ui import media_objects
@@ -159,6 +160,7 @@ class TVShowView(QtWidgets.QFrame):
         self.provider_dropdown.setCurrentIndex(0)
         self.person_dropdown.setCurrentIndex(0)
         self.episodes_widget.scroll_area.update_ui()
+        self.episodes_widget.update_filter_options()
 
     def cancel(self):
         """Cancels adding or editing a TV Show and moves back to the previous screen"""
@@ -193,6 +195,7 @@ class TVShowView(QtWidgets.QFrame):
             if is_saving:
                 tv_show = media_objects.get_tv_show()
                 id = tv_show.get_id()
+                version = tv_show.get_version()
             tv_show = TVShow(
                 self.name_line_edit.text(),
                 self.provider_dropdown.currentText(),
@@ -206,6 +209,7 @@ class TVShowView(QtWidgets.QFrame):
             )
             if is_saving:
                 tv_show.set_id(id)
+                tv_show.set_version(version)
             media_objects.set_tv_show(tv_show)
 
             # Save the TV Show into a file and go back to the previous screen
@@ -218,6 +222,8 @@ class TVShowView(QtWidgets.QFrame):
                 "Missing Values",
                 "You must specify the Name, the Streaming Provider and the Person",
                 self)
+        except ConflictError as e:
+            MessageBox("Save Conflict", str(e), self)
 
     def edit(self, callback: callable = None, index: int = None):
         """Sets whether the user is editing or adding a TV Show in this view
@@ -285,6 +291,7 @@ class TVShowView(QtWidgets.QFrame):
             media_objects.get_episodes()[index] = None
             media_objects.get_removed_episodes().append(index)
             self.episodes_widget.scroll_area.filter()
+            self.episodes_widget.update_range_options()
 
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
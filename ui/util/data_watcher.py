@@ -0,0 +1,126 @@
+import os
+from typing import Dict, Tuple
+
+from PyQt5 import QtCore
+
+from media import Movie, TVShow, Podcast, LimitedSeries
+from util import data_file_to_media
+from profiling import profiler
+
+
+class DataWatcher(QtCore.QObject):
+    """The Data Watcher notices when the files in the data folder are added, changed,
+    or deleted by something other than the app, like a script or a sync, while it is running.
+
+    The Media folders are watched with a QFileSystemWatcher. When a folder changes,
+    only that folder is checked for files whose modification time or size changed,
+    and only those files are loaded again. The changes are delivered through
+    the media_changed signal as the loaded Media and the IDs of the deleted Media.
+    Changes that come in quick succession, like a sync writing many files,
+    are delivered together
+
+    :param base_dir: The base directory of the data folder to watch
+    :keyword delay: The milliseconds to wait for more changes before checking the folders
+    """
+
+    media_changed = QtCore.pyqtSignal(list, list)
+
+    DELAY = 200
+
+    def __init__(self, parent: QtCore.QObject = None, base_dir: str = None,
+                 *, delay: int = DELAY):
+        super().__init__(parent)
+        self.base_dir = base_dir
+        self.folders = [f"{base_dir}/data/{media_type.FOLDER}"
+                        for media_type in [Movie, TVShow, Podcast, LimitedSeries]]
+        self.files = {}
+        self.changed_folders = set()
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.folder_changed)
+        self.check_timer = QtCore.QTimer(self)
+        self.check_timer.setSingleShot(True)
+        self.check_timer.setInterval(delay)
+        self.check_timer.timeout.connect(self.check)
+
+    def start(self):
+        """Starts watching the data folder from the files that are there now"""
+        self.files = {}
+        for folder in self.folders:
+            self.files.update(DataWatcher.get_stats(folder))
+        self.watch_folders()
+
+    def stop(self):
+        """Stops watching the data folder"""
+        self.check_timer.stop()
+        paths = self.watcher.directories()
+        if len(paths) > 0:
+            self.watcher.removePaths(paths)
+
+    def watch_folders(self):
+        """Watches the data folder and every Media folder that exists.
+        The data folder is watched so the Media folders are watched once they are created
+        """
+        paths = [path for path in [f"{self.base_dir}/data"] + self.folders
+                 if os.path.isdir(path) and path not in self.watcher.directories()]
+        if len(paths) > 0:
+            self.watcher.addPaths(paths)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def folder_changed(self, path: str):
+        """Remembers the folder that changed and checks it once the changes settle
+
+        :param path: The path of the folder that changed
+        """
+        self.changed_folders.add(path)
+        self.check_timer.start()
+
+    @profiler.profile("DataWatcher.check")
+    def check(self):
+        """Loads the files that were added or changed in the folders that changed
+        and emits them along with the IDs of the files that were deleted
+        """
+        folders = [folder for folder in self.folders if folder in self.changed_folders]
+        if f"{self.base_dir}/data" in self.changed_folders:
+            self.watch_folders()
+            folders = self.folders
+        self.changed_folders.clear()
+
+        media = []
+        removed_ids = []
+        for folder in folders:
+            files = DataWatcher.get_stats(folder)
+            for filename in [filename for filename in self.files
+                             if os.path.dirname(filename) == folder and filename not in files]:
+                self.files.pop(filename)
+                removed_ids.append(os.path.basename(filename)[:-len(".json")])
+
+            for filename, stat in files.items():
+                if self.files.get(filename) == stat:
+                    continue
+                # A file that cannot be loaded, like one that is still being written,
+                #   is loaded again the next time its folder changes
+                try:
+                    media.append(data_file_to_media(filename))
+                    self.files[filename] = stat
+                except Exception:
+                    continue
+
+        if len(media) > 0 or len(removed_ids) > 0:
+            self.media_changed.emit(media, removed_ids)
+
+    @staticmethod
+    def get_stats(folder: str) -> Dict[str, Tuple[int, int]]:
+        """Returns the modification time and the size of every JSON file in a folder, by filename
+
+        :param folder: The folder to look in
+        """
+        stats = {}
+        if os.path.isdir(folder):
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        stats[f"{folder}/{entry.name}"] = (stat.st_mtime_ns, stat.st_size)
+        return stats
@@ -0,0 +1,60 @@
+import os
+from typing import List
+
+from PyQt5 import QtCore
+
+from util import get_data_files, data_file_to_media
+from profiling import profiler
+
+
+class MediaLoader(QtCore.QThread):
+    """The Media Loader loads all the Media inside the data folder
+    on a background thread so the window can be shown right away.
+
+    The Media is delivered in batches through the batch_loaded signal
+    so the list of Media can be updated while the rest is still loading
+
+    Only the Media of some Persons can be loaded so the Media of
+    the other Persons is only loaded once it is needed
+
+    :param base_dir: The base directory to load the Media from
+    :keyword batch_size: The amount of Media to deliver in each batch
+    :keyword persons: The Persons whose Media to load. (Defaults to every Person)
+    :keyword exclude_persons: The Persons whose Media not to load. (Defaults to no Person)
+    """
+
+    batch_loaded = QtCore.pyqtSignal(list)
+    progress = QtCore.pyqtSignal(int, int)
+    load_failed = QtCore.pyqtSignal(str, str)
+
+    BATCH_SIZE = 50
+
+    def __init__(self, parent: QtCore.QObject = None, base_dir: str = None,
+                 *, batch_size: int = BATCH_SIZE, persons: List[str] = None,
+                 exclude_persons: List[str] = None):
+        super().__init__(parent)
+        self.base_dir = base_dir
+        self.batch_size = batch_size
+        self.persons = persons
+        self.exclude_persons = exclude_persons
+
+    @profiler.profile("MediaLoader.run")
+    def run(self):
+        """Loads the Media files and emits them in batches"""
+        filenames = get_data_files(self.base_dir, persons=self.persons,
+                                   exclude_persons=self.exclude_persons)
+        self.progress.emit(0, len(filenames))
+
+        batch = []
+        for i in range(len(filenames)):
+            if self.isInterruptionRequested():
+                return
+            try:
+                batch.append(data_file_to_media(filenames[i]))
+            except Exception as e:
+                self.load_failed.emit(os.path.basename(filenames[i]), str(e))
+
+            if len(batch) >= self.batch_size or i == len(filenames) - 1:
+                self.batch_loaded.emit(batch)
+                self.progress.emit(i + 1, len(filenames))
+                batch = []
@@ -1,8 +1,8 @@
 from functools import cmp_to_key
-from typing import List, Union
+from typing import List, Set, Union
 
 from media import Media, Episode, Movie, TVShow, Podcast, LimitedSeries
-from media.util import get_type
+from media.util import get_type, media_matches
 
 
 class MediaObjects:
@@ -22,7 +22,7 @@ class MediaObjects:
         self.__podcast = None
         self.__movie = None
         self.__media = []
-        self.__removed_media = []
+        self.__removed_media = set()
         self.__filtered_media = []
 
         self.__episode_filter = {"season": None, "watched": None}
@@ -104,6 +104,29 @@ class MediaObjects:
         """
         self.__media = media
 
+    def merge_media(self, media: List[Media], removed_ids: List[str] = None):
+        """Merges Media that was changed outside of the app into the list of Media.
+        The Media with the same ID is replaced, new Media is added,
+        and the Media with a removed ID is removed like it is on the Home screen.
+        Media that was removed in the app but changed outside of it is brought back
+
+        :param media: The Media that was added or changed
+        :param removed_ids: The IDs of the Media that was removed
+        """
+        indices = {self.__media[i].get_id(): i for i in range(len(self.__media))}
+        for medium in media:
+            index = indices.get(medium.get_id())
+            if index is None:
+                indices[medium.get_id()] = len(self.__media)
+                self.__media.append(medium)
+            else:
+                self.__media[index] = medium
+            self.__removed_media.discard(medium.get_id())
+
+        for media_id in removed_ids or []:
+            if media_id in indices:
+                self.__removed_media.add(media_id)
+
     # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def get_episode(self) -> Episode:
@@ -143,10 +166,16 @@ class MediaObjects:
         """Returns the remembered Media"""
         return self.__media
 
-    def get_removed_media(self) -> List[Media]:
-        """Returns the remembered list of Removed Media"""
+    def get_removed_media(self) -> Set[str]:
+        """Returns the IDs of the remembered Removed Media.
+        Removed Media is remembered by ID since sorting the Media changes its index
+        """
         return self.__removed_media
 
+    def get_removed_indices(self) -> Set[int]:
+        """Returns the current indices of the Removed Media in the list of Media"""
+        return {i for i in range(len(self.__media)) if self.__media[i].get_id() in self.__removed_media}
+
     def get_filtered_media(self) -> List[Media]:
         """Returns the filtered Media based off the Media Filter"""
         self.sort_media()
@@ -190,9 +219,10 @@ class MediaObjects:
     def filter_episodes(self):
         """Filters the saved episodes based off the filters specified by set_episodes_filters"""
         self.__filtered_episodes = []
+        removed_episodes = set(self.get_removed_episodes())
         for i in range(len(self.get_episodes())):
             episode = self.get_episodes()[i]
-            if i in self.get_removed_episodes():
+            if i in removed_episodes:
                 continue
             if self.__episode_filter["season"] is not None:
                 if episode.get_season() != self.__episode_filter["season"]:
@@ -202,6 +232,30 @@ class MediaObjects:
                     continue
             self.__filtered_episodes.append(episode)
 
+    def set_episodes_watched(self, watched: bool, start: int = None, end: int = None) -> List[int]:
+        """Sets the watched status of every Episode between the start and end index
+        in one pass and returns the indices of the Episodes that were changed
+
+        :param watched: Whether or not the Episodes have been watched
+        :param start: The index of the first Episode to change. (Defaults to the first Episode)
+        :param end: The index of the last Episode to change. (Defaults to the last Episode)
+        """
+        if start is None:
+            start = 0
+        if end is None:
+            end = len(self.__episodes) - 1
+
+        changed = []
+        removed_episodes = set(self.get_removed_episodes())
+        for i in range(max(start, 0), min(end, len(self.__episodes) - 1) + 1):
+            episode = self.__episodes[i]
+            if episode is None or i in removed_episodes:
+                continue
+            if episode.is_watched() is not watched:
+                episode.set_watched(watched)
+                changed.append(i)
+        return changed
+
     def sort_episodes(self):
         """Sorts the Episodes in the list by Season Number and Episode Number"""
 
@@ -248,30 +302,18 @@ class MediaObjects:
         """
 
         self.__filtered_media = []
-        for i in range(len(self.get_media())):
-            medium = self.get_media()[i]
-            if i in self.get_removed_media():
+        removed_media = self.get_removed_media()
+        for medium in self.get_media():
+            if medium.get_id() in removed_media:
                 continue
-            if self.__media_filter["search"] is not None:
-                # noinspection PyUnresolvedReferences
-                if self.__media_filter["search"].lower() not in medium.get_name().lower():
-                    continue
-            if self.__media_filter["started"] is not None:
-                if self.__media_filter["started"] is not medium.is_started():
-                    continue
-            if self.__media_filter["finished"] is not None:
-                if self.__media_filter["finished"] is not medium.is_finished():
-                    continue
-            if self.__media_filter["type"] is not None:
-                if self.__media_filter["type"] != get_type(medium):
-                    continue
-            if self.__media_filter["provider"] is not None:
-                if self.__media_filter["provider"] != medium.get_provider():
-                    continue
-            if self.__media_filter["person"] is not None:
-                if self.__media_filter["person"] != medium.get_person():
-                    continue
-            self.__filtered_media.append(medium)
+            if media_matches(medium,
+                             started=self.__media_filter["started"],
+                             finished=self.__media_filter["finished"],
+                             media_type=self.__media_filter["type"],
+                             provider=self.__media_filter["provider"],
+                             person=self.__media_filter["person"],
+                             search=self.__media_filter["search"]):
+                self.__filtered_media.append(medium)
 
     # noinspection PyTypeChecker
     def set_media_sort(self, *, media_type: bool = None, provider: bool = None,
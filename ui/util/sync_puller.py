@@ -0,0 +1,33 @@
+from urllib.error import URLError
+
+from PyQt5 import QtCore
+
+from sync import pull_changes
+from profiling import profiler
+
+
+class SyncPuller(QtCore.QThread):
+    """The Sync Puller pulls the Media that changed on a sync server
+    on a background thread so the window keeps responding while it downloads
+
+    :param url: The URL of the sync server
+    :param base_dir: The base directory to save the pulled Media in
+    """
+
+    pulled = QtCore.pyqtSignal(object)
+    pull_failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent: QtCore.QObject = None, url: str = None, base_dir: str = None):
+        super().__init__(parent)
+        self.url = url
+        self.base_dir = base_dir
+
+    @profiler.profile("SyncPuller.run")
+    def run(self):
+        """Pulls the changes and emits the result"""
+        try:
+            self.pulled.emit(pull_changes(self.url, base_dir=self.base_dir))
+        except URLError as e:
+            self.pull_failed.emit(str(e.reason))
+        except Exception as e:
+            self.pull_failed.emit(str(e))
@@ -0,0 +1,184 @@
+import os
+import sys
+import threading
+from time import perf_counter
+from types import FrameType
+from typing import Dict, List, Tuple, Union
+
+from PyQt5 import QtWidgets, QtCore
+
+WATCHDOG_ENV = "MEDIAQUEUE_WATCHDOG"
+
+
+class EventLoopWatchdog(QtCore.QObject):
+    """The Event Loop Watchdog measures how long the event loop is blocked
+    and finds the slot that was blocking it.
+
+    A heartbeat timer runs on the GUI thread and a background thread checks
+    how long ago the last heartbeat was. When the event loop has been blocked
+    past the threshold, the background thread samples the stack of the GUI thread
+    to find the slot that is running. Once the event loop runs again, the lag
+    is logged and added to the worst offenders, which are shown in the status bar
+
+    The watchdog is enabled by setting the MEDIAQUEUE_WATCHDOG environment variable to 1
+    or with the --watchdog command line flag of the Media Queue
+
+    :param parent: The parent object of the watchdog, usually the application
+    :keyword threshold: The lag, in milliseconds, that counts as the event loop being blocked
+    :keyword status_bar: The status bar to show the lag and the worst offender in, if any
+    """
+
+    INTERVAL = 50
+    THRESHOLD = 100
+    SAMPLE_INTERVAL = 0.01
+
+    def __init__(self, parent: QtCore.QObject = None,
+                 *, threshold: int = THRESHOLD, status_bar: QtWidgets.QStatusBar = None):
+        super().__init__(parent)
+        self.threshold = threshold
+        self.status_bar = status_bar
+
+        self.main_thread_id = threading.get_ident()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.sampler = threading.Thread(target=self.sample, name="EventLoopWatchdog", daemon=True)
+
+        # The depth of the stack when the event loop is idle
+        #   is measured on the first heartbeat
+        self.idle_depth = None
+        self.last_beat = perf_counter()
+        self.stall = None
+        self.offenders = {}
+
+        self.heartbeat_timer = QtCore.QTimer(self)
+        self.heartbeat_timer.setInterval(EventLoopWatchdog.INTERVAL)
+        self.heartbeat_timer.timeout.connect(self.beat)
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Returns whether or not the watchdog is enabled by the environment variable"""
+        return os.environ.get(WATCHDOG_ENV, "").lower() not in ["", "0", "false"]
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def start(self):
+        """Starts the heartbeat timer and the background thread.
+        This should be called right before the event loop starts
+        """
+        self.last_beat = perf_counter()
+        self.heartbeat_timer.start()
+        self.sampler.start()
+
+    def stop(self):
+        """Stops the watchdog and logs the worst offenders"""
+        self.stopped.set()
+        self.heartbeat_timer.stop()
+        offenders = self.get_offenders()
+        if len(offenders) > 0:
+            print("Slowest slots of the event loop:", file=sys.stderr)
+            for slot, stats in offenders[:10]:
+                print("  {}: worst {:.0f} ms, total {:.0f} ms over {} time(s)".format(
+                    slot, stats["worst"], stats["total"], stats["count"]), file=sys.stderr)
+
+    def get_offenders(self) -> List[Tuple[str, Dict[str, float]]]:
+        """Returns every slot that blocked the event loop, and its stats,
+        from the slot with the worst lag to the slot with the least lag
+        """
+        with self.lock:
+            offenders = [(slot, dict(stats)) for slot, stats in self.offenders.items()]
+        return sorted(offenders, key=lambda offender: offender[1]["worst"], reverse=True)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def beat(self):
+        """Measures the lag of the event loop since the last heartbeat
+        and records the slot that caused it, if the lag is past the threshold
+        """
+        now = perf_counter()
+        if self.idle_depth is None:
+            self.idle_depth = len(EventLoopWatchdog.get_stack(sys._getframe())) - 1
+
+        with self.lock:
+            lag = (now - self.last_beat) * 1000 - EventLoopWatchdog.INTERVAL
+            stall = self.stall
+            self.stall = None
+            self.last_beat = now
+            if lag < self.threshold:
+                return
+
+            slot, location = stall if stall is not None else ("Unknown slot", "")
+            if slot not in self.offenders:
+                self.offenders[slot] = {"count": 0, "total": 0, "worst": 0}
+            self.offenders[slot]["count"] += 1
+            self.offenders[slot]["total"] += lag
+            self.offenders[slot]["worst"] = max(self.offenders[slot]["worst"], lag)
+            worst_slot = max(self.offenders, key=lambda s: self.offenders[s]["worst"])
+            worst_lag = self.offenders[worst_slot]["worst"]
+
+        print(f"The event loop was blocked for {lag:.0f} ms by {slot} {location}", file=sys.stderr)
+        if self.status_bar is not None:
+            self.status_bar.showMessage(
+                f"Blocked {lag:.0f} ms by {slot}  |  Worst: {worst_slot} {worst_lag:.0f} ms")
+
+    def sample(self):
+        """Checks how long the event loop has been blocked on the background thread
+        and samples the stack of the GUI thread once it is past the threshold
+        """
+        while not self.stopped.wait(EventLoopWatchdog.SAMPLE_INTERVAL):
+            with self.lock:
+                last_beat = self.last_beat
+                blocked = (perf_counter() - last_beat) * 1000 - EventLoopWatchdog.INTERVAL
+                if blocked < self.threshold or self.stall is not None or self.idle_depth is None:
+                    continue
+
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            stall = self.describe_stall(EventLoopWatchdog.get_stack(frame))
+            with self.lock:
+                if self.last_beat == last_beat:
+                    self.stall = stall
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def describe_stall(self, stack: List[FrameType]) -> Tuple[str, str]:
+        """Returns the name of the slot that is running and the location
+        of the innermost frame in the stack of the blocked GUI thread.
+
+        The slot is the first frame deeper than the idle event loop,
+        skipping the wrappers of the profiler
+
+        :param stack: The frames of the GUI thread from the outermost to the innermost
+        """
+        slot = None
+        for frame in stack[self.idle_depth:]:
+            if os.path.basename(frame.f_code.co_filename) != "profiling.py":
+                slot = frame
+                break
+        if slot is None:
+            slot = stack[-1]
+        innermost = stack[-1]
+        return (EventLoopWatchdog.get_name(slot),
+                "({}:{} in {})".format(
+                    os.path.basename(innermost.f_code.co_filename),
+                    innermost.f_lineno, innermost.f_code.co_name))
+
+    @staticmethod
+    def get_stack(frame: Union[FrameType, None]) -> List[FrameType]:
+        """Returns the frames of the stack from the outermost frame to the specified frame
+
+        :param frame: The innermost frame of the stack
+        """
+        stack = []
+        while frame is not None:
+            stack.append(frame)
+            frame = frame.f_back
+        return stack[::-1]
+
+    @staticmethod
+    def get_name(frame: FrameType) -> str:
+        """Returns the qualified name of the function of the specified frame
+
+        :param frame: The frame to get the name of
+        """
+        return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
@@ -1,7 +1,28 @@
 from util.import_utils import csv_to_media
+from util.import_utils import iter_csv_media
 from util.import_utils import json_to_media
+from util.import_utils import iter_json_media
+from util.import_utils import file_to_media
+from util.import_utils import delta_to_media
+from util.import_utils import read_delta
+from util.import_utils import replay_delta
+from util.import_utils import get_data_files
+from util.import_utils import get_data_file_stats
+from util.import_utils import get_person_index
+from util.import_utils import data_file_to_media
+from util.upsert_utils import MediaIndex
+from util.upsert_utils import ImportPlan
+from util.upsert_utils import plan_import
+from util.upsert_utils import apply_import
 from util.export_utils import EXPORTS
 from util.export_utils import media_to_csv
 from util.export_utils import media_to_json
+from util.export_utils import media_to_delta
+from util.export_utils import media_to_npz
+from util.export_utils import is_npz_available
+from util.up_next import POLICIES
+from util.up_next import UpNextItem
+from util.up_next import UpNext
+from util.up_next import get_activity
 
 from util.resource import resource_path
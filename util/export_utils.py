@@ -1,14 +1,22 @@
+import gzip
 import os
 import string
+from csv import writer
 from datetime import datetime
-from json import dumps
-from typing import List, Union
+from hashlib import sha1
+from importlib.util import find_spec
+from json import dump, dumps, load
+from textwrap import indent
+from typing import Dict, Iterable, TextIO, Union
 
 from media import Media, Movie, TVShow, Podcast, LimitedSeries
+from media.util import get_episodes
 
 from options import options
 
 EXPORTS = "exports"
+EXPORT_MANIFEST = "export_manifest.json"
+NPZ_MEDIA_TYPES = ["Movie", "TVShow", "Podcast", "LimitedSeries"]
 
 
 def format_filename(s):
@@ -29,21 +37,30 @@ def format_filename(s):
     return filename
 
 
-def __media_to(media: Union[List[Media], Movie, LimitedSeries, Podcast, TVShow],
-               *, as_csv: bool = False, as_json: bool = False):
-    """Exports the specified media into the specified file into the exports folder.
+def __media_to(media: Union[Iterable[Media], Movie, LimitedSeries, Podcast, TVShow],
+               *, as_csv: bool = False, as_json: bool = False, compress: bool = False,
+               base_dir: str = None) -> Union[str, None]:
+    """Exports the specified media into the specified file into the exports folder
+    and returns the filename of the exported file.
+
+    The Media is written to the file one at a time so the export starts writing
+    immediately and never holds the whole export in memory.
 
     Note that if as_csv and as_json are both False, nothing will happen and
     no exceptions will be raised.
 
-    :param media: The Media object to convert into CSV or JSON
+    :param media: The Media object, or the Media objects, to convert into CSV or JSON
     :param as_csv: Whether or not to export the Media as a CSV file
     :param as_json: Whether or not to export the Media as a JSON file
+    :param compress: Whether or not to compress the exported file with gzip
+    :param base_dir: The base directory to export the Media into. (Defaults to the base directory in the options)
     """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
 
     # Create the exports folder if necessary
-    if not os.path.exists(f"{options.get_base_dir()}/{EXPORTS}"):
-        os.mkdir(f"{options.get_base_dir()}/{EXPORTS}")
+    if not os.path.exists(f"{base_dir}/{EXPORTS}"):
+        os.mkdir(f"{base_dir}/{EXPORTS}")
 
     # Get the filename
     now = datetime.now()
@@ -51,40 +68,307 @@ def __media_to(media: Union[List[Media], Movie, LimitedSeries, Podcast, TVShow],
         now.year, now.month, now.day,
         now.hour, now.minute, now.second,
         format_filename(media.get_name())
-        if not isinstance(media, List) else "all_media")
+        if isinstance(media, Media) else "all_media")
 
     # Export media as CSV
     if as_csv:
-        if isinstance(media, List):
-            csv_object = "\n".join(m.to_csv() for m in media)
-        else:
-            csv_object = media.to_csv()
-        with open(f"{options.get_base_dir()}/exports/{file_location}.csv", "w") as csv_file:
-            csv_file.write(csv_object)
+        filename = f"{base_dir}/{EXPORTS}/{file_location}.csv"
+        with open_export(filename, compress) as csv_file:
+            csv_writer = writer(csv_file, lineterminator="\n")
+            for m in ([media] if isinstance(media, Media) else media):
+                csv_writer.writerows(m.to_csv_rows())
+        return filename + (".gz" if compress else "")
 
     # Export media as JSON
     if as_json:
-        json_object = []
-        if isinstance(media, List):
-            for m in media:
-                json_object.append(m.to_json())
-        else:
-            json_object = media.to_json()
-        with open(f"{options.get_base_dir()}/exports/{file_location}.json", "w") as json_file:
-            json_file.write(dumps(json_object, indent=4))
+        filename = f"{base_dir}/{EXPORTS}/{file_location}.json"
+        with open_export(filename, compress) as json_file:
+            if isinstance(media, Media):
+                dump(media_to_json_object(media), json_file, indent=4)
+            else:
+
+                # Remember the hash of each Media in the export so
+                #   the changes since this export can be exported later
+                hashes = {}
+
+                def json_objects():
+                    for m in media:
+                        json_object = media_to_json_object(m)
+                        hashes[m.get_id()] = json_hash(json_object)
+                        yield json_object
+                write_json_array(json_objects(), json_file)
+        if not isinstance(media, Media):
+            save_export_manifest(filename + (".gz" if compress else ""), hashes, base_dir)
+        return filename + (".gz" if compress else "")
+    return None
+
+
+def json_hash(json_object: dict) -> str:
+    """Returns a hash of the contents of the specified JSON object
+
+    :param json_object: The JSON object to hash
+    """
+    return sha1(dumps(json_object, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def load_export_manifest(base_dir: str = None) -> dict:
+    """Returns the manifest of the last export of all the Media which holds the filename
+    of the export and the hash of each Media in it, by ID
+
+    :param base_dir: The base directory of the exports. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    filename = f"{base_dir}/{EXPORTS}/{EXPORT_MANIFEST}"
+    if not os.path.exists(filename):
+        return {"export": None, "hashes": {}}
+    with open(filename, "r") as manifest_file:
+        return load(manifest_file)
+
+
+def save_export_manifest(export: str, hashes: Dict[str, str], base_dir: str = None):
+    """Saves the manifest of the last export of all the Media
+
+    :param export: The filename of the export
+    :param hashes: The hash of each Media in the export, by ID
+    :param base_dir: The base directory of the exports. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    with open(f"{base_dir}/{EXPORTS}/{EXPORT_MANIFEST}", "w") as manifest_file:
+        dump({"export": os.path.basename(export), "hashes": hashes}, manifest_file)
+
+
+def open_export(filename: str, compress: bool = False) -> TextIO:
+    """Opens the specified export file for writing text
+
+    :param filename: The filename of the export file
+    :param compress: Whether or not to compress the file with gzip.
+        If so, .gz is added to the end of the filename
+    """
+    if compress:
+        return gzip.open(f"{filename}.gz", "wt", newline="")
+    return open(filename, "w", newline="")
+
+
+def media_to_json_object(media: Media) -> dict:
+    """Returns the JSON representation of the specified Media for an export
+    which includes the type of the Media so it can be imported again
+
+    :param media: The Media object to convert into JSON
+    """
+    json_object = media.to_json()
+    json_object["type"] = type(media).__name__
+    return json_object
+
+
+def write_json_array(json_objects: Iterable[dict], file: TextIO):
+    """Writes the specified JSON objects into the file as a JSON array
+    one JSON object at a time
+
+    :param json_objects: The JSON objects to write into the JSON array
+    :param file: The file object to write the JSON array into
+    """
+    file.write("[")
+    first = True
+    for json_object in json_objects:
+        file.write("\n" if first else ",\n")
+        file.write(indent(dumps(json_object, indent=4), "    "))
+        first = False
+    file.write("\n]" if not first else "]")
 
 
-def media_to_csv(media: Union[List[Media], Movie, LimitedSeries, Podcast, TVShow]):
+def media_to_csv(media: Union[Iterable[Media], Movie, LimitedSeries, Podcast, TVShow],
+                 *, compress: bool = False, base_dir: str = None) -> str:
     """Exports the specified media into a CSV file
+    and returns the filename of the exported file
 
     :param media: The Media object to convert into CSV
+    :keyword compress: Whether or not to compress the exported file with gzip
+    :keyword base_dir: The base directory to export the Media into. (Defaults to the base directory in the options)
     """
-    __media_to(media, as_csv=True)
+    return __media_to(media, as_csv=True, compress=compress, base_dir=base_dir)
 
 
-def media_to_json(media: Union[List[Media], Movie, LimitedSeries, Podcast, TVShow]):
+def media_to_json(media: Union[Iterable[Media], Movie, LimitedSeries, Podcast, TVShow],
+                  *, compress: bool = False, base_dir: str = None) -> str:
     """Exports the specified media into a JSON file
+    and returns the filename of the exported file
 
     :param media: The Media object to convert into JSON
+    :keyword compress: Whether or not to compress the exported file with gzip
+    :keyword base_dir: The base directory to export the Media into. (Defaults to the base directory in the options)
+    """
+    return __media_to(media, as_json=True, compress=compress, base_dir=base_dir)
+
+
+def media_to_delta(media: Iterable[Media], *, compress: bool = False, base_dir: str = None) -> str:
+    """Exports only the Media that was added, changed, or removed since the last export
+    of all the Media into a JSON delta file and returns the filename of the delta file.
+
+    The delta file can be replayed on top of the last export to get the current Media.
+    If there is no last export, all the Media is exported as added
+
+    :param media: All the Media objects
+    :keyword compress: Whether or not to compress the exported file with gzip
+    :keyword base_dir: The base directory to export the Media into. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+
+    # Create the exports folder if necessary
+    if not os.path.exists(f"{base_dir}/{EXPORTS}"):
+        os.mkdir(f"{base_dir}/{EXPORTS}")
+    manifest = load_export_manifest(base_dir)
+
+    # Compare the hash of each Media with the hash in the last export
+    hashes = {}
+    added = []
+    changed = []
+    for m in media:
+        json_object = media_to_json_object(m)
+        hashes[m.get_id()] = json_hash(json_object)
+        if m.get_id() not in manifest["hashes"]:
+            added.append(json_object)
+        elif manifest["hashes"][m.get_id()] != hashes[m.get_id()]:
+            changed.append(json_object)
+    removed = [media_id for media_id in manifest["hashes"] if media_id not in hashes]
+
+    now = datetime.now()
+    filename = "{}/{}/{}_{}_{}_{}_{}_{}_changes.json".format(
+        base_dir, EXPORTS,
+        now.year, now.month, now.day,
+        now.hour, now.minute, now.second)
+    with open_export(filename, compress) as json_file:
+        dump({
+            "type": "Delta",
+            "base": manifest["export"],
+            "added": added,
+            "changed": changed,
+            "removed": removed
+        }, json_file, indent=4)
+
+    # The delta becomes the last export so the next delta only has newer changes
+    filename += ".gz" if compress else ""
+    save_export_manifest(filename, hashes, base_dir)
+    return filename
+
+
+def is_npz_available() -> bool:
+    """Returns whether or not NumPy is installed so the Media can be exported as NPZ.
+    NumPy is an optional dependency, so it is only looked for instead of imported
+    """
+    return find_spec("numpy") is not None
+
+
+def media_to_npz(media: Iterable[Media], *, compress: bool = False, base_dir: str = None) -> str:
+    """Exports the specified media as columnar NumPy arrays and returns the filename of the export.
+    The arrays are saved as one .npy file each inside an export folder, so every array can be
+    memory-mapped with numpy.load(filename, mmap_mode="r"), or as a single compressed .npz file
+    when compressing, which is smaller but must be read into memory.
+
+    The export holds one table of Media and one table of Episodes as flat arrays
+    so it can be analyzed without constructing any objects:
+
+    - media_id, media_started, media_finished, media_runtime
+    - media_type, media_provider, media_person as integer codes into the
+      type_names, provider_names, and person_names arrays
+    - media_episode_start and media_episode_count as the range of the Media's
+      Episodes in the Episode table
+    - episode_media as the row of the Episode's Media in the Media table
+    - episode_season, episode_number, episode_runtime, episode_watched
+
+    The names are stored as UTF-8 bytes one after the other, so one long name
+    does not make every row as wide as it is. The name of row i is the bytes from
+    media_name_offsets[i] up to media_name_offsets[i + 1] in media_name_data,
+    and the same for episode_name_offsets and episode_name_data.
+
+    None of the arrays hold Python objects so they can be loaded with allow_pickle=False.
+    NumPy is only needed for this export.
+
+    :param media: The Media objects to export
+    :keyword compress: Whether or not to export a single compressed .npz file instead of an export folder
+    :keyword base_dir: The base directory to export the Media into. (Defaults to the base directory in the options)
+    :raises ImportError: When NumPy is not installed
     """
-    __media_to(media, as_json=True)
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy must be installed to export the media as NPZ")
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+
+    # Create the exports folder if necessary
+    if not os.path.exists(f"{base_dir}/{EXPORTS}"):
+        os.mkdir(f"{base_dir}/{EXPORTS}")
+
+    # Build each column of the Media and Episode tables, coding
+    #   the types, providers, and persons with a dictionary for each
+    providers = {}
+    persons = {}
+    columns = {
+        "media_id": [], "media_name": [], "media_type": [],
+        "media_provider": [], "media_person": [],
+        "media_started": [], "media_finished": [], "media_runtime": [],
+        "media_episode_start": [], "media_episode_count": [],
+        "episode_media": [], "episode_season": [], "episode_number": [],
+        "episode_name": [], "episode_runtime": [], "episode_watched": []
+    }
+    for row, m in enumerate(media):
+        episodes = get_episodes(m)
+        columns["media_id"].append(m.get_id())
+        columns["media_name"].append(m.get_name())
+        columns["media_type"].append(NPZ_MEDIA_TYPES.index(type(m).__name__))
+        columns["media_provider"].append(providers.setdefault(m.get_provider(), len(providers)))
+        columns["media_person"].append(persons.setdefault(m.get_person(), len(persons)))
+        columns["media_started"].append(m.is_started())
+        columns["media_finished"].append(m.is_finished())
+        columns["media_runtime"].append(
+            m.get_runtime() if isinstance(m, Movie)
+            else sum(episode.get_runtime() for episode in episodes))
+        columns["media_episode_start"].append(len(columns["episode_media"]))
+        columns["media_episode_count"].append(len(episodes))
+        for episode in episodes:
+            columns["episode_media"].append(row)
+            columns["episode_season"].append(episode.get_season())
+            columns["episode_number"].append(episode.get_episode())
+            columns["episode_name"].append(episode.get_name())
+            columns["episode_runtime"].append(episode.get_runtime())
+            columns["episode_watched"].append(episode.is_watched())
+
+    arrays = {
+        "type_names": numpy.array(NPZ_MEDIA_TYPES, dtype=str),
+        "provider_names": numpy.array(list(providers), dtype=str),
+        "person_names": numpy.array(list(persons), dtype=str)
+    }
+    for column, values in columns.items():
+        if column in ["media_name", "episode_name"]:
+            names = [value.encode() for value in values]
+            offsets = numpy.zeros(len(names) + 1, dtype=numpy.int64)
+            numpy.cumsum([len(name) for name in names], out=offsets[1:])
+            arrays[f"{column}_offsets"] = offsets
+            arrays[f"{column}_data"] = numpy.frombuffer(b"".join(names), dtype=numpy.uint8)
+        elif column in ["media_id"]:
+            arrays[column] = numpy.array(values, dtype=str)
+        elif column in ["media_started", "media_finished", "episode_watched"]:
+            arrays[column] = numpy.array(values, dtype=bool)
+        elif column in ["media_type"]:
+            arrays[column] = numpy.array(values, dtype=numpy.int8)
+        else:
+            arrays[column] = numpy.array(values, dtype=numpy.int64)
+
+    now = datetime.now()
+    filename = "{}/{}/{}_{}_{}_{}_{}_{}_all_media".format(
+        base_dir, EXPORTS,
+        now.year, now.month, now.day,
+        now.hour, now.minute, now.second)
+    if compress:
+        filename += ".npz"
+        with open(filename, "wb") as npz_file:
+            numpy.savez_compressed(npz_file, **arrays)
+        return filename
+
+    os.makedirs(filename, exist_ok=True)
+    for name, array in arrays.items():
+        numpy.save(f"{filename}/{name}.npy", array, allow_pickle=False)
+    return filename
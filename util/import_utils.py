@@ -1,12 +1,37 @@
+import gzip
+import os
 from csv import reader
 from io import TextIOWrapper
-from json import load
-from typing import List, Union
+from json import JSONDecoder, JSONDecodeError, dumps, load, loads
+from typing import Dict, Iterator, List, Set, TextIO, Tuple, Union
 from uuid import uuid4
 
+from exceptions import InvalidFormatError
+from file_utils import write_atomic
 from media import Movie, LimitedSeries, Podcast, TVShow, Season, Episode
+from media.storage import load_catalog
 from options import options
 
+JSON_MEDIA_TYPES = {"Movie": Movie, "TVShow": TVShow, "Podcast": Podcast, "LimitedSeries": LimitedSeries}
+
+
+JSON_CHUNK_SIZE = 64 * 1024
+
+# The file inside the data folder that caches the Person of every piece of Media
+PERSON_INDEX = ".persons.json"
+
+
+def open_import(filename: str, newline: str = None) -> TextIO:
+    """Opens the specified file for reading text.
+    Files that end with .gz are decompressed while they are read
+
+    :param filename: The filename of the file to open
+    :param newline: How the newlines in the file should be read
+    """
+    if filename.endswith(".gz"):
+        return gzip.open(filename, "rt", newline=newline)
+    return open(filename, "r", newline=newline)
+
 
 def json_to_media(file: Union[TextIOWrapper, str]) -> List[Union[Movie, LimitedSeries, Podcast, TVShow]]:
     """Converts the specified JSON file or filename into a Media object
@@ -16,26 +41,144 @@ def json_to_media(file: Union[TextIOWrapper, str]) -> List[Union[Movie, LimitedS
     :raises FileNotFoundError: If the specified filename was not found on the system
     :raises TypeError: If the JSON file holds an unknown object type
     """
+    return list(iter_json_media(file))
+
+
+def iter_json_media(file: Union[TextIOWrapper, str],
+                    chunk_size: int = JSON_CHUNK_SIZE,
+                    *, providers: Set[str] = None,
+                    persons: Set[str] = None) -> Iterator[Union[Movie, LimitedSeries, Podcast, TVShow]]:
+    """Reads the specified JSON file or filename in chunks and yields
+    each Media object in the JSON array as soon as it has been decoded.
+
+    Only the chunk being decoded is held in memory at a time.
+    A JSON file holding a single Media object is also supported
+
+    :param file: The file object or filename of the JSON file to load, which may be compressed with gzip
+    :param chunk_size: The amount of characters to read from the file at a time
+    :keyword providers: The Streaming Providers the Media must be on, if they should be validated
+    :keyword persons: The Persons the Media must be watched by, if they should be validated
+
+    :raises FileNotFoundError: If the specified filename was not found on the system
+    :raises TypeError: If the JSON file holds an unknown object type
+    :raises KeyError: If the Streaming Provider or Person given for a Media object is invalid
+    :raises ValueError: If the JSON file is not a valid JSON array of Media objects
+    """
+
+    # Open the JSON file if a filename was given
+    #   so it can be closed when finished
+    close_file = isinstance(file, str)
+    if close_file:
+        file = open_import(file)
+
+    try:
+        index = 0
+        for media in __iter_json_array(file, chunk_size):
+            media = __json_to_media_object(media, index)
+            if providers is not None and media.get_provider() not in providers:
+                raise KeyError(f"{media.get_provider()} does not exist in your Streaming Providers")
+            if persons is not None and media.get_person() not in persons:
+                raise KeyError(f"{media.get_person()} does not exist in your Person list")
+            yield media
+            index += 1
+    finally:
+        if close_file:
+            file.close()
+
+
+def __iter_json_array(file: TextIOWrapper, chunk_size: int) -> Iterator[dict]:
+    """Decodes the values of the JSON array in the specified file one at a time
+    using a buffer that is filled with chunks from the file as needed
+
+    :param file: The file object of the JSON file to decode
+    :param chunk_size: The amount of characters to read from the file at a time
+    """
+
+    decoder = JSONDecoder()
+    buffer = ""
+    position = 0
+    end_of_file = False
+
+    def next_character() -> Union[str, None]:
+        """Skips any whitespace and returns the next character in the buffer
+        without consuming it, reading more of the file if necessary
+        """
+        nonlocal buffer, position, end_of_file
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if end_of_file:
+                return None
+            chunk = file.read(chunk_size)
+            end_of_file = len(chunk) == 0
+            buffer = chunk
+            position = 0
+
+    def next_value():
+        """Decodes and consumes the next JSON value in the buffer,
+        reading more of the file until the whole value is in the buffer
+        """
+        nonlocal buffer, position, end_of_file
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # A value that ends with the buffer may continue in the next chunk
+                if end < len(buffer) or end_of_file:
+                    position = end
+                    return value
+            except JSONDecodeError:
+                if end_of_file:
+                    raise
+
+            # Read a larger chunk when a value does not fit in the buffer
+            #   so large values are not decoded over and over
+            chunk = file.read(max(chunk_size, len(buffer) - position))
+            end_of_file = len(chunk) == 0
+            buffer = buffer[position:] + chunk
+            position = 0
+
+    # A single JSON object is a single Media object
+    character = next_character()
+    if character == "{":
+        yield next_value()
+        return
+    if character != "[":
+        raise ValueError("The JSON file must hold an array of Media objects")
+    position += 1
 
-    # Load the JSON file
-    if isinstance(file, str):
-        file = open(file, "r")
-    media_list = load(file)
-    for i in range(len(media_list)):
-        media = media_list[i]
-        if "type" not in media or media["type"] not in ["Movie", "TVShow", "Podcast", "LimitedSeries"]:
-            raise TypeError(f"The media JSON object at index {i} does not have a valid type descriptor")
-        if "id" not in media:
-            media["id"] = str(uuid4())
-        if media["type"] == "Movie":
-            media_list[i] = Movie(json=media)
-        elif media["type"] == "TVShow":
-            media_list[i] = TVShow(json=media)
-        elif media["type"] == "Podcast":
-            media_list[i] = Podcast(json=media)
-        elif media["type"] == "LimitedSeries":
-            media_list[i] = LimitedSeries(json=media)
-    return media_list
+    # Decode the values in the array one at a time
+    if next_character() == "]":
+        return
+    while True:
+        if next_character() is None:
+            raise ValueError("The JSON array of Media objects is not closed")
+        yield next_value()
+        character = next_character()
+        if character == "]":
+            return
+        if character != ",":
+            raise ValueError("The Media objects in the JSON array must be separated by commas")
+        position += 1
+
+
+def __json_to_media_object(media: dict, index: int) -> Union[Movie, LimitedSeries, Podcast, TVShow]:
+    """Converts a JSON object from a JSON file into a Media object
+
+    :param media: The JSON object of the Media
+    :param index: The index of the JSON object in the JSON file
+
+    :raises TypeError: If the JSON object holds an unknown object type
+    """
+    if not isinstance(media, dict) or "type" not in media or media["type"] not in JSON_MEDIA_TYPES:
+        raise TypeError(f"The media JSON object at index {index} does not have a valid type descriptor")
+    if "id" not in media:
+        media["id"] = str(uuid4())
+    return JSON_MEDIA_TYPES[media["type"]](json=media)
+
+
+CSV_MEDIA_TYPES = ["Movie", "LimitedSeries", "Podcast", "TVShow"]
 
 
 def csv_to_media(file: Union[TextIOWrapper, str]) -> List[Union[Movie, LimitedSeries, Podcast, TVShow]]:
@@ -47,91 +190,369 @@ def csv_to_media(file: Union[TextIOWrapper, str]) -> List[Union[Movie, LimitedSe
     :raises TypeError: If the CSV file holds an unknown object type
     :raises KeyError: If the Streaming Provider or Person given for a Media object is invalid
     """
+    return list(iter_csv_media(file))
+
+
+def iter_csv_media(file: Union[TextIOWrapper, str],
+                   *, providers: Set[str] = None,
+                   persons: Set[str] = None) -> Iterator[Union[Movie, LimitedSeries, Podcast, TVShow]]:
+    """Reads the specified CSV file or filename one line at a time and yields
+    each Media object as soon as the next Media header line, or the end of the file, closes it.
+
+    Only the lines of a single Media object are held in memory at a time
+
+    :param file: The file object or filename of the CSV file to load, which may be compressed with gzip
+    :keyword providers: The Streaming Providers the Media can be on. (Defaults to the providers in the options)
+    :keyword persons: The Persons the Media can be watched by. (Defaults to the persons in the options)
+
+    :raises FileNotFoundError: If the specified filename was not found on the system
+    :raises TypeError: If the CSV file holds an unknown object type
+    :raises KeyError: If the Streaming Provider or Person given for a Media object is invalid
+    :raises ValueError: If a line in the CSV file does not have valid values
+    """
+
+    # Open the CSV file if a filename was given
+    #   so it can be closed when finished
+    close_file = isinstance(file, str)
+    if close_file:
+        file = open_import(file, newline="")
+
+    # Build the sets of valid Streaming Providers and Persons once for the whole file
+    if providers is None:
+        providers = set(options.get_providers())
+    if persons is None:
+        persons = set(options.get_persons())
+
+    try:
+        r = reader(file)
+        media_content = []
+        for line in r:
+            if len(line) == 0:
+                continue
+
+            # A Media header closes the previous Media object
+            if line[0] in CSV_MEDIA_TYPES:
+                if len(media_content) > 0:
+                    yield __csv_content_to_media(media_content, providers, persons)
+                media_content = []
+            elif len(media_content) == 0:
+                raise TypeError(f"Line {r.line_num}: {line[0]} is not a valid Media type")
+            media_content.append((r.line_num, line))
+
+        if len(media_content) > 0:
+            yield __csv_content_to_media(media_content, providers, persons)
+    finally:
+        if close_file:
+            file.close()
+
+
+def __csv_content_to_media(media_content: List[Tuple[int, List[str]]],
+                           providers: Set[str], persons: Set[str]) -> Union[Movie, LimitedSeries, Podcast, TVShow]:
+    """Converts the lines of a single Media object in a CSV file into the Media object
+
+    :param media_content: The line numbers and lines of the Media object, starting with its header
+    :param providers: The Streaming Providers the Media can be on
+    :param persons: The Persons the Media can be watched by
+    """
+
+    media_type = media_content[0][1][0]
+    if len(media_content) < 2:
+        raise ValueError(f"Line {media_content[0][0]}: {media_type} is missing its details")
+    line_num, details = media_content[1]
+
+    try:
+        if media_type == "Movie":
+            name, runtime, provider, person, started, finished = details
+        else:
+            name, provider, person, started, finished = details
+    except ValueError as e:
+        raise ValueError(f"Line {line_num}: {e} -> {details}")
+    if provider not in providers:
+        raise KeyError(f"Line {line_num}: {provider} does not exist in your Streaming Providers")
+    if person not in persons:
+        raise KeyError(f"Line {line_num}: {person} does not exist in your Person list")
 
-    # Load the CSV file and split into lines
-    if isinstance(file, str):
-        file = open(file, "r")
-    r = reader(file)
-    contents = [line for line in r if len(line) > 0]
-
-    # Parse the lines to create Media objects from
-    last = 0
-    media_list = []
-    content_list = []
-    for i in range(len(contents)):
-        line = contents[i]
-        if line[0] in ["Movie", "LimitedSeries", "Podcast", "TVShow"]:
-            media_content = contents[last:i]
-            if len(media_content) > 0:
-                content_list.append(media_content)
-            last = i
-    content_list.append(contents[last:])
-
-    # Iterate through the content list to turn content into Media objects
-    for media_content in content_list:
-
-        if media_content[0][0] == "Movie":
-            name, runtime, provider, person, started, finished = media_content[1]
-            if provider not in options.get_providers():
-                raise KeyError(f"{provider} does not exist in your Streaming Providers")
-            if person not in options.get_persons():
-                raise KeyError(f"{person} does not exist in your Person list")
-            media_list.append(Movie(
+    try:
+        if media_type == "Movie":
+            return Movie(
                 name, int(runtime),
                 provider, person,
                 started=started == "True", finished=finished == "True"
+            )
+
+        # Load the Episodes of the LimitedSeries, Podcast, or TVShow
+        episodes = []
+        for line_num, episode in media_content[2:]:
+            try:
+                s_num, e_num, e_name, runtime, watched = episode
+            except ValueError as e:
+                raise ValueError(f"{e} -> {episode}")
+            episodes.append(Episode(
+                int(s_num), int(e_num),
+                e_name, int(runtime),
+                watched=watched == "True"
             ))
+        line_num = media_content[1][0]
 
-        elif media_content[0][0] == "LimitedSeries":
-            name, provider, person, started, finished = media_content[1]
-            if provider not in options.get_providers():
-                raise KeyError(f"{provider} does not exist in your Streaming Providers")
-            if person not in options.get_persons():
-                raise KeyError(f"{person} does not exist in your Person list")
-            episodes = []
-            for episode in media_content[2:]:
-                try:
-                    s_num, e_num, e_name, runtime, watched = episode
-                except ValueError as e:
-                    raise ValueError(f"{e} -> {episode}")
-                episodes.append(Episode(
-                    int(s_num), int(e_num),
-                    e_name, int(runtime),
-                    watched=watched == "True"
-                ))
-            media_list.append(LimitedSeries(
+        if media_type == "LimitedSeries":
+            return LimitedSeries(
                 name, provider, person, episodes,
                 started=started == "True", finished=finished == "True"
-            ))
+            )
+
+        seasons = {}
+        for episode in episodes:
+            if episode.get_season() not in seasons:
+                seasons[episode.get_season()] = []
+            seasons[episode.get_season()].append(episode)
+        seasons = [Season(season, seasons[season]) for season in seasons]
+        if media_type == "Podcast":
+            return Podcast(
+                name, provider, person, seasons,
+                started=started == "True", finished=finished == "True"
+            )
+        return TVShow(
+            name, provider, person, seasons,
+            started=started == "True", finished=finished == "True"
+        )
+    except ValueError as e:
+        raise ValueError(f"Line {line_num}: {e}")
+
+
+def file_to_media(filename: str, providers: Set[str] = None,
+                  persons: Set[str] = None) -> List[Union[Movie, LimitedSeries, Podcast, TVShow]]:
+    """Converts the specified CSV or JSON file into a list of Media objects.
+
+    This only uses its parameters so it can be run inside another process
+
+    :param filename: The filename of the CSV or JSON file to load, which may be compressed with gzip
+    :param providers: The Streaming Providers the Media can be on. (Defaults to the providers in the options)
+    :param persons: The Persons the Media can be watched by. (Defaults to the persons in the options)
+
+    A JSON delta file of the changes since an export is replayed on top of that export
+
+    :raises InvalidFormatError: If the file is not a .csv or .json file
+    """
+    if filename.endswith(".csv") or filename.endswith(".csv.gz"):
+        return list(iter_csv_media(filename, providers=providers, persons=persons))
+    if filename.endswith(".json") or filename.endswith(".json.gz"):
+        if read_delta(filename) is not None:
+            return replay_delta(filename, providers=providers, persons=persons)
+        return list(iter_json_media(filename, providers=providers, persons=persons))
+    raise InvalidFormatError("File type must be .json or .csv")
+
+
+def read_delta(filename: str) -> Union[dict, None]:
+    """Returns the JSON object of the specified delta file, or None if it is not a delta file.
+    Only a file holding a single JSON object is read completely, so an export is not loaded
+
+    :param filename: The filename of the JSON file, which may be compressed with gzip
+    """
+    with open_import(filename) as file:
+        text = file.read(JSON_CHUNK_SIZE)
+        if not text.lstrip().startswith("{"):
+            return None
+        text += file.read()
+    delta = loads(text)
+    return delta if delta.get("type") == "Delta" else None
+
+
+def __apply_delta(media: Dict[str, Union[Movie, LimitedSeries, Podcast, TVShow]], delta: dict):
+    """Applies the changes of the JSON object of a delta file to the Media objects, by ID"""
+    for media_id in delta["removed"]:
+        media.pop(media_id, None)
+    changes = delta["added"] + delta["changed"]
+    for i in range(len(changes)):
+        medium = __json_to_media_object(changes[i], i)
+        media[medium.get_id()] = medium
+
+
+def delta_to_media(base_file: Union[TextIOWrapper, str, None],
+                   *delta_files: Union[TextIOWrapper, str]) -> List[Union[Movie, LimitedSeries, Podcast, TVShow]]:
+    """Replays the changes in the specified delta files, in order, on top of
+    the specified export of all the Media and returns the resulting Media objects
+
+    :param base_file: The file object of the JSON export, or the filename of the JSON or CSV export,
+        to start from, or None to start without any Media
+    :param delta_files: The file objects or filenames of the JSON delta files to replay
+
+    :raises TypeError: If a delta file is not a valid delta file
+    """
+    if base_file is None:
+        media = {}
+    elif isinstance(base_file, str):
+        media = {medium.get_id(): medium for medium in file_to_media(base_file)}
+    else:
+        media = {medium.get_id(): medium for medium in iter_json_media(base_file)}
+    for delta_file in delta_files:
+        if isinstance(delta_file, str):
+            with open_import(delta_file) as file:
+                delta = load(file)
+        else:
+            delta = load(delta_file)
+        if not isinstance(delta, dict) or delta.get("type") != "Delta":
+            raise TypeError("The delta file does not have a valid type descriptor")
+        __apply_delta(media, delta)
+    return list(media.values())
+
+
+def replay_delta(filename: str, providers: Set[str] = None,
+                 persons: Set[str] = None) -> List[Union[Movie, LimitedSeries, Podcast, TVShow]]:
+    """Replays the specified delta file and every delta file before it on top of
+    the export they were made after and returns the resulting Media objects.
+
+    Each delta file names the export or the delta file it was made after as its base,
+    which is looked for next to it in the exports folder
+
+    :param filename: The filename of the delta file, which may be compressed with gzip
+    :param providers: The Streaming Providers the Media can be on. (Defaults to any Streaming Provider)
+    :param persons: The Persons the Media can be watched by. (Defaults to any Person)
+
+    :raises FileNotFoundError: If an export or delta file in the chain of bases was not found
+    :raises TypeError: If the file is not a valid delta file
+    :raises ValueError: If the bases of the delta files form a loop
+    :raises KeyError: If the Streaming Provider or Person given for a Media object is invalid
+    """
+    deltas = []
+    seen = {filename}
+    delta = read_delta(filename)
+    if delta is None:
+        raise TypeError("The delta file does not have a valid type descriptor")
+
+    # Follow the bases back to the export of all the Media, or to the first delta
+    #   which has no base since it holds all the Media as added
+    while delta is not None:
+        deltas.append(delta)
+        if delta.get("base") is None:
+            base = None
+            break
+        base = os.path.join(os.path.dirname(filename), os.path.basename(delta["base"]))
+        if base in seen:
+            raise ValueError(f"The delta files before {os.path.basename(filename)} form a loop")
+        seen.add(base)
+        delta = read_delta(base)
+
+    media = {} if base is None else {medium.get_id(): medium for medium in file_to_media(base)}
+    for delta in reversed(deltas):
+        __apply_delta(media, delta)
+    for medium in media.values():
+        if providers is not None and medium.get_provider() not in providers:
+            raise KeyError(f"{medium.get_provider()} does not exist in your Streaming Providers")
+        if persons is not None and medium.get_person() not in persons:
+            raise KeyError(f"{medium.get_person()} does not exist in your Person list")
+    return list(media.values())
+
+
+def get_data_files(base_dir: str = None, *, persons: List[str] = None,
+                   exclude_persons: List[str] = None) -> List[str]:
+    """Returns the filenames of every piece of Media saved inside the data folder
+    of the specified base directory, optionally only the Media of some Persons.
+    The Person of each file comes from the person index
+
+    :param base_dir: The base directory to look in. (Defaults to the base directory in the options)
+    :keyword persons: The Persons whose Media to include. (Defaults to every Person)
+    :keyword exclude_persons: The Persons whose Media to leave out. (Defaults to no Person)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+    if persons is not None or exclude_persons is not None:
+        return [filename for filename, person in get_person_index(base_dir).items()
+                if (persons is None or person in persons) and
+                (exclude_persons is None or person not in exclude_persons)]
+
+    filenames = []
+    for path in [Movie.FOLDER, TVShow.FOLDER, Podcast.FOLDER, LimitedSeries.FOLDER]:
+        if os.path.exists(f"{base_dir}/data/{path}"):
+            for file in os.listdir(f"{base_dir}/data/{path}"):
+                if file.endswith(".json"):
+                    filenames.append(f"{base_dir}/data/{path}/{file}")
+    return filenames
+
+
+def get_data_file_stats(base_dir: str = None) -> Dict[str, Tuple[int, int]]:
+    """Returns the modification time, in nanoseconds, and the size of every piece of Media
+    saved inside the data folder of the specified base directory, by filename.
+    A file whose modification time or size is different has been changed
+
+    :param base_dir: The base directory to look in. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+
+    stats = {}
+    for path in [Movie.FOLDER, TVShow.FOLDER, Podcast.FOLDER, LimitedSeries.FOLDER]:
+        if os.path.isdir(f"{base_dir}/data/{path}"):
+            with os.scandir(f"{base_dir}/data/{path}") as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        stats[f"{base_dir}/data/{path}/{entry.name}"] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
+def get_person_index(base_dir: str = None) -> Dict[str, str]:
+    """Returns the Person watching every piece of Media saved inside the data folder
+    of the specified base directory, by filename.
+
+    The index is cached inside the data folder along with the modification time and the size
+    of each file, so only the files that were added or changed since the last time,
+    by the app or by anything else, have to be read to find their Person
+
+    :param base_dir: The base directory to look in. (Defaults to the base directory in the options)
+    """
+    if base_dir is None:
+        base_dir = options.get_base_dir()
+
+    filename = f"{base_dir}/data/{PERSON_INDEX}"
+    cached = {}
+    if os.path.exists(filename):
+        try:
+            with open(filename, "r") as index_file:
+                cached = load(index_file)
+        except JSONDecodeError:
+            cached = {}
+
+    index = {}
+    persons = {}
+    for path, stat in get_data_file_stats(base_dir).items():
+        key = path[len(f"{base_dir}/data/"):]
+        entry = cached.get(key)
+        if entry is None or entry["stat"] != list(stat):
+            try:
+                with open(path, "r") as jsonfile:
+                    entry = {"person": load(jsonfile)["person"], "stat": list(stat)}
+            except (OSError, JSONDecodeError, KeyError):
+                continue  # The file is left for the loader to report
+        index[key] = entry
+        persons[path] = entry["person"]
+
+    if index != cached:
+        try:
+            write_atomic(filename, dumps(index).encode())
+        except OSError:
+            pass  # The index is only a cache so it is built again next time
+    return persons
+
+
+def data_file_to_media(filename: str) -> Union[Movie, LimitedSeries, Podcast, TVShow]:
+    """Loads the Media object saved in the specified file inside the data folder.
+    The type of Media is determined by the folder the file is located in
+
+    :param filename: The filename of the JSON file to load
+
+    :raises FileNotFoundError: If the specified filename, or the Catalog of a Show, was not found on the system
+    :raises TypeError: If the file is not located in a Media folder
+    """
+    folder = os.path.basename(os.path.dirname(filename))
+    for media_type in [Movie, TVShow, Podcast, LimitedSeries]:
+        if folder == media_type.FOLDER:
+            # Load the JSON here so the file is only read and parsed once
+            with open(filename, "r") as jsonfile:
+                json_object = load(jsonfile)
 
-        elif media_content[0][0] in ["Podcast", "TVShow"]:
-            name, provider, person, started, finished = media_content[1]
-            if provider not in options.get_providers():
-                raise KeyError(f"{provider} does not exist in your Streaming Providers")
-            if person not in options.get_persons():
-                raise KeyError(f"{person} does not exist in your Person list")
-            seasons = {}
-            for episode in media_content[2:]:
-                try:
-                    s_num, e_num, e_name, runtime, watched = episode
-                except ValueError as e:
-                    raise ValueError(f"{e} -> {episode}")
-                if int(s_num) not in seasons:
-                    seasons[int(s_num)] = []
-                seasons[int(s_num)].append(Episode(
-                    int(s_num), int(e_num),
-                    e_name, int(runtime),
-                    watched=watched == "True"
-                ))
-            seasons = [Season(season, seasons[season]) for season in seasons]
-            if media_content[0][0] == "Podcast":
-                media_list.append(Podcast(
-                    name, provider, person, seasons,
-                    started=started == "True", finished=finished == "True"
-                ))
-            else:
-                media_list.append(TVShow(
-                    name, provider, person, seasons,
-                    started=started == "True", finished=finished == "True"
-                ))
-    return media_list
+            # A Show refers to its Catalog, which is shared with the Shows of the other Persons
+            if isinstance(json_object.get("catalog"), str):
+                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(filename)))
+                json_object["catalog"] = load_catalog(json_object["catalog"], base_dir)
+            return media_type(json=json_object)
+    raise TypeError(f"{filename} is not located in a Media folder")
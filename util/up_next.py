@@ -0,0 +1,243 @@
+import os
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Dict, Iterable, List, Tuple, Union
+
+from media import Media, Show
+from util.import_utils import get_data_file_stats
+
+# The ways to rank the Shows to continue watching
+POLICIES = ["recent", "shortest", "provider"]
+
+
+class UpNextItem:
+    """An Up Next Item holds a Show that was started along with the next Episode to watch in it
+
+    :param media: The Show to continue watching
+    :param index: The index of the next Episode to watch in the Show
+    :param active: When the Show was last watched, as seconds since the epoch
+    """
+
+    def __init__(self, media: Show, index: int, active: float):
+        self.__media = media
+        self.__index = index
+        self.__active = active
+
+    def get_media(self) -> Show:
+        """Returns the Show to continue watching"""
+        return self.__media
+
+    def get_index(self) -> int:
+        """Returns the index of the next Episode to watch in the Show"""
+        return self.__index
+
+    def get_episode(self) -> Tuple[int, int, str, int]:
+        """Returns the next Episode to watch as (season, episode, name, runtime)"""
+        return self.__media.get_catalog().get_entries()[self.__index]
+
+    def get_active(self) -> float:
+        """Returns when the Show was last watched, as seconds since the epoch"""
+        return self.__active
+
+    def get_remaining(self) -> int:
+        """Returns the runtime of the Episodes left to watch in the Show, in minutes"""
+        return self.__media.get_runtime() - self.__media.get_watched_runtime()
+
+
+class UpNext:
+    """The Up Next engine ranks every Show that was started but not finished
+    by what to watch next, along with the next Episode to watch in each.
+
+    The Shows are kept in a heap that is updated whenever a single Show changes
+    instead of ranking every Show again, along with a heap for the Shows of each Person.
+    A Show that changes is pushed again and its old entry in the heaps is skipped once it
+    comes up, and a heap is rebuilt once most of it is old entries. The first few Shows
+    are read from the top of a heap without popping
+
+    The policies rank the Shows by:
+        1.) recent: The Show that was watched most recently \n
+        2.) shortest: The Show with the least runtime left to watch \n
+        3.) provider: The Show on the first of the preferred Streaming Providers,
+            and then the Show that was watched most recently
+
+    :keyword policy: The policy to rank the Shows by. (Defaults to recent)
+    :keyword providers: The preferred Streaming Providers, in order, for the provider policy
+
+    :raises ValueError: When the policy is not one of the policies
+    """
+
+    def __init__(self, *, policy: str = "recent", providers: List[str] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"The policy must be one of: {', '.join(POLICIES)}")
+        self.__policy = policy
+        self.__providers = {providers[i]: i for i in range(len(providers or []))}
+        self.__heaps = {None: []}   # The heap of every Person, and the heap of each Person by name
+        self.__sizes = {None: 0}    # The amount of current entries in each heap
+        self.__items = {}
+        self.__entries = {}
+        self.__counter = count()
+
+    def __len__(self):
+        return len(self.__items)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def get_policy(self) -> str:
+        """Returns the policy the Shows are ranked by"""
+        return self.__policy
+
+    def get_item(self, media_id: str) -> Union[UpNextItem, None]:
+        """Returns the Up Next Item of a Show, or None when the Show is not being watched
+
+        :param media_id: The ID of the Show
+        """
+        return self.__items.get(media_id)
+
+    def get_top(self, amount: int, *, person: str = None) -> List[UpNextItem]:
+        """Returns the Shows to watch next, best first, by walking down the heap of the Person
+        from the top, so only about as many entries as asked for are looked at
+
+        :param amount: The amount of Shows to return
+        :keyword person: The Person whose Shows to return. (Defaults to every Person)
+        """
+        heap = self.__heaps.get(person, [])
+        top = []
+        candidates = [(heap[0], 0)] if len(heap) > 0 else []
+        while len(candidates) > 0 and len(top) < amount:
+            entry, i = heappop(candidates)
+            if self.__entries.get(entry[2]) is entry:
+                top.append(self.__items[entry[2]])
+            for child in [2 * i + 1, 2 * i + 2]:
+                if child < len(heap):
+                    heappush(candidates, (heap[child], child))
+        return top
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def set_policy(self, policy: str, providers: List[str] = None):
+        """Sets the policy the Shows are ranked by, which ranks every Show again
+
+        :param policy: The policy to rank the Shows by
+        :param providers: The preferred Streaming Providers, in order, for the provider policy
+
+        :raises ValueError: When the policy is not one of the policies
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"The policy must be one of: {', '.join(POLICIES)}")
+        self.__policy = policy
+        if providers is not None:
+            self.__providers = {providers[i]: i for i in range(len(providers))}
+        self.__rebuild(rank=True)
+
+    def update(self, media: Media, active: float = None):
+        """Adds, moves, or removes a piece of Media after it was loaded or changed.
+        Only a Show that was started, or has watched Episodes, and is not finished is kept
+
+        :param media: The Media that was loaded or changed
+        :param active: When the Media was last watched, as seconds since the epoch.
+            (Defaults to when it was last watched before)
+        """
+        previous = self.__items.get(media.get_id())
+        if active is None:
+            active = previous.get_active() if previous is not None else 0
+
+        index = media.get_next_unwatched() if isinstance(media, Show) else None
+        if index is None or media.is_finished() or not (media.is_started() or media.get_watched_count() > 0):
+            self.remove(media.get_id())
+            return
+
+        item = UpNextItem(media, index, active)
+        self.__items[media.get_id()] = item
+        self.__push(item)
+
+    def update_all(self, media: Iterable[Media], activity: Dict[str, float] = None):
+        """Adds, moves, or removes many pieces of Media at once
+
+        :param media: The Media that was loaded or changed
+        :param activity: When each piece of Media was last watched, by ID
+        """
+        for medium in media:
+            self.update(medium, None if activity is None else activity.get(medium.get_id()))
+
+    def remove(self, media_id: str):
+        """Removes a piece of Media, like when it was deleted. Its entry in the heap is skipped
+
+        :param media_id: The ID of the Media to remove
+        """
+        self.__items.pop(media_id, None)
+        self.__discard(self.__entries.pop(media_id, None))
+
+    def clear(self):
+        """Removes every piece of Media"""
+        self.__heaps = {None: []}
+        self.__sizes = {None: 0}
+        self.__items.clear()
+        self.__entries.clear()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __rank(self, item: UpNextItem) -> tuple:
+        """Returns the rank of an Up Next Item in the heap, where the lowest rank is watched next"""
+        if self.__policy == "shortest":
+            return item.get_remaining(), -item.get_active()
+        if self.__policy == "provider":
+            return self.__providers.get(item.get_media().get_provider(), len(self.__providers)), -item.get_active()
+        return -item.get_active(),
+
+    def __entry(self, item: UpNextItem) -> tuple:
+        """Returns a new entry in the heaps for an Up Next Item as (rank, counter, ID, person)"""
+        return self.__rank(item), next(self.__counter), item.get_media().get_id(), item.get_media().get_person()
+
+    def __discard(self, entry: Union[tuple, None]):
+        """Removes an entry from the amount of current entries in its heaps"""
+        if entry is not None:
+            self.__sizes[None] -= 1
+            self.__sizes[entry[3]] -= 1
+
+    def __push(self, item: UpNextItem):
+        """Pushes a new entry for an Up Next Item into the heap of every Person
+        and the heap of its Person, which makes its old entry outdated
+        """
+        entry = self.__entry(item)
+        self.__discard(self.__entries.get(entry[2]))
+        self.__entries[entry[2]] = entry
+        for person in [None, entry[3]]:
+            self.__sizes[person] = self.__sizes.get(person, 0) + 1
+            heappush(self.__heaps.setdefault(person, []), entry)
+
+        # Rebuild a heap once most of it is outdated entries
+        if len(self.__heaps[None]) > 2 * self.__sizes[None] + 64:
+            self.__rebuild()
+        elif len(self.__heaps[entry[3]]) > 2 * self.__sizes[entry[3]] + 64:
+            self.__rebuild(entry[3])
+
+    def __rebuild(self, person: str = None, *, rank: bool = False):
+        """Rebuilds the heap of a Person from only the current entries
+
+        :param person: The Person whose heap to rebuild, or None to rebuild every heap
+        :keyword rank: Whether or not to rank every Up Next Item again, like after changing the policy
+        """
+        if rank:
+            self.__entries = {media_id: self.__entry(item) for media_id, item in self.__items.items()}
+        if person is not None:
+            self.__heaps[person] = [entry for entry in self.__entries.values() if entry[3] == person]
+            heapify(self.__heaps[person])
+            return
+
+        self.__heaps = {None: list(self.__entries.values())}
+        self.__sizes = {None: len(self.__entries)}
+        for entry in self.__entries.values():
+            self.__heaps.setdefault(entry[3], []).append(entry)
+            self.__sizes[entry[3]] = self.__sizes.get(entry[3], 0) + 1
+        for heap in self.__heaps.values():
+            heapify(heap)
+
+
+def get_activity(base_dir: str = None) -> Dict[str, float]:
+    """Returns when each piece of Media saved inside the data folder was last changed,
+    as seconds since the epoch, by ID. This is when a Show was last watched
+
+    :param base_dir: The base directory to look in. (Defaults to the base directory in the options)
+    """
+    return {os.path.basename(filename)[:-len(".json")]: stat[0] / 1e9
+            for filename, stat in get_data_file_stats(base_dir).items()}
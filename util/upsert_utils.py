@@ -0,0 +1,165 @@
+from typing import Iterable, List, Set, Tuple, Union
+
+from media import Media
+
+
+class MediaIndex:
+    """A Media Index looks up the position of Media in a list of Media
+    by its ID or by its normalized type, name, and person in constant time
+
+    :param media: The list of Media to index
+    :param ignored: The indices of any Media in the list that should not be indexed
+    """
+
+    def __init__(self, media: List[Media], ignored: Set[int] = None):
+        self.__by_id = {}
+        self.__by_key = {}
+        for i in range(len(media)):
+            if ignored is None or i not in ignored:
+                self.add(media[i], i)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @staticmethod
+    def get_key(media: Media) -> Tuple[str, str, str]:
+        """Returns the normalized type, name, and person of the specified Media
+        which is used to match Media that do not have the same ID
+
+        :param media: The Media to get the key of
+        """
+        return (type(media).__name__,
+                " ".join(media.get_name().lower().split()),
+                media.get_person().lower())
+
+    def add(self, media: Media, index: int):
+        """Adds the specified Media at the specified index into the index
+
+        :param media: The Media to add
+        :param index: The index of the Media in the list of Media
+        """
+        self.__by_id[media.get_id()] = index
+        self.__by_key.setdefault(MediaIndex.get_key(media), index)
+
+    def find(self, media: Media) -> Union[int, None]:
+        """Returns the index of the Media that matches the specified Media,
+        first by its ID and then by its normalized type, name, and person,
+        or None if there is no matching Media
+
+        :param media: The Media to find a match for
+        """
+        if media.get_id() in self.__by_id:
+            return self.__by_id[media.get_id()]
+        return self.__by_key.get(MediaIndex.get_key(media))
+
+
+class ImportPlan:
+    """An Import Plan holds what will happen to each piece of imported Media
+    without changing any Media, so the result of an import can be shown before it is applied
+
+    :param existing_count: The amount of Media that exists before the import
+    """
+
+    def __init__(self, existing_count: int):
+        self.__existing_count = existing_count
+        self.__inserts = []
+        self.__updates = {}
+        self.__skips = []
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def get_inserts(self) -> List[Media]:
+        """Returns the imported Media that will be added"""
+        return [media for media in self.__inserts]
+
+    def get_updates(self) -> List[Tuple[int, Media]]:
+        """Returns the index and the imported Media of each existing Media that will be replaced"""
+        return [(index, self.__updates[index]) for index in self.__updates]
+
+    def get_skips(self) -> List[Media]:
+        """Returns the imported Media that will be skipped since it already exists"""
+        return [media for media in self.__skips]
+
+    def get_summary(self) -> str:
+        """Returns a summary of how many pieces of Media will be inserted, updated, and skipped"""
+        return "{} new, {} updated, {} skipped".format(
+            len(self.__inserts), len(self.__updates), len(self.__skips))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def insert(self, media: Media) -> int:
+        """Plans to add the specified Media and returns the index it will have
+
+        :param media: The Media to add
+        """
+        self.__inserts.append(media)
+        return self.__existing_count + len(self.__inserts) - 1
+
+    def update(self, index: int, media: Media):
+        """Plans to replace the Media at the specified index.
+        If the Media at the index will be added by this import,
+        the planned Media is replaced instead
+
+        :param index: The index of the Media to replace
+        :param media: The Media to replace it with
+        """
+        if index >= self.__existing_count:
+            self.__inserts[index - self.__existing_count] = media
+        else:
+            self.__updates[index] = media
+
+    def skip(self, media: Media):
+        """Plans to skip the specified Media
+
+        :param media: The Media to skip
+        """
+        self.__skips.append(media)
+
+
+def plan_import(existing: List[Media], incoming: Iterable[Media],
+                ignored: Set[int] = None) -> ImportPlan:
+    """Matches each piece of imported Media against the existing Media
+    and returns the plan of which Media will be inserted, updated, or skipped.
+
+    Imported Media that matches an existing Media keeps the ID of the existing Media.
+    The match is done with a MediaIndex so each imported Media is matched in constant time
+
+    :param existing: The existing list of Media
+    :param incoming: The imported Media
+    :param ignored: The indices of any existing Media that should not be matched, like removed Media
+    """
+    index = MediaIndex(existing, ignored)
+    plan = ImportPlan(len(existing))
+    inserted = []
+    for media in incoming:
+        match = index.find(media)
+        if match is None:
+            index.add(media, plan.insert(media))
+            inserted.append(media)
+            continue
+
+        # Keep the ID of the matching Media so its file is replaced
+        current = existing[match] if match < len(existing) else inserted[match - len(existing)]
+        media.set_id(current.get_id())
+        media.set_version(current.get_version())
+        if media.to_json() == current.to_json():
+            plan.skip(media)
+        else:
+            plan.update(match, media)
+            if match >= len(existing):
+                inserted[match - len(existing)] = media
+    return plan
+
+
+def apply_import(plan: ImportPlan, media: List[Media]) -> List[Media]:
+    """Applies the specified plan to the list of Media
+    and returns the Media that was inserted or updated and must be saved
+
+    :param plan: The plan of the import
+    :param media: The list of Media to apply the plan to
+    """
+    changed = []
+    for index, medium in plan.get_updates():
+        media[index] = medium
+        changed.append(medium)
+    media.extend(plan.get_inserts())
+    return changed + plan.get_inserts()